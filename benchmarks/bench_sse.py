@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark SSE parsing throughput for /api/chat-with-ai streams.
+
+Compares the byte-level SSEParser used by _stream_chat against the previous
+approach (requests' iter_lines(decode_unicode=True) + per-line strip and
+json.loads), both driven from the same requests.Response body. Reports the
+end-to-end content chunk rate and the framing cost alone (JSON decoding of
+each content payload is the same work for both and dominates the former).
+
+Usage:
+    python benchmarks/bench_sse.py [--events 20000] [--chunk-size 512] [--repeat 5]
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from llm_1min import _SSE_DONE, OneMinModel, SSEParser  # noqa: E402
+
+
+def build_body(n_events):
+    """Realistic stream: many small content events, then result and done."""
+    parts = [
+        "event: content\ndata: " + json.dumps({"content": f"token {i} "}) + "\n\n"
+        for i in range(n_events)
+    ]
+    full_text = "".join(f"token {i} " for i in range(n_events))
+    record = {"aiRecord": {"uuid": "x", "aiRecordDetail": {"resultObject": [full_text]}}}
+    parts.append("event: result\ndata: " + json.dumps(record) + "\n\n")
+    parts.append('event: done\ndata: {"message": "Stream completed"}\n\n')
+    return "".join(parts).encode("utf-8")
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(body)
+    return response
+
+
+def legacy_chunks(response, chunk_size):
+    """The line-based parser _stream_chat used before SSEParser."""
+    event = None
+    for raw_line in response.iter_lines(chunk_size=chunk_size, decode_unicode=True):
+        line = raw_line.strip()
+        if not line:
+            event = None
+            continue
+        if line.startswith("event:"):
+            event = line[len("event:") :].strip()
+            continue
+        if not line.startswith("data:"):
+            continue
+        data_str = line[len("data:") :].strip()
+        if not data_str:
+            continue
+        try:
+            data = json.loads(data_str)
+        except json.JSONDecodeError:
+            continue
+        if event == "content":
+            content = data.get("content", "")
+            if content:
+                yield content
+        elif event == "done":
+            return
+
+
+def legacy_framing(response, chunk_size):
+    """Legacy line handling without JSON decoding: yields raw data strings."""
+    for raw_line in response.iter_lines(chunk_size=chunk_size, decode_unicode=True):
+        line = raw_line.strip()
+        if line.startswith("data:"):
+            data_str = line[len("data:") :].strip()
+            if data_str:
+                yield data_str
+
+
+def parser_framing(response, chunk_size):
+    """SSEParser without JSON decoding: yields raw data strings."""
+    for _event, data, _id in SSEParser.iter_events(response.iter_content(chunk_size=chunk_size)):
+        yield data
+
+
+def parser_chunks(response, chunk_size):
+    for event in SSEParser.iter_events(response.iter_content(chunk_size=chunk_size)):
+        chunk = OneMinModel._handle_sse_event(event)
+        if chunk is _SSE_DONE:
+            return
+        if chunk:
+            yield chunk
+
+
+def run(impl, body, chunk_size, repeat):
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        response = make_response(body)
+        start = time.perf_counter()
+        count = sum(1 for _ in impl(response, chunk_size))
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SSE parsing throughput")
+    parser.add_argument("--events", type=int, default=20000, help="content events per stream")
+    parser.add_argument("--chunk-size", type=int, default=512, help="bytes per network read")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per implementation (best kept)")
+    args = parser.parse_args()
+
+    body = build_body(args.events)
+    print(
+        f"{args.events} events, {len(body) / 1e6:.2f} MB, {args.chunk_size}-byte reads, "
+        f"best of {args.repeat}"
+    )
+    for title, legacy, current in (
+        ("content chunks (framing + JSON)", legacy_chunks, parser_chunks),
+        ("framing only (data payloads)", legacy_framing, parser_framing),
+    ):
+        print(f"\n{title}")
+        timings = []
+        for name, impl in (("iter_lines (legacy)", legacy), ("SSEParser", current)):
+            count, seconds = run(impl, body, args.chunk_size, args.repeat)
+            timings.append(seconds)
+            print(
+                f"  {name:<20} {count:>7} items  {seconds * 1e3:8.1f} ms  "
+                f"{count / seconds:>10,.0f} items/s  {len(body) / seconds / 1e6:6.1f} MB/s"
+            )
+        print(f"  speedup: {timings[0] / timings[1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup latency with the 1min.ai plugin loaded.
+
+Runs `llm models` and `llm 1min models` in fresh interpreters, with and
+without the plugin registered, and reports the wall time of each. Also times
+register_models() and the catalog listing in-process, which is the part of
+`llm models` this plugin is responsible for.
+
+Entry-point plugins are disabled (LLM_LOAD_PLUGINS="") and this checkout is
+registered explicitly, so other installed plugins do not skew the numbers and
+the plugin does not need to be pip-installed. Each run uses a scratch HOME
+and LLM_USER_PATH.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+RUNNER = """
+import sys
+from llm.plugins import pm
+if sys.argv[1] == "plugin":
+    import llm_1min
+    pm.register(llm_1min, name="1min")
+from llm.cli import cli
+cli(sys.argv[2:])
+"""
+
+
+def time_cli(args, with_plugin, runs, env):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", RUNNER, "plugin" if with_plugin else "bare", *args],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def time_in_process(runs):
+    import llm_1min
+
+    def register_all():
+        llm_1min.register_models(lambda model, async_model=None: None)
+
+    def list_catalog():
+        for info in llm_1min.model_catalog():
+            info.tags
+
+    results = {}
+    for name, fn in (("register_models()", register_all), ("model_catalog() + tags", list_catalog)):
+        samples = []
+        for _ in range(runs * 100):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = samples
+    return results
+
+
+def report(name, samples):
+    median, fastest = statistics.median(samples), min(samples)
+    print(f"  {name:<34} median {median:8.2f} ms   min {fastest:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {
+            **os.environ,
+            "HOME": scratch,
+            "USERPROFILE": scratch,
+            "LLM_USER_PATH": str(Path(scratch) / "llm"),
+            "LLM_LOAD_PLUGINS": "",
+        }
+        print(f"CLI wall time ({args.runs} runs each, fresh interpreter):")
+        report("llm models (without plugin)", time_cli(["models"], False, args.runs, env))
+        report("llm models (with plugin)", time_cli(["models"], True, args.runs, env))
+        report("llm 1min models", time_cli(["1min", "models"], True, args.runs, env))
+
+    print(f"\nIn-process ({args.runs * 100} calls each):")
+    for name, samples in time_in_process(args.runs).items():
+        report(name, samples)
+
+
+if __name__ == "__main__":
+    main()
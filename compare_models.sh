@@ -1,25 +1,12 @@
 #!/bin/bash
 # Compare different models for web search
 
-echo "Setting up web_search for all models..."
-llm 1min options set --model gpt-4o web_search true
-llm 1min options set --model sonar web_search true
-llm 1min options set --model sonar-reasoning web_search true
-
-echo ""
-echo "========================================"
-echo "Testing GPT-4o with web_search"
-echo "========================================"
-llm -m 1min/gpt-4o "tell me about https://www.sowitty.com" 2>&1 | head -20
-
+echo "Comparing GPT-4o, Sonar and Sonar Reasoning Pro with web_search..."
 echo ""
-echo "========================================"
-echo "Testing Sonar with web_search"
-echo "========================================"
-llm -m 1min/sonar "tell me about https://www.sowitty.com" 2>&1 | head -20
 
-echo ""
-echo "========================================"
-echo "Testing Sonar Reasoning with web_search"
-echo "========================================"
-llm -m 1min/sonar-reasoning "tell me about https://www.sowitty.com" 2>&1 | head -20
+# All three run concurrently; the summary table shows TTFT, total latency and
+# reply length per model
+llm 1min compare \
+  -m gpt-4o -m sonar -m sonar-reasoning-pro \
+  -o web_search true \
+  "tell me about https://www.sowitty.com"
@@ -1,18 +1,43 @@
+import asyncio
+import atexit
+import contextlib
+import email.utils
+import functools
+import hashlib
 import json
 import os
+import queue
+import random
+import re
+import shutil
+import sqlite3
 import sys
 import tempfile
+import textwrap
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from itertools import zip_longest
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import click
 import llm
 import requests
 from pydantic import Field, field_validator
-
-# Store mapping of LLM conversation IDs to 1min.ai conversation UUIDs
-_conversation_mapping = {}
-_conversation_file = None
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+try:  # POSIX advisory locks
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+try:  # Windows byte-range locks
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 # Model-specific defaults — code-focused models use CODE_GENERATOR by default,
 # web-aware models default to web_search=True.
@@ -36,103 +61,1269 @@ MODEL_DEFAULTS = {
     "o4-mini-deep-research": {"web_search": True, "num_of_site": 5},
 }
 
+# Built-in model catalog: (LLM model id, API model id, display name, provider).
+# Capability flags and option defaults come from MODEL_DEFAULTS. Order controls
+# registration and grouping in `llm 1min models`.
+MODEL_CATALOG = (
+    ("1min/gpt-3.5-turbo", "gpt-3.5-turbo", "GPT-3.5 Turbo", "OpenAI"),
+    ("1min/gpt-4-turbo", "gpt-4-turbo", "GPT-4 Turbo", "OpenAI"),
+    ("1min/gpt-4.1", "gpt-4.1", "GPT-4.1", "OpenAI"),
+    ("1min/gpt-4.1-mini", "gpt-4.1-mini", "GPT-4.1 Mini", "OpenAI"),
+    ("1min/gpt-4.1-nano", "gpt-4.1-nano", "GPT-4.1 Nano", "OpenAI"),
+    ("1min/gpt-4o-mini", "gpt-4o-mini", "GPT-4o Mini", "OpenAI"),
+    ("1min/gpt-4o", "gpt-4o", "GPT-4o", "OpenAI"),
+    ("1min/gpt-5", "gpt-5", "GPT-5", "OpenAI"),
+    ("1min/gpt-5-mini", "gpt-5-mini", "GPT-5 Mini", "OpenAI"),
+    ("1min/gpt-5-nano", "gpt-5-nano", "GPT-5 Nano", "OpenAI"),
+    ("1min/gpt-5-chat-latest", "gpt-5-chat-latest", "GPT-5 Chat Latest", "OpenAI"),
+    ("1min/gpt-5.1", "gpt-5.1", "GPT-5.1", "OpenAI"),
+    ("1min/gpt-5.1-codex", "gpt-5.1-codex", "GPT-5.1 Codex", "OpenAI"),
+    ("1min/gpt-5.1-codex-mini", "gpt-5.1-codex-mini", "GPT-5.1 Codex Mini", "OpenAI"),
+    ("1min/gpt-5.2", "gpt-5.2", "GPT-5.2", "OpenAI"),
+    ("1min/gpt-5.2-pro", "gpt-5.2-pro", "GPT-5.2 Pro", "OpenAI"),
+    ("1min/gpt-5.4", "gpt-5.4", "GPT-5.4", "OpenAI"),
+    ("1min/gpt-5.4-mini", "gpt-5.4-mini", "GPT-5.4 Mini", "OpenAI"),
+    ("1min/gpt-5.4-nano", "gpt-5.4-nano", "GPT-5.4 Nano", "OpenAI"),
+    ("1min/gpt-5.4-pro", "gpt-5.4-pro", "GPT-5.4 Pro", "OpenAI"),
+    ("1min/o3", "o3", "o3", "OpenAI"),
+    ("1min/o3-mini", "o3-mini", "o3 Mini", "OpenAI"),
+    ("1min/o3-pro", "o3-pro", "o3 Pro", "OpenAI"),
+    ("1min/o3-deep-research", "o3-deep-research", "o3 Deep Research", "OpenAI"),
+    ("1min/o4-mini", "o4-mini", "o4 Mini", "OpenAI"),
+    ("1min/o4-mini-deep-research", "o4-mini-deep-research", "o4 Mini Deep Research", "OpenAI"),
+    ("1min/claude-4-sonnet", "claude-sonnet-4-20250514", "Claude 4 Sonnet", "Anthropic"),
+    ("1min/claude-4-5-sonnet", "claude-sonnet-4-5-20250929", "Claude 4.5 Sonnet", "Anthropic"),
+    ("1min/claude-4-6-sonnet", "claude-sonnet-4-6", "Claude 4.6 Sonnet", "Anthropic"),
+    ("1min/claude-4-opus", "claude-opus-4-20250514", "Claude 4 Opus", "Anthropic"),
+    ("1min/claude-4-1-opus", "claude-opus-4-1-20250805", "Claude 4.1 Opus", "Anthropic"),
+    ("1min/claude-4-5-opus", "claude-opus-4-5-20251101", "Claude 4.5 Opus", "Anthropic"),
+    ("1min/claude-4-6-opus", "claude-opus-4-6", "Claude 4.6 Opus", "Anthropic"),
+    ("1min/claude-4-5-haiku", "claude-haiku-4-5-20251001", "Claude 4.5 Haiku", "Anthropic"),
+    ("1min/gemini-2.5-flash", "gemini-2.5-flash", "Gemini 2.5 Flash", "Google"),
+    ("1min/gemini-2.5-pro", "gemini-2.5-pro", "Gemini 2.5 Pro", "Google"),
+    ("1min/gemini-3-flash", "gemini-3-flash-preview", "Gemini 3 Flash (Preview)", "Google"),
+    (
+        "1min/gemini-3.1-flash-lite",
+        "gemini-3.1-flash-lite-preview",
+        "Gemini 3.1 Flash Lite (Preview)",
+        "Google",
+    ),
+    ("1min/gemini-3.1-pro", "gemini-3.1-pro-preview", "Gemini 3.1 Pro (Preview)", "Google"),
+    ("1min/qwen-flash", "qwen-flash", "Qwen Flash", "Alibaba"),
+    ("1min/qwen-plus", "qwen-plus", "Qwen Plus", "Alibaba"),
+    ("1min/qwen-max", "qwen-max", "Qwen Max", "Alibaba"),
+    ("1min/qwen-vl-plus", "qwen-vl-plus", "Qwen VL Plus", "Alibaba"),
+    ("1min/qwen-vl-max", "qwen-vl-max", "Qwen VL Max", "Alibaba"),
+    ("1min/qwen3-max", "qwen3-max", "Qwen3 Max", "Alibaba"),
+    ("1min/qwen3-vl-flash", "qwen3-vl-flash", "Qwen3 VL Flash", "Alibaba"),
+    ("1min/qwen3-vl-plus", "qwen3-vl-plus", "Qwen3 VL Plus", "Alibaba"),
+    ("1min/qwen3-coder-plus", "qwen3-coder-plus", "Qwen3 Coder Plus", "Alibaba"),
+    ("1min/qwen3-coder-flash", "qwen3-coder-flash", "Qwen3 Coder Flash", "Alibaba"),
+    ("1min/deepseek-chat", "deepseek-chat", "DeepSeek V3.2 Chat", "DeepSeek"),
+    ("1min/deepseek-reasoner", "deepseek-reasoner", "DeepSeek V3.2 Reasoner", "DeepSeek"),
+    ("1min/grok-3", "grok-3", "Grok 3", "xAI"),
+    ("1min/grok-3-mini", "grok-3-mini", "Grok 3 Mini", "xAI"),
+    ("1min/grok-4", "grok-4-0709", "Grok 4", "xAI"),
+    (
+        "1min/grok-4-fast-non-reasoning",
+        "grok-4-fast-non-reasoning",
+        "Grok 4 Fast Non-Reasoning",
+        "xAI",
+    ),
+    ("1min/grok-4-fast-reasoning", "grok-4-fast-reasoning", "Grok 4 Fast Reasoning", "xAI"),
+    ("1min/grok-code-fast-1", "grok-code-fast-1", "Grok Code Fast 1", "xAI"),
+    ("1min/open-mistral-nemo", "open-mistral-nemo", "Mistral Open Nemo", "Mistral"),
+    ("1min/mistral-small-latest", "mistral-small-latest", "Mistral Small", "Mistral"),
+    ("1min/mistral-medium-latest", "mistral-medium-latest", "Mistral Medium 3.1", "Mistral"),
+    ("1min/mistral-large-latest", "mistral-large-latest", "Mistral Large 2", "Mistral"),
+    ("1min/magistral-small-latest", "magistral-small-latest", "Magistral Small 1.2", "Mistral"),
+    ("1min/magistral-medium-latest", "magistral-medium-latest", "Magistral Medium 1.2", "Mistral"),
+    ("1min/ministral-14b-latest", "ministral-14b-latest", "Ministral 14B", "Mistral"),
+    ("1min/command-r", "command-r-08-2024", "Command R", "Cohere"),
+    ("1min/llama-2-70b", "meta/llama-2-70b-chat", "LLaMA 2 70b", "Meta / open-source"),
+    ("1min/llama-3-70b", "meta/meta-llama-3-70b-instruct", "LLaMA 3 70b", "Meta / open-source"),
+    ("1min/llama-4-scout", "meta/llama-4-scout-instruct", "LLaMA 4 Scout", "Meta / open-source"),
+    (
+        "1min/llama-4-maverick",
+        "meta/llama-4-maverick-instruct",
+        "LLaMA 4 Maverick",
+        "Meta / open-source",
+    ),
+    ("1min/gpt-oss-20b", "openai/gpt-oss-20b", "GPT OSS 20b", "Meta / open-source"),
+    ("1min/gpt-oss-120b", "openai/gpt-oss-120b", "GPT OSS 120b", "Meta / open-source"),
+    ("1min/sonar", "sonar", "Perplexity Sonar", "Perplexity"),
+    ("1min/sonar-pro", "sonar-pro", "Perplexity Sonar Pro", "Perplexity"),
+    (
+        "1min/sonar-reasoning-pro",
+        "sonar-reasoning-pro",
+        "Perplexity Sonar Reasoning Pro",
+        "Perplexity",
+    ),
+    (
+        "1min/sonar-deep-research",
+        "sonar-deep-research",
+        "Perplexity Sonar Deep Research",
+        "Perplexity",
+    ),
+)
+
+# Capabilities per API model id: (flags, max context in tokens, latency class).
+# Flags: "v" image input, "f" file input, "c" CODE_GENERATOR-eligible (the
+# models listed as such in MODEL_DEFAULTS), "w" web search built into the
+# model. Latency: "fast", "standard" or "slow" (reasoning / research). Used to reject impossible option combinations before
+# any request is sent; models missing here (server-only ids) are not checked.
+MODEL_CAPABILITIES = {
+    "gpt-3.5-turbo": ("f", 16_385, "fast"),
+    "gpt-4-turbo": ("vf", 128_000, "standard"),
+    "gpt-4.1": ("vf", 1_047_576, "standard"),
+    "gpt-4.1-mini": ("vf", 1_047_576, "fast"),
+    "gpt-4.1-nano": ("vf", 1_047_576, "fast"),
+    "gpt-4o-mini": ("vf", 128_000, "fast"),
+    "gpt-4o": ("vf", 128_000, "standard"),
+    "gpt-5": ("vf", 400_000, "standard"),
+    "gpt-5-mini": ("vf", 400_000, "fast"),
+    "gpt-5-nano": ("vf", 400_000, "fast"),
+    "gpt-5-chat-latest": ("vf", 128_000, "standard"),
+    "gpt-5.1": ("vf", 400_000, "standard"),
+    "gpt-5.1-codex": ("vfc", 400_000, "standard"),
+    "gpt-5.1-codex-mini": ("vfc", 400_000, "fast"),
+    "gpt-5.2": ("vf", 400_000, "standard"),
+    "gpt-5.2-pro": ("vf", 400_000, "slow"),
+    "gpt-5.4": ("vf", 400_000, "standard"),
+    "gpt-5.4-mini": ("vf", 400_000, "fast"),
+    "gpt-5.4-nano": ("vf", 400_000, "fast"),
+    "gpt-5.4-pro": ("vf", 400_000, "slow"),
+    "o3": ("vf", 200_000, "slow"),
+    "o3-mini": ("f", 200_000, "standard"),
+    "o3-pro": ("vf", 200_000, "slow"),
+    "o3-deep-research": ("vfw", 200_000, "slow"),
+    "o4-mini": ("vf", 200_000, "standard"),
+    "o4-mini-deep-research": ("vfw", 200_000, "slow"),
+    "claude-sonnet-4-20250514": ("vf", 200_000, "standard"),
+    "claude-sonnet-4-5-20250929": ("vf", 200_000, "standard"),
+    "claude-sonnet-4-6": ("vfc", 200_000, "standard"),
+    "claude-opus-4-20250514": ("vf", 200_000, "slow"),
+    "claude-opus-4-1-20250805": ("vf", 200_000, "slow"),
+    "claude-opus-4-5-20251101": ("vf", 200_000, "standard"),
+    "claude-opus-4-6": ("vfc", 200_000, "standard"),
+    "claude-haiku-4-5-20251001": ("vfc", 200_000, "fast"),
+    "gemini-2.5-flash": ("vf", 1_048_576, "fast"),
+    "gemini-2.5-pro": ("vf", 1_048_576, "standard"),
+    "gemini-3-flash-preview": ("vf", 1_048_576, "fast"),
+    "gemini-3.1-flash-lite-preview": ("vf", 1_048_576, "fast"),
+    "gemini-3.1-pro-preview": ("vf", 1_048_576, "standard"),
+    "qwen-flash": ("f", 1_000_000, "fast"),
+    "qwen-plus": ("f", 131_072, "standard"),
+    "qwen-max": ("f", 32_768, "standard"),
+    "qwen-vl-plus": ("vf", 131_072, "standard"),
+    "qwen-vl-max": ("vf", 131_072, "standard"),
+    "qwen3-max": ("f", 262_144, "standard"),
+    "qwen3-vl-flash": ("vf", 262_144, "fast"),
+    "qwen3-vl-plus": ("vf", 262_144, "standard"),
+    "qwen3-coder-plus": ("fc", 1_000_000, "standard"),
+    "qwen3-coder-flash": ("fc", 1_000_000, "fast"),
+    "deepseek-chat": ("f", 128_000, "standard"),
+    "deepseek-reasoner": ("fc", 128_000, "slow"),
+    "grok-3": ("f", 131_072, "standard"),
+    "grok-3-mini": ("f", 131_072, "fast"),
+    "grok-4-0709": ("vf", 256_000, "slow"),
+    "grok-4-fast-non-reasoning": ("vf", 2_000_000, "fast"),
+    "grok-4-fast-reasoning": ("vf", 2_000_000, "standard"),
+    "grok-code-fast-1": ("fc", 256_000, "fast"),
+    "open-mistral-nemo": ("f", 128_000, "fast"),
+    "mistral-small-latest": ("vf", 128_000, "fast"),
+    "mistral-medium-latest": ("vf", 128_000, "standard"),
+    "mistral-large-latest": ("f", 128_000, "standard"),
+    "magistral-small-latest": ("vf", 128_000, "standard"),
+    "magistral-medium-latest": ("vf", 128_000, "slow"),
+    "ministral-14b-latest": ("vf", 128_000, "fast"),
+    "command-r-08-2024": ("f", 128_000, "fast"),
+    "meta/llama-2-70b-chat": ("", 4_096, "standard"),
+    "meta/meta-llama-3-70b-instruct": ("", 8_192, "standard"),
+    "meta/llama-4-scout-instruct": ("vf", 1_000_000, "fast"),
+    "meta/llama-4-maverick-instruct": ("vf", 1_000_000, "standard"),
+    "openai/gpt-oss-20b": ("f", 131_072, "fast"),
+    "openai/gpt-oss-120b": ("f", 131_072, "standard"),
+    "sonar": ("vfw", 128_000, "fast"),
+    "sonar-pro": ("vfw", 200_000, "standard"),
+    "sonar-reasoning-pro": ("vfw", 128_000, "slow"),
+    "sonar-deep-research": ("fw", 128_000, "slow"),
+}
+
 
 def _warn(message: str) -> None:
     """Emit warning messages to stderr."""
     print(f"[llm-1min] Warning: {message}", file=sys.stderr)
 
 
+# Shared HTTP transport. Every call to api.1min.ai goes through one keep-alive
+# session so consecutive requests (create conversation -> prompt, bulk deletes)
+# reuse the same TCP+TLS connection instead of paying a fresh handshake.
+HTTP_POOL_CONNECTIONS = 4  # distinct hosts kept in the pool
+HTTP_POOL_MAXSIZE = 32  # concurrent connections per host
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide pooled session used for all 1min.ai requests."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+# Async transport: httpx clients are bound to the event loop that created them,
+# so keep one pooled client per running loop.
+ASYNC_HTTP_MAX_CONNECTIONS = 100
+_async_http_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_http_client():
+    """Return the pooled httpx.AsyncClient for the running event loop."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            )
+        )
+        _async_http_clients[loop] = client
+    return client
+
+
+# Retry engine for transient failures (throttling, 5xx, failed connections).
+# Defaults apply unless overridden by options (CLI or `llm 1min options set`).
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Statuses meaning the request was turned away before any work was done
+REJECTED_STATUS_CODES = frozenset({429, 503})
+RETRY_DEFAULTS = {"max_retries": 2, "retry_backoff_base": 1.0, "retry_backoff_max": 30.0}
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring Retry-After.
+
+    Idempotency rules:
+    - Retryable statuses are retried for idempotent requests (DELETE, GET).
+      A POST is only replayed on 429 / 503 or a response carrying
+      Retry-After, where the server turned the call away without acting on
+      it; a 500 / 502 / 504 may come after the prompt was already processed.
+    - Failures while connecting (connect timeout, refused connection, DNS) are
+      retried for every request: the server never received it.
+    - Anything after the request may have been sent (read timeouts, resets,
+      the server closing the connection, a stream dropping) is only retried
+      for idempotent requests (DELETE, GET), since the server may already be
+      processing a POST.
+    """
+
+    def __init__(self, max_retries=None, backoff_base=None, backoff_max=None):
+        self.max_retries = int(
+            RETRY_DEFAULTS["max_retries"] if max_retries is None else max_retries
+        )
+        self.backoff_base = float(
+            RETRY_DEFAULTS["retry_backoff_base"] if backoff_base is None else backoff_base
+        )
+        self.backoff_max = float(
+            RETRY_DEFAULTS["retry_backoff_max"] if backoff_max is None else backoff_max
+        )
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> "RetryPolicy":
+        """Build a policy from merged options (missing keys use RETRY_DEFAULTS)."""
+        return cls(
+            max_retries=options.get("max_retries"),
+            backoff_base=options.get("retry_backoff_base"),
+            backoff_max=options.get("retry_backoff_max"),
+        )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)."""
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.backoff_max)
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(response) -> Optional[float]:
+        """Return the Retry-After delay in seconds, or None if absent/invalid."""
+        headers = getattr(response, "headers", None)
+        try:
+            value = headers.get("Retry-After") if headers is not None else None
+        except Exception:
+            return None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at is None:
+            return None
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    @staticmethod
+    def is_retryable_status(status) -> bool:
+        return isinstance(status, int) and status in RETRYABLE_STATUS_CODES
+
+    @classmethod
+    def should_retry_response(cls, response, idempotent: bool) -> bool:
+        """Whether a response status may be replayed (see the idempotency rules)."""
+        status = getattr(response, "status_code", None)
+        if not cls.is_retryable_status(status):
+            return False
+        return (
+            idempotent
+            or status in REJECTED_STATUS_CODES
+            or cls.parse_retry_after(response) is not None
+        )
+
+
+@contextlib.contextmanager
+def _file_lock(lock_path: Path):
+    """Hold an exclusive cross-process lock on `lock_path` for the block."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(lock_path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:  # pragma: no cover - Windows
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:  # pragma: no cover - Windows
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+
+def _atomic_write_json(path: Path, data, indent=None) -> None:
+    """Write JSON to `path` via tempfile + os.replace so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_file_path = tempfile.mkstemp(
+        prefix=f"{path.stem}.", suffix=".tmp", dir=str(path.parent)
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+        os.chmod(tmp_file_path, 0o600)
+        os.replace(tmp_file_path, path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            try:
+                os.unlink(tmp_file_path)
+            except OSError:
+                pass
+
+
+class RateLimiter:
+    """Client-side token bucket per API key, shared by every local process.
+
+    Bucket state lives in `ratelimit.json` next to conversations.json and is
+    read-modify-written under an exclusive file lock, so parallel `llm`
+    processes (cron, CI fan-out) draw from one budget. Each acquire reserves a
+    token up front and returns how long to wait for it, so waiters queue
+    instead of stampeding. API keys are stored only as a truncated SHA-256.
+    """
+
+    STALE_AFTER = 24 * 3600  # drop buckets idle for a day
+
+    def __init__(self, rate: float, burst: Optional[int] = None, state_file: Path = None):
+        self.rate = float(rate)
+        self.burst = int(burst) if burst else max(1, int(self.rate))
+        self.state_file = state_file or (_get_conversation_file().parent / "ratelimit.json")
+        self.lock_file = self.state_file.with_suffix(".lock")
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> Optional["RateLimiter"]:
+        """Return a limiter when `rate_limit_rps` is set, else None (disabled)."""
+        rate = options.get("rate_limit_rps")
+        if not rate:
+            return None
+        return cls(rate, options.get("rate_limit_burst"))
+
+    @staticmethod
+    def _bucket_id(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def reserve(self, api_key: str) -> float:
+        """Take one token for `api_key`; return seconds to wait before using it."""
+        bucket_id = self._bucket_id(api_key)
+        with _file_lock(self.lock_file):
+            try:
+                with open(self.state_file, encoding="utf-8") as f:
+                    state = json.load(f)
+                if not isinstance(state, dict):
+                    state = {}
+            except (OSError, ValueError):
+                state = {}
+
+            now = time.time()
+            bucket = state.get(bucket_id) or {}
+            tokens = bucket.get("tokens", float(self.burst))
+            updated = bucket.get("updated", now)
+            tokens = min(float(self.burst), tokens + max(now - updated, 0.0) * self.rate) - 1.0
+            state = {
+                k: v
+                for k, v in state.items()
+                if isinstance(v, dict) and now - v.get("updated", 0) < self.STALE_AFTER
+            }
+            state[bucket_id] = {"tokens": tokens, "updated": now}
+            try:
+                _atomic_write_json(self.state_file, state)
+            except OSError as e:
+                _warn(f"Could not update rate limit state {self.state_file}: {e}")
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def acquire(self, api_key: str) -> None:
+        wait = self.reserve(api_key)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, api_key: str) -> None:
+        wait = await _in_thread(self.reserve, api_key)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+async def _in_thread(func, *args, **kwargs):
+    """Run blocking local I/O (file locks, fsync, SQLite) without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+def _saved_defaults() -> Dict[str, Any]:
+    """Saved global options for calls made outside a prompt.
+
+    A config.json still holding keys removed in v0.4.0 makes prompts fail
+    with migration instructions, but cleanup commands should keep working:
+    they warn and use the built-in retry and rate-limit defaults instead.
+    """
+    try:
+        return _options_config.get_defaults()
+    except ValueError as e:
+        _warn(f"Ignoring saved options: {e}")
+        return {}
+
+
+def _default_rate_limiter(defaults: Optional[Dict[str, Any]] = None) -> Optional[RateLimiter]:
+    """Rate limiter for calls made outside a prompt, from saved global options."""
+    return RateLimiter.from_options(_saved_defaults() if defaults is None else defaults)
+
+
+def _default_retry_policy(defaults: Optional[Dict[str, Any]] = None) -> RetryPolicy:
+    """Retry policy for calls made outside a prompt (e.g. `llm 1min clear`)."""
+    return RetryPolicy.from_options(_saved_defaults() if defaults is None else defaults)
+
+
+def _failed_before_sending(error: requests.exceptions.ConnectionError) -> bool:
+    """True if `error` happened while connecting, so the server never saw the request."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    cause = error.args[0] if error.args else None
+    cause = getattr(cause, "reason", cause)  # MaxRetryError wraps the real cause
+    return isinstance(cause, (NewConnectionError, ConnectTimeoutError))
+
+
+def _send_with_retry(method, url, policy, idempotent=False, limiter=None, **kwargs):
+    """Send a request through the pooled session, retrying transient failures.
+
+    Every attempt first draws a token from `limiter` (if rate limiting is on).
+    Returns the final response (which may still carry an error status once
+    retries are exhausted); raises the last transport exception otherwise.
+    """
+    session = get_http_session()
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire(kwargs["headers"]["API-KEY"])
+        try:
+            response = getattr(session, method)(url, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            # Also catches ConnectTimeout, which is a Timeout too
+            replay_safe = idempotent or _failed_before_sending(e)
+            if not replay_safe or attempt >= policy.max_retries:
+                raise
+            wait = policy.delay(attempt + 1)
+        except requests.exceptions.Timeout:
+            if not idempotent or attempt >= policy.max_retries:
+                raise
+            wait = policy.delay(attempt + 1)
+        else:
+            if not policy.should_retry_response(response, idempotent) or (
+                attempt >= policy.max_retries
+            ):
+                return response
+            wait = policy.delay(attempt + 1, policy.parse_retry_after(response))
+            response.close()
+        attempt += 1
+        time.sleep(wait)
+
+
+async def _async_send_with_retry(
+    client, method, url, policy, idempotent=False, limiter=None, **kwargs
+):
+    """Async counterpart of _send_with_retry for httpx.
+
+    The response is opened in streaming mode; callers must `aclose()` it.
+    """
+    import httpx
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire_async(kwargs["headers"]["API-KEY"])
+        request = client.build_request(method, url, **kwargs)
+        try:
+            response = await client.send(request, stream=True)
+        except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+            # Nothing was sent yet
+            if attempt >= policy.max_retries:
+                raise
+            wait = policy.delay(attempt + 1)
+        except httpx.TransportError:
+            if not idempotent or attempt >= policy.max_retries:
+                raise
+            wait = policy.delay(attempt + 1)
+        else:
+            if not policy.should_retry_response(response, idempotent) or (
+                attempt >= policy.max_retries
+            ):
+                return response
+            wait = policy.delay(attempt + 1, policy.parse_retry_after(response))
+            await response.aclose()
+        attempt += 1
+        await asyncio.sleep(wait)
+
+
+def split_mapping_key(key: str) -> Tuple[Optional[str], Optional[str]]:
+    """Split a mapping key into (LLM conversation id, model id).
+
+    Keys are a model id ("1min/gpt-4o"), "{conversation_id}_{model_id}", or a
+    bare conversation id (shared across models with history_mixed). Model ids
+    contain a "/" and no "_"; LLM conversation ids contain no "/".
+    """
+    conversation_id, sep, model_id = key.rpartition("_")
+    if sep and conversation_id and "/" in model_id:
+        return conversation_id, model_id
+    if "/" in key:
+        return None, key
+    return key, None
+
+
+class ConversationMapping(dict):
+    """Mapping key -> 1min.ai conversation UUID with secondary indexes.
+
+    Keys are described in `split_mapping_key`. Besides the dict itself three
+    indexes are kept in step by every mutating method:
+
+    - UUID -> keys pointing at it, so clearing a conversation does not scan.
+    - model id -> keys for it: the whole key plus every suffix after an "_",
+      which is exactly the `key == model_id or key.endswith("_" + model_id)`
+      match `clear_conversation` needs.
+    - LLM conversation id -> its "{conversation_id}_{model_id}" keys, for the
+      history_mixed cross-model lookup.
+
+    Buckets are insertion-ordered dicts, so `keys_for_model` returns keys in
+    the same order a scan of the mapping would.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._by_uuid = {}
+        self._by_model = {}
+        self._by_conversation = {}
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def _model_ids(key: str):
+        yield key
+        i = key.find("_")
+        while i != -1:
+            yield key[i + 1 :]
+            i = key.find("_", i + 1)
+
+    @staticmethod
+    def _discard(index: dict, bucket_key, key) -> None:
+        bucket = index.get(bucket_key)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[bucket_key]
+
+    def __setitem__(self, key, value):
+        if key in self:
+            self._discard(self._by_uuid, dict.__getitem__(self, key), key)
+        else:
+            for model_id in self._model_ids(key):
+                self._by_model.setdefault(model_id, {})[key] = None
+            conversation_id, model_id = split_mapping_key(key)
+            if conversation_id and model_id:
+                self._by_conversation.setdefault(conversation_id, {})[key] = None
+        super().__setitem__(key, value)
+        self._by_uuid.setdefault(value, {})[key] = None
+
+    def __delitem__(self, key):
+        value = dict.__getitem__(self, key)
+        super().__delitem__(key)
+        self._discard(self._by_uuid, value, key)
+        for model_id in self._model_ids(key):
+            self._discard(self._by_model, model_id, key)
+        self._discard(self._by_conversation, split_mapping_key(key)[0], key)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    _MISSING = object()
+
+    def pop(self, key, default=_MISSING):
+        if key in self:
+            value = dict.__getitem__(self, key)
+            del self[key]
+            return value
+        if default is self._MISSING:
+            raise KeyError(key)
+        return default
+
+    def popitem(self):
+        key = next(reversed(self))  # LIFO, like dict.popitem
+        return key, self.pop(key)
+
+    def clear(self):
+        super().clear()
+        self._by_uuid.clear()
+        self._by_model.clear()
+        self._by_conversation.clear()
+
+    def copy(self) -> Dict[str, str]:
+        """Plain dict snapshot (indexes are not needed by callers)."""
+        return dict(self)
+
+    def uuids(self) -> List[str]:
+        """Distinct UUIDs, in order of first use."""
+        return list(self._by_uuid)
+
+    def keys_for_uuid(self, conversation_uuid: str) -> List[str]:
+        """Keys pointing at `conversation_uuid`, in mapping order."""
+        return list(self._by_uuid.get(conversation_uuid, ()))
+
+    def keys_for_model(self, model_id: str) -> List[str]:
+        """Keys equal to `model_id` or ending in "_{model_id}", in mapping order."""
+        return list(self._by_model.get(model_id, ()))
+
+    def keys_for_conversation(self, conversation_id: str) -> List[str]:
+        """Per-model keys ("{conversation_id}_{model_id}") of one LLM conversation."""
+        return list(self._by_conversation.get(conversation_id, ()))
+
+
+# Store mapping of LLM conversation IDs to 1min.ai conversation UUIDs
+_conversation_mapping = ConversationMapping()
+_conversation_file = None
+# Serializes reloads (which rebind `_conversation_mapping`), lookups, changes
+# and flushes across the worker threads of batch and compare runs. Taken
+# before `_pending_lock`, never while holding it.
+_mapping_lock = threading.RLock()
+
+
+def _config_dir() -> Path:
+    """Directory holding the plugin's state files; not created by this call."""
+    if _conversation_file is not None:
+        return _conversation_file.parent
+    return Path.home() / ".config" / "llm-1min"
+
+
 def _get_conversation_file():
     """Get the path to the persistent conversation mapping file."""
     global _conversation_file
     if _conversation_file is None:
-        config_dir = Path.home() / ".config" / "llm-1min"
+        config_dir = _config_dir()
         config_dir.mkdir(parents=True, exist_ok=True)
         _conversation_file = config_dir / "conversations.json"
     return _conversation_file
 
 
 def _load_conversations():
-    """Load conversation mappings from disk."""
+    """Load conversation mappings from the configured store."""
     global _conversation_mapping
+    with _mapping_lock:
+        loaded = _get_conversation_store().load()
+        if loaded is not None:
+            mapping = ConversationMapping(loaded)
+            # Changes not flushed yet still belong in this process's view
+            with _pending_lock:
+                for key in _pending_deletes:
+                    mapping.pop(key, None)
+                mapping.update(_pending_upserts)
+            _conversation_mapping = mapping
+
+
+# Write-behind for mapping changes. "batched" (default) coalesces changes in
+# memory until flush_conversations() runs at the end of a prompt, a clear, or
+# interpreter exit; "immediate" writes (and fsyncs) every change as it happens.
+# Selected with LLM_1MIN_MAPPING_DURABILITY.
+MAPPING_DURABILITY_MODES = ("batched", "immediate")
+_pending_upserts: Dict[str, str] = {}
+_pending_deletes: Dict[str, None] = {}
+_pending_lock = threading.Lock()
+
+
+def _mapping_durability() -> str:
+    mode = os.environ.get("LLM_1MIN_MAPPING_DURABILITY", "batched").strip().lower() or "batched"
+    if mode not in MAPPING_DURABILITY_MODES:
+        _warn(
+            f"Unknown LLM_1MIN_MAPPING_DURABILITY {mode!r}; "
+            f"expected one of {', '.join(MAPPING_DURABILITY_MODES)}. Using batched."
+        )
+        return "batched"
+    return mode
+
+
+def _persist_mapping(upserts: Optional[Dict[str, str]] = None, deletes=()) -> None:
+    """Record mapping changes already applied to `_conversation_mapping`.
+
+    Later changes to a key supersede earlier ones, so a key migrated and then
+    overwritten in one prompt is written once. With "immediate" durability the
+    change is flushed right away.
+    """
+    with _pending_lock:
+        for key in deletes:
+            _pending_upserts.pop(key, None)
+            _pending_deletes[key] = None
+        for key, conversation_uuid in (upserts or {}).items():
+            _pending_deletes.pop(key, None)
+            _pending_upserts[key] = conversation_uuid
+    if _mapping_durability() == "immediate":
+        flush_conversations()
+
+
+def flush_conversations() -> None:
+    """Write pending mapping changes to the store in one batch.
+
+    The JSON store appends one journal entry; the SQLite store applies the rows
+    in one transaction, so a key migration is atomic. Lookups wait until the
+    changes are in the store, so none sees them in neither place.
+    """
+    with _mapping_lock:
+        with _pending_lock:
+            if not _pending_upserts and not _pending_deletes:
+                return
+            upserts = dict(_pending_upserts)
+            deletes = list(_pending_deletes)
+            _pending_upserts.clear()
+            _pending_deletes.clear()
+        _get_conversation_store().apply(_conversation_mapping, upserts, deletes)
+
+
+atexit.register(flush_conversations)
+
+
+# Key lookups for prompts and deletions. The SQLite store answers them from its
+# indexes without loading the table; the JSON store from the in-memory mapping
+# after a (stat-checked) reload. Both see changes still waiting to be flushed.
+def _pending_overlay(stored_keys, matches) -> List[str]:
+    """`stored_keys` adjusted for unflushed changes; `matches(key, uuid)` picks pending upserts."""
+    with _pending_lock:
+        keys = [k for k in stored_keys if k not in _pending_deletes and k not in _pending_upserts]
+        keys.extend(k for k, u in _pending_upserts.items() if matches(k, u))
+    return keys
+
+
+def _indexed_store():
+    """The mapping store when it supports indexed lookups (SQLite), else None."""
+    store = _get_conversation_store()
+    return store if store.backend == "sqlite" else None
+
+
+def _mapping_get(key: str) -> Optional[str]:
+    """UUID stored under `key`, or None."""
+    with _mapping_lock:
+        store = _indexed_store()
+        if store is None:
+            _load_conversations()
+            return _conversation_mapping.get(key)
+        with _pending_lock:
+            if key in _pending_deletes:
+                return None
+            if key in _pending_upserts:
+                return _pending_upserts[key]
+        return store.get(key)
+
+
+def _mapping_keys_for_uuid(conversation_uuid: str) -> List[str]:
+    """Keys pointing at `conversation_uuid`."""
+    with _mapping_lock:
+        store = _indexed_store()
+        if store is None:
+            _load_conversations()
+            return _conversation_mapping.keys_for_uuid(conversation_uuid)
+        return _pending_overlay(
+            store.keys_for_uuid(conversation_uuid), lambda k, u: u == conversation_uuid
+        )
+
+
+def _mapping_keys_for_model(model_id: str) -> List[str]:
+    """The model-only key and "{conversation_id}_{model_id}" keys of one model."""
+    with _mapping_lock:
+        store = _indexed_store()
+        if store is None:
+            _load_conversations()
+            return _conversation_mapping.keys_for_model(model_id)
+        return _pending_overlay(
+            store.keys_for_model(model_id), lambda k, u: split_mapping_key(k)[1] == model_id
+        )
+
+
+def _mapping_keys_for_conversation(conversation_id: str) -> List[str]:
+    """Per-model keys ("{conversation_id}_{model_id}") of one LLM conversation."""
+
+    def matches(key, _uuid):
+        key_conversation, key_model = split_mapping_key(key)
+        return key_conversation == conversation_id and key_model is not None
+
+    with _mapping_lock:
+        store = _indexed_store()
+        if store is None:
+            _load_conversations()
+            return _conversation_mapping.keys_for_conversation(conversation_id)
+        return _pending_overlay(store.keys_for_conversation(conversation_id), matches)
+
+
+def _move_mapping_key(old_key: str, new_key: str, conversation_uuid: str) -> None:
+    """Re-key a conversation (e.g. model-only key -> conversation-scoped key)."""
+    with _mapping_lock:
+        _conversation_mapping.pop(old_key, None)
+        _conversation_mapping[new_key] = conversation_uuid
+        _persist_mapping({new_key: conversation_uuid}, [old_key])
+
+
+# Conversation mapping backends, selected with LLM_1MIN_MAPPING_BACKEND.
+MAPPING_BACKENDS = ("json", "sqlite")
+# Fold the JSON backend's change journal into the snapshot beyond this size
+MAPPING_JOURNAL_MAX_BYTES = 256 * 1024
+_conversation_store = None
+
+
+def _get_conversation_store():
+    """Return the mapping store for the current backend and conversation file."""
+    global _conversation_store
+    backend = os.environ.get("LLM_1MIN_MAPPING_BACKEND", "json").strip().lower() or "json"
+    if backend not in MAPPING_BACKENDS:
+        _warn(
+            f"Unknown LLM_1MIN_MAPPING_BACKEND {backend!r}; "
+            f"expected one of {', '.join(MAPPING_BACKENDS)}. Using json."
+        )
+        backend = "json"
     conv_file = _get_conversation_file()
-    if conv_file.exists():
+    store = _conversation_store
+    if store is None or store.backend != backend or store.json_path != conv_file:
+        if backend == "sqlite":
+            store = SQLiteConversationStore(conv_file.with_suffix(".sqlite"), conv_file)
+        else:
+            store = JSONConversationStore(conv_file)
+        _conversation_store = store
+    return store
+
+
+def _file_signature(*paths: Path) -> Optional[tuple]:
+    """(mtime_ns, size, inode) of each existing path, or None if none exist."""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+    return tuple(signature) if any(signature) else None
+
+
+class JSONConversationStore:
+    """conversations.json snapshot plus an append-only journal of changes.
+
+    Each change appends one line ({"set": {...}, "del": [...]}) to
+    conversations.journal under conversations.lock, so concurrent `llm`
+    processes never overwrite each other's updates and no writer rewrites the
+    whole mapping per change. Loading replays the journal over the snapshot.
+    Once the journal exceeds MAPPING_JOURNAL_MAX_BYTES the writer folds it
+    into a fresh snapshot; replaying a journal is idempotent, so a crash
+    between the two steps loses nothing.
+
+    `load()` only rereads when the snapshot's or journal's mtime, size or
+    inode changed since this process last read or wrote them, so repeated
+    lookups in a long-lived process cost two stat() calls.
+    """
+
+    backend = "json"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.json_path = path
+        self.journal_path = path.with_suffix(".journal")
+        self.lock_path = path.with_suffix(".lock")
+        self._signature = None
+
+    def _files_signature(self) -> Optional[tuple]:
+        return _file_signature(self.path, self.journal_path)
+
+    def _read_snapshot(self) -> Optional[Dict[str, str]]:
+        """Snapshot contents ({} if missing), or None if it is unreadable."""
         try:
-            with open(conv_file, encoding="utf-8") as f:
+            with open(self.path, encoding="utf-8") as f:
                 loaded = json.load(f)
-            if isinstance(loaded, dict):
-                _conversation_mapping = {str(k): str(v) for k, v in loaded.items()}
-            else:
-                _warn(
-                    f"Ignoring invalid conversation mapping format in {conv_file}: "
-                    f"expected JSON object."
-                )
+        except FileNotFoundError:
+            return {}
         except (OSError, json.JSONDecodeError, TypeError, ValueError) as e:
-            _warn(f"Could not load conversation mapping from {conv_file}: {e}")
+            _warn(f"Could not load conversation mapping from {self.path}: {e}")
+            return None
+        if not isinstance(loaded, dict):
+            _warn(
+                f"Ignoring invalid conversation mapping format in {self.path}: "
+                f"expected JSON object."
+            )
+            return None
+        return {str(k): str(v) for k, v in loaded.items()}
 
+    def _replay_journal(self, mapping: Dict[str, str]) -> None:
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                upserts, deletes = entry.get("set") or {}, entry.get("del") or []
+            except (ValueError, AttributeError):
+                # A torn final line from a crashed writer; skip it
+                _warn(f"Skipping unreadable entry in {self.journal_path}")
+                continue
+            for key in deletes:
+                mapping.pop(str(key), None)
+            mapping.update((str(k), str(v)) for k, v in upserts.items())
+
+    def load(self) -> Optional[Dict[str, str]]:
+        """Return the stored mapping, or None when it is unchanged, missing or unreadable."""
+        signature = self._files_signature()
+        if signature is None or signature == self._signature:
+            return None
+        try:
+            with _file_lock(self.lock_path):
+                signature = self._files_signature()
+                mapping = self._read_snapshot()
+                if mapping is None:
+                    return None
+                self._replay_journal(mapping)
+        except OSError as e:
+            _warn(f"Could not load conversation mapping from {self.path}: {e}")
+            return None
+        self._signature = signature
+        return mapping
+
+    def _write_snapshot(self, mapping: Dict[str, str]) -> None:
+        tmp_file_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_file_path = tempfile.mkstemp(
+                prefix="conversations.",
+                suffix=".json.tmp",
+                dir=str(self.path.parent),
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(mapping, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_file_path, 0o600)
+            os.replace(tmp_file_path, self.path)
+            os.chmod(self.path, 0o600)
+            # Anything in the journal is now part of the snapshot
+            if self.journal_path.exists():
+                os.truncate(self.journal_path, 0)
+        finally:
+            if tmp_file_path and os.path.exists(tmp_file_path):
+                try:
+                    os.unlink(tmp_file_path)
+                except OSError:
+                    pass
+
+    def apply(self, mapping: Dict[str, str], upserts: Dict[str, str], deletes: List[str]) -> None:
+        """Append one journal entry; compact when the journal has grown too large."""
+        if not upserts and not deletes:
+            return
+        entry = json.dumps({"set": upserts, "del": deletes}, separators=(",", ":")) + "\n"
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _file_lock(self.lock_path):
+                # Nobody else wrote since our last read: memory stays current
+                current = self._files_signature() == self._signature
+                fd = os.open(str(self.journal_path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, entry.encode("utf-8"))
+                    os.fsync(fd)
+                    size = os.fstat(fd).st_size
+                finally:
+                    os.close(fd)
+                if size > MAPPING_JOURNAL_MAX_BYTES:
+                    compacted = self._read_snapshot()
+                    if compacted is not None:
+                        self._replay_journal(compacted)
+                        self._write_snapshot(compacted)
+                self._signature = self._files_signature() if current else None
+        except (OSError, TypeError, ValueError) as e:
+            _warn(f"Failed to persist conversation mapping to {self.path}: {e}")
+
+
+class SQLiteConversationStore:
+    """conversations.sqlite (WAL): one row per mapping key, indexed on UUID.
+
+    Changes are single-row upserts/deletes inside one transaction instead of a
+    full-file rewrite. On first use an existing conversations.json is imported
+    once; `PRAGMA user_version` records the schema version. Keys are also
+    stored split into indexed (conversation_id, model_id) columns. Like the JSON
+    store, `load()` skips the query while the database and WAL files are
+    unchanged; our own writes force one reload since another process may
+    commit right after them.
+    """
 
-def _save_conversations():
-    """Save conversation mappings to disk."""
-    conv_file = _get_conversation_file()
-    tmp_file_path = None
-    try:
-        conv_file.parent.mkdir(parents=True, exist_ok=True)
-        fd, tmp_file_path = tempfile.mkstemp(
-            prefix="conversations.",
-            suffix=".json.tmp",
-            dir=str(conv_file.parent),
+    backend = "sqlite"
+    SCHEMA_VERSION = 2
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS mappings (
+            key TEXT PRIMARY KEY,
+            uuid TEXT NOT NULL,
+            conversation_id TEXT,
+            model_id TEXT
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS mappings_uuid ON mappings (uuid);
+    """
+    UPSERT = (
+        "INSERT INTO mappings (key, uuid, conversation_id, model_id) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET uuid = excluded.uuid"
+    )
+
+    @staticmethod
+    def _rows(items) -> List[tuple]:
+        return [(key, uuid, *split_mapping_key(key)) for key, uuid in items]
+
+    def __init__(self, path: Path, json_path: Optional[Path] = None):
+        self.path = path
+        self.json_path = json_path
+        self._ready = False
+        self._signature = None
+
+    def _files_signature(self) -> Optional[tuple]:
+        return _file_signature(self.path, Path(f"{self.path}-wal"))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10)
+        try:
+            if not self._ready:
+                self._migrate(conn)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _migrate(self, conn) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(self.SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            with conn:
+                if version == 0 and self.json_path:
+                    legacy = JSONConversationStore(self.json_path).load()
+                    if legacy:
+                        # OR IGNORE: a concurrent process may already have newer rows
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO mappings "
+                            "(key, uuid, conversation_id, model_id) VALUES (?, ?, ?, ?)",
+                            self._rows(legacy.items()),
+                        )
+                if version == 1:
+                    conn.execute("ALTER TABLE mappings ADD COLUMN conversation_id TEXT")
+                    conn.execute("ALTER TABLE mappings ADD COLUMN model_id TEXT")
+                    conn.executemany(
+                        "UPDATE mappings SET conversation_id = ?, model_id = ? WHERE key = ?",
+                        [
+                            (*split_mapping_key(key), key)
+                            for (key,) in conn.execute("SELECT key FROM mappings")
+                        ],
+                    )
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS mappings_conversation ON mappings (conversation_id)"
         )
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(_conversation_mapping, f, indent=2)
-            f.flush()
-            os.fsync(f.fileno())
-        os.chmod(tmp_file_path, 0o600)
-        os.replace(tmp_file_path, conv_file)
-        os.chmod(conv_file, 0o600)
-    except (OSError, TypeError, ValueError) as e:
-        _warn(f"Failed to persist conversation mapping to {conv_file}: {e}")
-    finally:
-        if tmp_file_path and os.path.exists(tmp_file_path):
+        conn.execute("CREATE INDEX IF NOT EXISTS mappings_model ON mappings (model_id)")
+        for path in (self.path, Path(f"{self.path}-wal"), Path(f"{self.path}-shm")):
             try:
-                os.unlink(tmp_file_path)
+                os.chmod(path, 0o600)
             except OSError:
                 pass
+        self._ready = True
 
+    def load(self) -> Optional[Dict[str, str]]:
+        signature = self._files_signature()
+        if signature is not None and signature == self._signature:
+            return None
+        try:
+            with self._connect() as conn:
+                mapping = dict(conn.execute("SELECT key, uuid FROM mappings"))
+            self._signature = signature
+            return mapping
+        except sqlite3.Error as e:
+            _warn(f"Could not load conversation mapping from {self.path}: {e}")
+            return None
+
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        try:
+            with self._connect() as conn:
+                return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            _warn(f"Could not read conversation mapping from {self.path}: {e}")
+            return []
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the UUID stored under `key` (primary-key lookup)."""
+        rows = self._query("SELECT uuid FROM mappings WHERE key = ?", (key,))
+        return rows[0][0] if rows else None
+
+    def keys_for_uuid(self, conversation_uuid: str) -> List[str]:
+        """Return every key pointing at `conversation_uuid` (uuid index lookup)."""
+        rows = self._query("SELECT key FROM mappings WHERE uuid = ?", (conversation_uuid,))
+        return [key for (key,) in rows]
+
+    def keys_for_model(self, model_id: str) -> List[str]:
+        """Model-only and conversation-scoped keys of one model (model_id index lookup)."""
+        rows = self._query("SELECT key FROM mappings WHERE model_id = ?", (model_id,))
+        return [key for (key,) in rows]
+
+    def keys_for_conversation(self, conversation_id: str) -> List[str]:
+        """Per-model keys of one LLM conversation (conversation_id index lookup)."""
+        rows = self._query(
+            "SELECT key FROM mappings WHERE conversation_id = ? AND model_id IS NOT NULL",
+            (conversation_id,),
+        )
+        return [key for (key,) in rows]
 
-# Load existing conversations on module import
-_load_conversations()
+    def apply(self, mapping: Dict[str, str], upserts: Dict[str, str], deletes: List[str]) -> None:
+        try:
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM mappings WHERE key = ?", [(k,) for k in deletes])
+                conn.executemany(self.UPSERT, self._rows(upserts.items()))
+            self._signature = None
+        except sqlite3.Error as e:
+            _warn(f"Failed to persist conversation mapping to {self.path}: {e}")
 
 
 # Configuration management
+# Read-modify-write attempts before a contended config update gives up
+CONFIG_UPDATE_ATTEMPTS = 5
+
+
+class ConfigConflictError(Exception):
+    """config.json was rewritten by another writer since it was read."""
+
+
 class OptionsConfig:
-    """Manage persistent options configuration"""
+    """Manage persistent options configuration
+
+    Reads for prompts go through a snapshot of config.json that is reused
+    until the file's mtime, size or inode changes, with the merged options of
+    each model (builtin < global < model) computed once per snapshot.
+
+    Writes replace the file atomically (tempfile + os.replace), so readers
+    never see a partial file. The file carries a `version` counter that
+    `save(expected_version=...)` compares and bumps under `config.lock`;
+    `update()` retries read-modify-write cycles that lose that race.
+    """
+
+    # (path, file signature, config, merged options per model)
+    _snapshot_cache = None
 
     def __init__(self):
-        # Try XDG config dir first, fallback to home dir
-        config_dir = Path.home() / ".config" / "llm-1min"
-        if not config_dir.exists():
-            try:
-                config_dir.mkdir(parents=True, exist_ok=True)
-                self.config_path = config_dir / "config.json"
-            except OSError:
-                # Fallback to home directory
-                self.config_path = Path.home() / ".llm-1min.json"
-        else:
-            self.config_path = config_dir / "config.json"
+        # Resolved on first use: llm imports every plugin on each invocation
+        self._config_path = None
+
+    @property
+    def config_path(self) -> Path:
+        if self._config_path is None:
+            # Try XDG config dir first, fallback to home dir
+            config_dir = Path.home() / ".config" / "llm-1min"
+            if not config_dir.exists():
+                try:
+                    config_dir.mkdir(parents=True, exist_ok=True)
+                    self._config_path = config_dir / "config.json"
+                except OSError:
+                    # Fallback to home directory
+                    self._config_path = Path.home() / ".llm-1min.json"
+            else:
+                self._config_path = config_dir / "config.json"
+        return self._config_path
 
-    def load(self) -> Dict[str, Any]:
-        """Load configuration from file"""
+    @config_path.setter
+    def config_path(self, path: Path) -> None:
+        self._config_path = path
+        self._snapshot_cache = None
+
+    @property
+    def lock_path(self) -> Path:
+        return self.config_path.with_suffix(".lock")
+
+    def _read(self, validate: bool = True) -> Tuple[Dict[str, Any], int]:
+        """Return (config without its version field, version)."""
         if not self.config_path.exists():
-            return {"defaults": {}, "models": {}}
+            return {"defaults": {}, "models": {}}, 0
 
         try:
             with open(self.config_path) as f:
                 config = json.load(f)
-        except Exception:
-            return {"defaults": {}, "models": {}}
+        except Exception as e:
+            _warn(f"Ignoring unreadable config {self.config_path}: {e}")
+            return {"defaults": {}, "models": {}}, 0
+        if not isinstance(config, dict):
+            _warn(f"Ignoring config {self.config_path}: not a JSON object")
+            return {"defaults": {}, "models": {}}, 0
+
+        version = config.pop("version", 0)
+        if not isinstance(version, int) or isinstance(version, bool):
+            version = 0
+        if validate:
+            self._check_legacy_keys(config)
+        return config, version
 
-        self._check_legacy_keys(config)
-        return config
+    def load(self) -> Dict[str, Any]:
+        """Load configuration from file"""
+        return self._read()[0]
 
     @staticmethod
     def _check_legacy_keys(config: Dict[str, Any]) -> None:
@@ -160,64 +1351,139 @@ class OptionsConfig:
                 if isinstance(opts, dict):
                     scan(f"models.{model_id}", opts)
 
-    def save(self, config: Dict[str, Any]) -> None:
-        """Save configuration to file"""
+    def _snapshot(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Return (config, merged options per model), reparsing only when the file changed."""
+        path = self.config_path
+        signature = _file_signature(path)
+        cache = self._snapshot_cache
+        if cache is not None and cache[0] == path and cache[1] == signature:
+            return cache[2], cache[3]
+        # Stat before reading: a write in between is picked up by the next call
+        config = self.load()
+        if not isinstance(config, dict):
+            config = {"defaults": {}, "models": {}}
+        self._snapshot_cache = (path, signature, config, {})
+        return config, self._snapshot_cache[3]
+
+    def resolved_options(self, model_id: str) -> Dict[str, Any]:
+        """
+        Saved options for a model merged over its builtin defaults.
+
+        Priority: builtin MODEL_DEFAULTS < global defaults < model options.
+        The returned dict is shared by every call until config.json changes;
+        copy it before modifying.
+        """
+        config, merged = self._snapshot()
+        options = merged.get(model_id)
+        if options is None:
+            options = {
+                **MODEL_DEFAULTS.get(model_id, {}),
+                **(config.get("defaults") or {}),
+                **((config.get("models") or {}).get(model_id) or {}),
+            }
+            merged[model_id] = options
+        return options
+
+    def save(self, config: Dict[str, Any], expected_version: Optional[int] = None) -> int:
+        """
+        Atomically replace the configuration file.
+
+        Args:
+            config: Configuration to write (any `version` key is replaced)
+            expected_version: Only write if the file is still at this version
+
+        Returns:
+            The new version number
+
+        Raises:
+            ConfigConflictError: If the file's version is not `expected_version`
+        """
+        self._snapshot_cache = None
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w") as f:
-                json.dump(config, f, indent=2)
+            with _file_lock(self.lock_path):
+                current = self._read(validate=False)[1]
+                if expected_version is not None and current != expected_version:
+                    raise ConfigConflictError(
+                        f"{self.config_path} changed (version {current}, "
+                        f"expected {expected_version})"
+                    )
+                body = {k: v for k, v in config.items() if k != "version"}
+                _atomic_write_json(self.config_path, {"version": current + 1, **body}, indent=2)
+        except ConfigConflictError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to save config: {e}")
+        return current + 1
+
+    def update(self, mutate, validate: bool = True) -> bool:
+        """
+        Apply `mutate(config)` to the saved config with compare-and-swap.
+
+        `mutate` edits the dict in place and returns True if anything changed
+        (nothing is written otherwise). It is re-run on a fresh read when
+        another writer saved in between.
+
+        Returns:
+            Whether the config was changed
+        """
+        for _ in range(CONFIG_UPDATE_ATTEMPTS):
+            config, version = self._read(validate)
+            if not mutate(config):
+                return False
+            try:
+                self.save(config, expected_version=version)
+                return True
+            except ConfigConflictError:
+                continue
+        raise ConfigConflictError(
+            f"{self.config_path} kept changing; gave up after {CONFIG_UPDATE_ATTEMPTS} attempts"
+        )
 
     def get_defaults(self) -> Dict[str, Any]:
         """Get global default options"""
-        config = self.load()
-        return config.get("defaults", {})
+        config, _merged = self._snapshot()
+        return dict(config.get("defaults") or {})
 
     def get_model_options(self, model_id: str) -> Dict[str, Any]:
         """Get options for specific model"""
-        config = self.load()
-        return config.get("models", {}).get(model_id, {})
+        config, _merged = self._snapshot()
+        return dict((config.get("models") or {}).get(model_id) or {})
 
     def set_option(self, key: str, value: Any, model_id: Optional[str] = None) -> None:
         """Set an option (global or per-model)"""
-        config = self.load()
 
-        if model_id:
-            if "models" not in config:
-                config["models"] = {}
-            if model_id not in config["models"]:
-                config["models"][model_id] = {}
-            config["models"][model_id][key] = value
-        else:
-            if "defaults" not in config:
-                config["defaults"] = {}
-            config["defaults"][key] = value
+        def apply(config):
+            if model_id:
+                if "models" not in config:
+                    config["models"] = {}
+                if model_id not in config["models"]:
+                    config["models"][model_id] = {}
+                config["models"][model_id][key] = value
+            else:
+                if "defaults" not in config:
+                    config["defaults"] = {}
+                config["defaults"][key] = value
+            return True
 
-        self.save(config)
+        self.update(apply)
 
     def unset_option(self, key: str, model_id: Optional[str] = None) -> bool:
         """Unset an option. Returns True if something was removed."""
-        config = self.load()
-        removed = False
 
-        if model_id:
-            if model_id in config.get("models", {}):
-                if key in config["models"][model_id]:
+        def apply(config):
+            if model_id:
+                if key in config.get("models", {}).get(model_id, {}):
                     del config["models"][model_id][key]
-                    removed = True
                     # Clean up empty model configs
                     if not config["models"][model_id]:
                         del config["models"][model_id]
-        else:
-            if key in config.get("defaults", {}):
+                    return True
+            elif key in config.get("defaults", {}):
                 del config["defaults"][key]
-                removed = True
-
-        if removed:
-            self.save(config)
+                return True
+            return False
 
-        return removed
+        return self.update(apply)
 
     def reset(self) -> None:
         """Reset all options to defaults"""
@@ -245,74 +1511,130 @@ def clear_conversation(model_id: str, api_key: str, conversation_uuid: str = Non
         # Find exact mapping matches for this model only:
         # - model-only key: "1min/gpt-4o"
         # - conversation-scoped key: "{conversation_id}_1min/gpt-4o"
-        for key, uuid in list(_conversation_mapping.items()):
-            if key == model_id or key.endswith(f"_{model_id}"):
-                conversation_uuid = uuid
-                break
+        keys = _mapping_keys_for_model(model_id)
+        if keys:
+            conversation_uuid = _mapping_get(keys[0])
 
     if conversation_uuid is None:
         return False
 
     # Try to delete from API
-    # Common patterns: DELETE /api/conversations/{uuid}
-    try:
-        headers = {"API-KEY": api_key, "Content-Type": "application/json"}
+    success = _delete_remote_conversation(
+        api_key, conversation_uuid, _default_retry_policy(), _default_rate_limiter()
+    )
+    if success:
+        # Remove every local key pointing to this UUID.
+        # A single UUID can be referenced by multiple keys when history_mixed is enabled.
+        removed = _forget_conversation_uuid(conversation_uuid)
+        if removed:
+            _persist_mapping(deletes=removed)
+            flush_conversations()
+    return success
+
+
+# Bulk deletion: bounded number of DELETEs in flight; the mapping is persisted
+# in batches instead of once per deleted conversation.
+DELETE_CONCURRENCY = 8
+DELETE_PERSIST_EVERY = 500
+
 
-        response = requests.delete(
+def _delete_remote_conversation(api_key, conversation_uuid, policy, limiter) -> bool:
+    """DELETE /api/conversations/{uuid}. Returns True on 200, 204 or 404 (already gone)."""
+    headers = {"API-KEY": api_key, "Content-Type": "application/json"}
+    try:
+        response = _send_with_retry(
+            "delete",
             f"https://api.1min.ai/api/conversations/{conversation_uuid}",
+            policy,
+            idempotent=True,
+            limiter=limiter,
             headers=headers,
             timeout=30,
         )
-
-        # Success codes: 200, 204, or 404 (already deleted)
-        success = response.status_code in [200, 204, 404]
-        if success:
-            # Remove every local key pointing to this UUID.
-            # A single UUID can be referenced by multiple keys when history_mixed is enabled.
-            removed = False
-            for key, uuid in list(_conversation_mapping.items()):
-                if uuid == conversation_uuid:
-                    del _conversation_mapping[key]
-                    removed = True
-            if removed:
-                _save_conversations()
-        return success
     except requests.RequestException:
         return False
+    return response.status_code in [200, 204, 404]
 
 
-def clear_all_conversations(api_key: str) -> int:
+def _forget_conversation_uuid(conversation_uuid) -> List[str]:
+    """Drop every mapping key pointing at `conversation_uuid` (in memory only).
+
+    Returns the removed keys.
+    """
+    with _mapping_lock:
+        removed = _mapping_keys_for_uuid(conversation_uuid)
+        for key in removed:
+            _conversation_mapping.pop(key, None)
+    return removed
+
+
+def iter_delete_conversations(api_key: str, uuids, concurrency: int = DELETE_CONCURRENCY):
+    """
+    Delete conversations on the 1min.ai server concurrently.
+
+    Args:
+        api_key: 1min.ai API key
+        uuids: Conversation UUIDs to delete
+        concurrency: Maximum number of DELETE requests in flight
+
+    Yields:
+        (uuid, success) tuples in completion order, on the calling thread
+    """
+    uuids = list(dict.fromkeys(uuids))
+    if not uuids:
+        return
+    defaults = _saved_defaults()
+    policy = _default_retry_policy(defaults)
+    limiter = _default_rate_limiter(defaults)
+    workers = max(1, min(int(concurrency), len(uuids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-1min-delete") as pool:
+        futures = {
+            pool.submit(_delete_remote_conversation, api_key, uuid, policy, limiter): uuid
+            for uuid in uuids
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def clear_all_conversations(
+    api_key: str, concurrency: int = DELETE_CONCURRENCY, progress=None
+) -> int:
     """
     Clear all tracked conversations.
 
     Args:
         api_key: 1min.ai API key
+        concurrency: Maximum number of DELETE requests in flight
+        progress: Optional callback(done, total) called after each deletion
 
     Returns:
         Number of conversations cleared
     """
+    _load_conversations()
     count = 0
-    any_removed = False
-    uuids = list(dict.fromkeys(_conversation_mapping.values()))
-    for uuid in uuids:
-        try:
-            headers = {"API-KEY": api_key, "Content-Type": "application/json"}
-
-            response = requests.delete(
-                f"https://api.1min.ai/api/conversations/{uuid}", headers=headers, timeout=30
-            )
-
-            if response.status_code in [200, 204, 404]:
-                for key, mapped_uuid in list(_conversation_mapping.items()):
-                    if mapped_uuid == uuid:
-                        del _conversation_mapping[key]
-                        any_removed = True
-                count += 1
-        except requests.RequestException:
-            continue
-
-    if any_removed:
-        _save_conversations()  # Persist the deletions
+    pending_save = 0
+    removed = []
+    uuids = _conversation_mapping.uuids()
+    for done, (uuid, success) in enumerate(
+        iter_delete_conversations(api_key, uuids, concurrency), start=1
+    ):
+        if success:
+            count += 1
+            keys = _forget_conversation_uuid(uuid)
+            if keys:
+                pending_save += 1
+                removed.extend(keys)
+            if pending_save >= DELETE_PERSIST_EVERY:
+                _persist_mapping(deletes=removed)
+                flush_conversations()
+                pending_save = 0
+                removed = []
+        if progress is not None:
+            progress(done, len(uuids))
+
+    if pending_save:
+        _persist_mapping(deletes=removed)  # Persist the deletions
+        flush_conversations()
 
     return count
 
@@ -328,168 +1650,1095 @@ def get_active_conversations() -> dict:
     return _conversation_mapping.copy()
 
 
-@llm.hookimpl
-def register_models(register):
-    """Register 1min.ai models with LLM (catalog refreshed for 1min.ai API v2)."""
+# Garbage collection: reconcile the local mapping with the server.
+GC_PAGE_SIZE = 100
+GC_MAX_PAGES = 1000
+# Title prefix of conversations created by this plugin. Only these are ever
+# treated as orphans, so conversations made in the 1min.ai web app are safe.
+PLUGIN_CONVERSATION_TITLE = "LLM Chat - "
 
-    # OpenAI Models
-    register(OneMinModel("1min/gpt-3.5-turbo", "gpt-3.5-turbo", "GPT-3.5 Turbo"))
-    register(OneMinModel("1min/gpt-4-turbo", "gpt-4-turbo", "GPT-4 Turbo"))
-    register(OneMinModel("1min/gpt-4.1", "gpt-4.1", "GPT-4.1"))
-    register(OneMinModel("1min/gpt-4.1-mini", "gpt-4.1-mini", "GPT-4.1 Mini"))
-    register(OneMinModel("1min/gpt-4.1-nano", "gpt-4.1-nano", "GPT-4.1 Nano"))
-    register(OneMinModel("1min/gpt-4o-mini", "gpt-4o-mini", "GPT-4o Mini"))
-    register(OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o"))
-    register(OneMinModel("1min/gpt-5", "gpt-5", "GPT-5"))
-    register(OneMinModel("1min/gpt-5-mini", "gpt-5-mini", "GPT-5 Mini"))
-    register(OneMinModel("1min/gpt-5-nano", "gpt-5-nano", "GPT-5 Nano"))
-    register(OneMinModel("1min/gpt-5-chat-latest", "gpt-5-chat-latest", "GPT-5 Chat Latest"))
-    register(OneMinModel("1min/gpt-5.1", "gpt-5.1", "GPT-5.1"))
-    register(OneMinModel("1min/gpt-5.1-codex", "gpt-5.1-codex", "GPT-5.1 Codex"))
-    register(OneMinModel("1min/gpt-5.1-codex-mini", "gpt-5.1-codex-mini", "GPT-5.1 Codex Mini"))
-    register(OneMinModel("1min/gpt-5.2", "gpt-5.2", "GPT-5.2"))
-    register(OneMinModel("1min/gpt-5.2-pro", "gpt-5.2-pro", "GPT-5.2 Pro"))
-    register(OneMinModel("1min/gpt-5.4", "gpt-5.4", "GPT-5.4"))
-    register(OneMinModel("1min/gpt-5.4-mini", "gpt-5.4-mini", "GPT-5.4 Mini"))
-    register(OneMinModel("1min/gpt-5.4-nano", "gpt-5.4-nano", "GPT-5.4 Nano"))
-    register(OneMinModel("1min/gpt-5.4-pro", "gpt-5.4-pro", "GPT-5.4 Pro"))
-    register(OneMinModel("1min/o3", "o3", "o3"))
-    register(OneMinModel("1min/o3-mini", "o3-mini", "o3 Mini"))
-    register(OneMinModel("1min/o3-pro", "o3-pro", "o3 Pro"))
-    register(OneMinModel("1min/o3-deep-research", "o3-deep-research", "o3 Deep Research"))
-    register(OneMinModel("1min/o4-mini", "o4-mini", "o4 Mini"))
-    register(
-        OneMinModel("1min/o4-mini-deep-research", "o4-mini-deep-research", "o4 Mini Deep Research")
-    )
 
-    # Anthropic Models
-    register(OneMinModel("1min/claude-4-sonnet", "claude-sonnet-4-20250514", "Claude 4 Sonnet"))
-    register(
-        OneMinModel("1min/claude-4-5-sonnet", "claude-sonnet-4-5-20250929", "Claude 4.5 Sonnet")
-    )
-    register(OneMinModel("1min/claude-4-6-sonnet", "claude-sonnet-4-6", "Claude 4.6 Sonnet"))
-    register(OneMinModel("1min/claude-4-opus", "claude-opus-4-20250514", "Claude 4 Opus"))
-    register(OneMinModel("1min/claude-4-1-opus", "claude-opus-4-1-20250805", "Claude 4.1 Opus"))
-    register(OneMinModel("1min/claude-4-5-opus", "claude-opus-4-5-20251101", "Claude 4.5 Opus"))
-    register(OneMinModel("1min/claude-4-6-opus", "claude-opus-4-6", "Claude 4.6 Opus"))
-    register(OneMinModel("1min/claude-4-5-haiku", "claude-haiku-4-5-20251001", "Claude 4.5 Haiku"))
-
-    # Google Models
-    register(OneMinModel("1min/gemini-2.5-flash", "gemini-2.5-flash", "Gemini 2.5 Flash"))
-    register(OneMinModel("1min/gemini-2.5-pro", "gemini-2.5-pro", "Gemini 2.5 Pro"))
-    register(
-        OneMinModel("1min/gemini-3-flash", "gemini-3-flash-preview", "Gemini 3 Flash (Preview)")
-    )
-    register(
-        OneMinModel(
-            "1min/gemini-3.1-flash-lite",
-            "gemini-3.1-flash-lite-preview",
-            "Gemini 3.1 Flash Lite (Preview)",
+def _iter_remote_conversations(api_key, policy, limiter, page_size: Optional[int] = None):
+    """
+    Page through GET /api/conversations.
+
+    Stops on an empty or short page, or on a page with no new UUIDs (a server
+    that ignores the paging parameters returns the same list every time).
+
+    Raises:
+        requests.RequestException: If a page cannot be fetched
+    """
+    page_size = page_size or GC_PAGE_SIZE
+    headers = {"API-KEY": api_key, "Content-Type": "application/json"}
+    seen = set()
+    for page in range(1, GC_MAX_PAGES + 1):
+        response = _send_with_retry(
+            "get",
+            "https://api.1min.ai/api/conversations",
+            policy,
+            idempotent=True,
+            limiter=limiter,
+            headers=headers,
+            params={"page": page, "limit": page_size},
+            timeout=30,
         )
-    )
-    register(
-        OneMinModel("1min/gemini-3.1-pro", "gemini-3.1-pro-preview", "Gemini 3.1 Pro (Preview)")
-    )
+        response.raise_for_status()
+        body = response.json()
+        batch = [
+            conv
+            for conv in (body.get("conversations") if isinstance(body, dict) else None) or []
+            if isinstance(conv, dict) and conv.get("uuid")
+        ]
+        fresh = [conv for conv in batch if conv["uuid"] not in seen]
+        for conv in fresh:
+            seen.add(conv["uuid"])
+            yield conv
+        if len(batch) < page_size or not fresh:
+            return
 
-    # Alibaba (Qwen) Models
-    register(OneMinModel("1min/qwen-flash", "qwen-flash", "Qwen Flash"))
-    register(OneMinModel("1min/qwen-plus", "qwen-plus", "Qwen Plus"))
-    register(OneMinModel("1min/qwen-max", "qwen-max", "Qwen Max"))
-    register(OneMinModel("1min/qwen-vl-plus", "qwen-vl-plus", "Qwen VL Plus"))
-    register(OneMinModel("1min/qwen-vl-max", "qwen-vl-max", "Qwen VL Max"))
-    register(OneMinModel("1min/qwen3-max", "qwen3-max", "Qwen3 Max"))
-    register(OneMinModel("1min/qwen3-vl-flash", "qwen3-vl-flash", "Qwen3 VL Flash"))
-    register(OneMinModel("1min/qwen3-vl-plus", "qwen3-vl-plus", "Qwen3 VL Plus"))
-    register(OneMinModel("1min/qwen3-coder-plus", "qwen3-coder-plus", "Qwen3 Coder Plus"))
-    register(OneMinModel("1min/qwen3-coder-flash", "qwen3-coder-flash", "Qwen3 Coder Flash"))
-
-    # DeepSeek Models
-    register(OneMinModel("1min/deepseek-chat", "deepseek-chat", "DeepSeek V3.2 Chat"))
-    register(OneMinModel("1min/deepseek-reasoner", "deepseek-reasoner", "DeepSeek V3.2 Reasoner"))
-
-    # xAI Models
-    register(OneMinModel("1min/grok-3", "grok-3", "Grok 3"))
-    register(OneMinModel("1min/grok-3-mini", "grok-3-mini", "Grok 3 Mini"))
-    register(OneMinModel("1min/grok-4", "grok-4-0709", "Grok 4"))
-    register(
-        OneMinModel(
-            "1min/grok-4-fast-non-reasoning",
-            "grok-4-fast-non-reasoning",
-            "Grok 4 Fast Non-Reasoning",
+
+def _remote_conversation_missing(api_key, conversation_uuid, policy, limiter) -> bool:
+    """True only if GET /api/conversations/{uuid} answers 404."""
+    try:
+        response = _send_with_retry(
+            "get",
+            f"https://api.1min.ai/api/conversations/{conversation_uuid}",
+            policy,
+            idempotent=True,
+            limiter=limiter,
+            headers={"API-KEY": api_key, "Content-Type": "application/json"},
+            timeout=30,
         )
-    )
-    register(
-        OneMinModel("1min/grok-4-fast-reasoning", "grok-4-fast-reasoning", "Grok 4 Fast Reasoning")
-    )
-    register(OneMinModel("1min/grok-code-fast-1", "grok-code-fast-1", "Grok Code Fast 1"))
+    except requests.RequestException:
+        return False
+    return response.status_code == 404
 
-    # Mistral Models
-    register(OneMinModel("1min/open-mistral-nemo", "open-mistral-nemo", "Mistral Open Nemo"))
-    register(OneMinModel("1min/mistral-small-latest", "mistral-small-latest", "Mistral Small"))
-    register(
-        OneMinModel("1min/mistral-medium-latest", "mistral-medium-latest", "Mistral Medium 3.1")
-    )
-    register(OneMinModel("1min/mistral-large-latest", "mistral-large-latest", "Mistral Large 2"))
-    register(
-        OneMinModel("1min/magistral-small-latest", "magistral-small-latest", "Magistral Small 1.2")
+
+def _conversation_age(conversation: dict, now: float) -> Optional[float]:
+    """Seconds since the conversation's `createdAt`, or None if it is unparseable."""
+    created = conversation.get("createdAt")
+    if not isinstance(created, str):
+        return None
+    try:
+        created_at = datetime.fromisoformat(created.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return now - created_at.timestamp()
+
+
+def gc_conversations(
+    api_key: str,
+    orphan_max_age: Optional[float] = None,
+    dry_run: bool = False,
+    concurrency: int = DELETE_CONCURRENCY,
+) -> Dict[str, Any]:
+    """
+    Reconcile the local conversation mapping with the 1min.ai server.
+
+    Local UUIDs missing from the server listing are confirmed with a GET
+    (bounded by `concurrency`) and their mapping keys dropped only on 404.
+    With `orphan_max_age` (seconds), plugin-created server conversations that
+    no mapping key or warm pool entry references and that are older than the
+    limit are deleted as well.
+
+    Args:
+        api_key: 1min.ai API key
+        orphan_max_age: Delete unreferenced conversations older than this; None keeps them
+        dry_run: Report what would change without deleting or saving anything
+        concurrency: Maximum number of GET/DELETE requests in flight
+
+    Returns:
+        Report dict: server, local, dead (UUIDs), dropped_keys, orphans (UUIDs),
+        deleted and failed counts
+
+    Raises:
+        requests.RequestException: If the server listing fails (nothing is changed)
+    """
+    policy = _default_retry_policy()
+    limiter = _default_rate_limiter()
+    _load_conversations()
+    # Snapshot before listing: conversations created meanwhile are not judged
+    local = set(_conversation_mapping.uuids())
+    remote = list(_iter_remote_conversations(api_key, policy, limiter))
+    remote_uuids = {conv["uuid"] for conv in remote}
+
+    candidates = sorted(local - remote_uuids)
+    dead = []
+    if candidates:
+        workers = max(1, min(int(concurrency), len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-1min-gc") as pool:
+            missing = pool.map(
+                lambda uuid: _remote_conversation_missing(api_key, uuid, policy, limiter),
+                candidates,
+            )
+            dead = [uuid for uuid, gone in zip(candidates, missing) if gone]
+
+    dropped = []
+    if dead:
+        _load_conversations()
+        if dry_run:
+            dropped = [key for uuid in dead for key in _conversation_mapping.keys_for_uuid(uuid)]
+        else:
+            for uuid in dead:
+                dropped.extend(_forget_conversation_uuid(uuid))
+            _persist_mapping(deletes=dropped)
+            flush_conversations()
+
+    orphans = []
+    if orphan_max_age is not None:
+        referenced = local | set(_conversation_mapping.uuids()) | ConversationPool(0).uuids()
+        now = time.time()
+        for conv in remote:
+            age = _conversation_age(conv, now)
+            if (
+                conv["uuid"] not in referenced
+                and str(conv.get("title") or "").startswith(PLUGIN_CONVERSATION_TITLE)
+                and age is not None
+                and age >= orphan_max_age
+            ):
+                orphans.append(conv["uuid"])
+
+    deleted = failed = 0
+    if orphans and not dry_run:
+        for _uuid, success in iter_delete_conversations(api_key, orphans, concurrency):
+            if success:
+                deleted += 1
+            else:
+                failed += 1
+
+    return {
+        "server": len(remote_uuids),
+        "local": len(local),
+        "dead": dead,
+        "dropped_keys": dropped,
+        "orphans": orphans,
+        "deleted": deleted,
+        "failed": failed,
+    }
+
+
+# Warm pool: conversations created ahead of time so a fresh prompt skips the
+# POST /api/conversations round-trip.
+WARM_POOL_DEFAULTS = {"warm_pool_ttl": 3600}
+# Longest an exiting process waits for refills still in flight
+WARM_POOL_EXIT_WAIT = 5.0
+
+
+def _join_warm_pool_refills() -> None:
+    """Wait (at most WARM_POOL_EXIT_WAIT seconds in total) for background refills."""
+    deadline = time.monotonic() + WARM_POOL_EXIT_WAIT
+    for thread in threading.enumerate():
+        if thread.name == "llm-1min-warm-pool":
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+
+atexit.register(_join_warm_pool_refills)
+
+
+def _create_remote_conversation(api_key, payload, policy, limiter) -> str:
+    """POST /api/conversations and return the new conversation UUID."""
+    response = _send_with_retry(
+        "post",
+        "https://api.1min.ai/api/conversations",
+        policy,
+        limiter=limiter,
+        headers={"API-KEY": api_key, "Content-Type": "application/json"},
+        json=payload,
+        timeout=30,
     )
-    register(
-        OneMinModel(
-            "1min/magistral-medium-latest", "magistral-medium-latest", "Magistral Medium 1.2"
+    response.raise_for_status()
+    return response.json()["conversation"]["uuid"]
+
+
+class ConversationPool:
+    """Pre-created 1min.ai conversations per (API key, model, conversation type).
+
+    Pool state lives in `warmpool.json` next to conversations.json and is
+    read-modify-written under an exclusive file lock, so every local process
+    claims from (and tops up) the same pool. Entries older than the TTL are
+    never handed out; the next refill deletes them server-side. As with the
+    rate limiter, API keys are stored only as a truncated SHA-256.
+    """
+
+    _refilling = set()
+    _refilling_lock = threading.Lock()
+
+    def __init__(self, size: int, ttl: Optional[float] = None, state_file: Path = None):
+        self.size = int(size)
+        self.ttl = float(ttl if ttl is not None else WARM_POOL_DEFAULTS["warm_pool_ttl"])
+        self.state_file = state_file or (_get_conversation_file().parent / "warmpool.json")
+        self.lock_file = self.state_file.with_suffix(".lock")
+
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> Optional["ConversationPool"]:
+        """Return a pool when `warm_pool_size` is set, else None (disabled)."""
+        size = options.get("warm_pool_size")
+        if not size:
+            return None
+        return cls(size, options.get("warm_pool_ttl"))
+
+    @staticmethod
+    def pool_key(api_key: str, model_id: str, conversation_type: str) -> str:
+        return f"{RateLimiter._bucket_id(api_key)}:{model_id}:{conversation_type}"
+
+    def _read(self) -> Dict[str, list]:
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(state, dict):
+            return {}
+        return {k: v for k, v in state.items() if isinstance(v, list)}
+
+    def _write(self, state: Dict[str, list]) -> None:
+        try:
+            _atomic_write_json(self.state_file, {k: v for k, v in state.items() if v})
+        except OSError as e:
+            _warn(f"Could not update warm pool {self.state_file}: {e}")
+
+    def _partition(self, entries, now):
+        """Split pool entries into (fresh, expired) lists, oldest first."""
+        fresh, expired = [], []
+        for entry in entries or []:
+            if not isinstance(entry, dict) or "uuid" not in entry:
+                continue
+            if now - entry.get("created", 0) < self.ttl:
+                fresh.append(entry)
+            else:
+                expired.append(entry)
+        return fresh, expired
+
+    def claim(self, api_key: str, model_id: str, conversation_type: str) -> Optional[str]:
+        """Take the oldest unexpired pooled conversation, or None if the pool is empty."""
+        key = self.pool_key(api_key, model_id, conversation_type)
+        with _file_lock(self.lock_file):
+            state = self._read()
+            fresh, expired = self._partition(state.get(key), time.time())
+            if not fresh:
+                return None
+            entry = fresh.pop(0)
+            state[key] = fresh + expired  # expired entries are deleted by the next refill
+            self._write(state)
+        return entry["uuid"]
+
+    def refill(self, api_key, model_id, conversation_type, payload, policy=None, limiter=None):
+        """
+        Top the pool up to `size` fresh conversations.
+
+        Expired entries are deleted server-side. Conversations created past
+        `size` by a concurrent refill in another process are deleted again.
+
+        Returns:
+            Number of conversations added to the pool
+        """
+        key = self.pool_key(api_key, model_id, conversation_type)
+        policy = policy or _default_retry_policy()
+        with _file_lock(self.lock_file):
+            state = self._read()
+            fresh, expired = self._partition(state.get(key), time.time())
+            if expired:
+                state[key] = fresh
+                self._write(state)
+
+        for entry in expired:
+            _delete_remote_conversation(api_key, entry["uuid"], policy, limiter)
+
+        created = []
+        for _ in range(self.size - len(fresh)):
+            try:
+                conversation_uuid = _create_remote_conversation(api_key, payload, policy, limiter)
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                _warn(f"Could not pre-create a conversation for {model_id}: {e}")
+                break
+            created.append({"uuid": conversation_uuid, "created": time.time()})
+        if not created:
+            return 0
+
+        with _file_lock(self.lock_file):
+            state = self._read()
+            fresh, expired = self._partition(state.get(key), time.time())
+            pooled = fresh + created
+            surplus = pooled[self.size :]
+            state[key] = pooled[: self.size] + expired
+            self._write(state)
+
+        for entry in surplus:
+            _delete_remote_conversation(api_key, entry["uuid"], policy, limiter)
+        return len(created) - len(surplus)
+
+    def refill_in_background(
+        self, api_key, model_id, conversation_type, payload, policy=None, limiter=None
+    ) -> Optional[threading.Thread]:
+        """Start a refill thread unless one is already running for this pool in this process."""
+        key = self.pool_key(api_key, model_id, conversation_type)
+        with self._refilling_lock:
+            if key in self._refilling:
+                return None
+            self._refilling.add(key)
+
+        def run():
+            try:
+                self.refill(api_key, model_id, conversation_type, payload, policy, limiter)
+            finally:
+                with self._refilling_lock:
+                    self._refilling.discard(key)
+
+        # Daemon, so a hung create cannot keep the process alive; a one-shot
+        # `llm` process still gives it WARM_POOL_EXIT_WAIT to finish at exit.
+        thread = threading.Thread(target=run, name="llm-1min-warm-pool", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return {"model:type": {"ready": n, "expired": n}} across all API keys."""
+        with _file_lock(self.lock_file):
+            state = self._read()
+        now = time.time()
+        summary = {}
+        for key, entries in state.items():
+            fresh, expired = self._partition(entries, now)
+            pool_name = key.split(":", 1)[-1]
+            counts = summary.setdefault(pool_name, {"ready": 0, "expired": 0})
+            counts["ready"] += len(fresh)
+            counts["expired"] += len(expired)
+        return summary
+
+    def uuids(self) -> set:
+        """Every pooled conversation UUID, fresh or expired, across all API keys."""
+        with _file_lock(self.lock_file):
+            state = self._read()
+        return {
+            entry["uuid"]
+            for entries in state.values()
+            for entry in entries
+            if isinstance(entry, dict) and "uuid" in entry
+        }
+
+    def drain(self, api_key: str) -> list:
+        """Remove every pooled conversation for `api_key` and return their UUIDs."""
+        prefix = f"{RateLimiter._bucket_id(api_key)}:"
+        with _file_lock(self.lock_file):
+            state = self._read()
+            drained = [
+                entry["uuid"]
+                for key in [k for k in state if k.startswith(prefix)]
+                for entry in state.pop(key)
+                if isinstance(entry, dict) and "uuid" in entry
+            ]
+            self._write(state)
+        return drained
+
+
+# Response cache: complete replies to stateless prompts, replayed locally.
+CACHE_DEFAULTS = {"cache_ttl": 86400, "cache_max_entries": 1000}
+CACHE_MODES = ("on", "off", "refresh")
+
+
+class ResponseCache:
+    """SQLite cache of complete responses, keyed on model + normalized request.
+
+    Only prompts without prior turns are cached, and hits are only served
+    where no later turn can follow (see _cached_response). The key is a
+    SHA-256 of the model, endpoint and request payload (prompt, web search,
+    history, attachments, brand voice) with the conversation UUID removed.
+    Entries expire after `ttl` seconds and the least recently used ones are
+    evicted beyond `max_entries`. Mode "refresh" skips lookups but stores the
+    fresh reply. Any SQLite error degrades to a cache miss.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            chunks TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            accessed REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+        CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+    """
+
+    def __init__(self, mode="on", ttl=None, max_entries=None, path: Path = None):
+        self.mode = mode
+        self.ttl = float(ttl if ttl is not None else CACHE_DEFAULTS["cache_ttl"])
+        self.max_entries = int(
+            max_entries if max_entries is not None else CACHE_DEFAULTS["cache_max_entries"]
         )
-    )
-    register(OneMinModel("1min/ministral-14b-latest", "ministral-14b-latest", "Ministral 14B"))
+        self.path = path or (_get_conversation_file().parent / "responses.sqlite")
 
-    # Cohere Models
-    register(OneMinModel("1min/command-r", "command-r-08-2024", "Command R"))
+    @classmethod
+    def from_options(cls, options: Dict[str, Any]) -> Optional["ResponseCache"]:
+        """Return a cache when the `cache` option is "on" or "refresh", else None."""
+        mode = options.get("cache")
+        if not mode or mode == "off":
+            return None
+        return cls(mode, options.get("cache_ttl"), options.get("cache_max_entries"))
 
-    # Meta / open-source
-    register(OneMinModel("1min/llama-2-70b", "meta/llama-2-70b-chat", "LLaMA 2 70b"))
-    register(OneMinModel("1min/llama-3-70b", "meta/meta-llama-3-70b-instruct", "LLaMA 3 70b"))
-    register(OneMinModel("1min/llama-4-scout", "meta/llama-4-scout-instruct", "LLaMA 4 Scout"))
-    register(
-        OneMinModel("1min/llama-4-maverick", "meta/llama-4-maverick-instruct", "LLaMA 4 Maverick")
-    )
-    register(OneMinModel("1min/gpt-oss-20b", "openai/gpt-oss-20b", "GPT OSS 20b"))
-    register(OneMinModel("1min/gpt-oss-120b", "openai/gpt-oss-120b", "GPT OSS 120b"))
-
-    # Perplexity Models
-    register(OneMinModel("1min/sonar", "sonar", "Perplexity Sonar"))
-    register(OneMinModel("1min/sonar-pro", "sonar-pro", "Perplexity Sonar Pro"))
-    register(
-        OneMinModel(
-            "1min/sonar-reasoning-pro",
-            "sonar-reasoning-pro",
-            "Perplexity Sonar Reasoning Pro",
+    @staticmethod
+    def key_for(model_id: str, url: str, payload: Dict[str, Any]) -> str:
+        """Hash the request as the server would see it, minus conversation state."""
+        payload = dict(payload)
+        payload.pop("conversationId", None)
+        prompt_object = dict(payload.get("promptObject") or {})
+        prompt_object.pop("conversationId", None)
+        payload["promptObject"] = prompt_object
+        normalized = json.dumps(
+            {"model": model_id, "endpoint": url.split("?", 1)[0], "payload": payload},
+            sort_keys=True,
+            separators=(",", ":"),
         )
-    )
-    register(
-        OneMinModel(
-            "1min/sonar-deep-research",
-            "sonar-deep-research",
-            "Perplexity Sonar Deep Research",
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10)
+        try:
+            conn.executescript(self.SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+        try:
+            os.chmod(self.path, 0o600)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _count(conn, name: str) -> None:
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,),
+        )
+
+    def get(self, key: str) -> Optional[list]:
+        """Return the cached chunks for `key`, or None on a miss / refresh."""
+        if self.mode == "refresh":
+            return None
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT chunks FROM responses WHERE key = ? AND created > ?",
+                    (key, now - self.ttl),
+                ).fetchone()
+                if row is None:
+                    self._count(conn, "misses")
+                    return None
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self._count(conn, "hits")
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError) as e:
+            _warn(f"Response cache lookup failed ({self.path}): {e}")
+            return None
+
+    def put(self, key: str, model_id: str, chunks: list) -> None:
+        """Store a complete response, then apply TTL and LRU eviction."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, model, chunks, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_id, json.dumps(chunks), sum(map(len, chunks)), now, now),
+                )
+                conn.execute("DELETE FROM responses WHERE created <= ?", (now - self.ttl,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except (sqlite3.Error, OSError) as e:
+            _warn(f"Could not store response in cache {self.path}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, total cached characters and hit/miss counters."""
+        with self._connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            counters = dict(conn.execute("SELECT name, value FROM counters"))
+        return {
+            "entries": entries,
+            "size": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+    def clear(self) -> int:
+        """Delete every cached response and reset counters; return entries removed."""
+        with self._connect() as conn:
+            removed = conn.execute("DELETE FROM responses").rowcount
+            conn.execute("DELETE FROM counters")
+        return removed
+
+
+class ModelCapabilities(NamedTuple):
+    """What a model accepts, decoded from its MODEL_CAPABILITIES row."""
+
+    vision: bool
+    files: bool
+    code_generator: bool
+    web: bool
+    max_context: int
+    latency: str
+
+    @classmethod
+    def for_model(cls, api_model_id: str) -> Optional["ModelCapabilities"]:
+        """Capabilities for an API model id, or None when it is not in the table."""
+        row = MODEL_CAPABILITIES.get(api_model_id)
+        if row is None:
+            return None
+        flags, max_context, latency = row
+        return cls("v" in flags, "f" in flags, "c" in flags, "w" in flags, max_context, latency)
+
+    def summary(self) -> str:
+        """One-line description for `llm 1min models`, e.g. "vision, files | 128k context | fast"."""
+        accepts = [
+            name
+            for name, supported in (
+                ("vision", self.vision),
+                ("files", self.files),
+                ("code", self.code_generator),
+                ("web", self.web),
+            )
+            if supported
+        ]
+        if self.max_context >= 1_000_000:
+            context = f"{self.max_context / 1_000_000:.3g}M"
+        else:
+            context = f"{self.max_context // 1000}k"
+        return f"{', '.join(accepts) or 'text only'} | {context} context | {self.latency}"
+
+    def check(self, merged: Dict[str, Any], prompt_text: str = "") -> None:
+        """
+        Reject merged options this model cannot serve, before any network I/O.
+
+        The context check estimates 4 characters per token, which undercounts
+        for most text, so it only fires on prompts that clearly do not fit.
+
+        Raises:
+            ValueError: Naming the first unsupported option
+        """
+        conversation_type = merged.get("conversation_type", "UNIFY_CHAT_WITH_AI")
+        if conversation_type == "CODE_GENERATOR" and not self.code_generator:
+            raise ValueError("does not support conversation_type CODE_GENERATOR")
+        if merged.get("images") and not self.vision:
+            raise ValueError("does not accept image input ('images' option)")
+        if merged.get("files") and not self.files:
+            raise ValueError("does not accept file input ('files' option)")
+        estimated_tokens = len(prompt_text or "") // 4
+        if estimated_tokens > self.max_context:
+            raise ValueError(
+                f"prompt is about {estimated_tokens:,} tokens, over the "
+                f"{self.max_context:,} token context window"
+            )
+
+
+class ModelInfo(NamedTuple):
+    """Lightweight catalog entry; cheap to build and list without constructing models."""
+
+    model_id: str
+    api_model_id: str
+    display_name: str
+    provider: str
+
+    @property
+    def defaults(self) -> Dict[str, Any]:
+        """Built-in option defaults for this model (MODEL_DEFAULTS)."""
+        return MODEL_DEFAULTS.get(self.api_model_id, {})
+
+    @property
+    def capabilities(self) -> Optional[ModelCapabilities]:
+        """Capability metadata (MODEL_CAPABILITIES), or None for unknown models."""
+        return ModelCapabilities.for_model(self.api_model_id)
+
+    @property
+    def tags(self) -> List[str]:
+        """Capability tags shown by `llm 1min models`: code and/or web."""
+        tags = []
+        if self.defaults.get("conversation_type") == "CODE_GENERATOR":
+            tags.append("code")
+        if self.defaults.get("web_search"):
+            tags.append("web")
+        return tags
+
+
+def builtin_model_catalog() -> List[ModelInfo]:
+    """Return the built-in MODEL_CATALOG table as ModelInfo descriptors."""
+    return [ModelInfo(*row) for row in MODEL_CATALOG]
+
+
+def model_catalog() -> List[ModelInfo]:
+    """
+    Return the models to register and list, in registration order.
+
+    This is the cached server catalog once `llm 1min models --refresh` has
+    fetched it, otherwise the built-in table.
+    """
+    return ModelCatalog().models()
+
+
+# Dynamic catalog: opt-in copy of the server's model list, cached on disk.
+CATALOG_URL = "https://api.1min.ai/api/models"
+CATALOG_TTL = 86400
+
+
+class ModelCatalog:
+    """Server model list cached in `catalog.json`, with MODEL_CATALOG as fallback.
+
+    Nothing is fetched until `refresh()` first runs (`llm 1min models
+    --refresh`). From then on, registration reads the cached copy (without
+    creating the config directory). Once it is older than the TTL, the first
+    1min.ai prompt of a process revalidates it on a daemon thread with
+    If-None-Match / If-Modified-Since, so neither startup nor the prompt waits
+    on the network. Server models with a known API id keep their built-in
+    names and provider; built-in models missing from the server list are no
+    longer registered. Server ids containing "_" are registered under an LLM
+    id with "-" instead, since mapping keys split on "_" (`split_mapping_key`).
+    A missing, unreadable or empty cache falls back to the built-in table.
+    """
+
+    _refreshing = False
+    _refreshing_lock = threading.Lock()
+
+    def __init__(self, path: Path = None, ttl: Optional[float] = None, url: str = None):
+        self.path = path or (_config_dir() / "catalog.json")
+        self.ttl = float(CATALOG_TTL if ttl is None else ttl)
+        self.url = url or CATALOG_URL
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(state, dict) or not isinstance(state.get("models"), list):
+            return None
+        return state if state["models"] else None
+
+    def is_stale(self) -> bool:
+        state = self._read()
+        return state is not None and time.time() - state.get("fetched", 0) >= self.ttl
+
+    @staticmethod
+    def parse(body) -> List[Dict[str, str]]:
+        """Normalize a models listing into [{"id", "name", "provider"}] entries.
+
+        Accepts a bare list or one wrapped in "models"/"data"; entries may be
+        strings or objects keyed by id/modelId/model.
+        """
+        if isinstance(body, dict):
+            body = body.get("models") or body.get("data") or []
+        entries = []
+        for item in body if isinstance(body, list) else []:
+            if isinstance(item, str):
+                item = {"id": item}
+            if not isinstance(item, dict):
+                continue
+            api_id = item.get("id") or item.get("modelId") or item.get("model")
+            if not isinstance(api_id, str) or not api_id:
+                continue
+            entry = {"id": api_id}
+            name = item.get("name") or item.get("displayName")
+            provider = item.get("provider") or item.get("ownedBy") or item.get("owned_by")
+            if isinstance(name, str) and name:
+                entry["name"] = name
+            if isinstance(provider, str) and provider:
+                entry["provider"] = provider
+            entries.append(entry)
+        return entries
+
+    def models(self) -> List[ModelInfo]:
+        """Cached server models as ModelInfo (built-in order first), or the built-in table."""
+        builtin = builtin_model_catalog()
+        state = self._read()
+        if state is None:
+            return builtin
+        remote = {}
+        for entry in state["models"]:
+            if isinstance(entry, dict) and isinstance(entry.get("id"), str):
+                remote.setdefault(entry["id"], entry)
+        known = [info for info in builtin if info.api_model_id in remote]
+        builtin_ids = {info.api_model_id for info in builtin}
+        taken = {info.model_id for info in builtin}
+        extra = []
+        # Exact ids first, so a normalized id never shadows a real one
+        for api_id, entry in sorted(remote.items(), key=lambda item: "_" in item[0]):
+            model_id = f"1min/{api_id.replace('_', '-')}"
+            if api_id in builtin_ids or model_id in taken:
+                continue
+            taken.add(model_id)
+            extra.append(
+                ModelInfo(
+                    model_id,
+                    api_id,
+                    entry.get("name") or api_id,
+                    entry.get("provider") or "1min.ai",
+                )
+            )
+        extra.sort(key=lambda info: (info.provider, info.api_model_id))
+        return known + extra or builtin
+
+    def refresh(self, api_key: str) -> Tuple[bool, int]:
+        """
+        Revalidate the cached catalog against the server.
+
+        Returns:
+            (changed, number of models); changed is False on 304 Not Modified
+
+        Raises:
+            requests.RequestException: On transport or HTTP errors
+            ValueError: If the response lists no models
+        """
+        state = self._read()
+        headers = {"API-KEY": api_key, "Content-Type": "application/json"}
+        if state is not None:
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+        response = _send_with_retry(
+            "get", self.url, _default_retry_policy(), idempotent=True, headers=headers, timeout=30
+        )
+        if response.status_code == 304 and state is not None:
+            state["fetched"] = time.time()
+            _atomic_write_json(self.path, state)
+            return False, len(state["models"])
+        response.raise_for_status()
+        models = self.parse(response.json())
+        if not models:
+            raise ValueError(f"{self.url} listed no models")
+        _atomic_write_json(
+            self.path,
+            {
+                "fetched": time.time(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "models": models,
+            },
+        )
+        return True, len(models)
+
+    def refresh_in_background(self, api_key: Optional[str] = None) -> Optional[threading.Thread]:
+        """Revalidate a stale cached catalog on a daemon thread (never blocks the caller)."""
+        if not self.is_stale():
+            return None
+        with self._refreshing_lock:
+            if ModelCatalog._refreshing:
+                return None
+            ModelCatalog._refreshing = True
+
+        def run():
+            try:
+                key = (
+                    api_key
+                    or os.environ.get("ONEMIN_API_KEY")
+                    or llm.get_key(None, "1min", "ONEMIN_API_KEY")
+                )
+                if key:
+                    self.refresh(key)
+            except Exception:
+                pass  # keep serving the cached copy; `models --refresh` reports errors
+            finally:
+                with self._refreshing_lock:
+                    ModelCatalog._refreshing = False
+
+        # Daemon: a short-lived `llm` process must not wait for the fetch
+        thread = threading.Thread(target=run, name="llm-1min-catalog", daemon=True)
+        thread.start()
+        return thread
+
+
+_catalog_checked = False
+
+
+def _refresh_stale_catalog(api_key: str) -> None:
+    """Start revalidating a stale cached catalog, once per process.
+
+    Called when a 1min.ai model executes rather than at registration, which
+    runs on every `llm` invocation, including prompts to other providers.
+    """
+    global _catalog_checked
+    if _catalog_checked:
+        return
+    _catalog_checked = True
+    ModelCatalog().refresh_in_background(api_key)
+
+
+@llm.hookimpl
+def register_models(register):
+    """Register 1min.ai models with LLM (catalog refreshed for 1min.ai API v2)."""
+    for info in ModelCatalog().models():
+        register(
+            OneMinModel(info.model_id, info.api_model_id, info.display_name),
+            AsyncOneMinModel(info.model_id, info.api_model_id, info.display_name),
         )
+
+
+class SSEParser:
+    """Incremental byte-level Server-Sent Events parser.
+
+    Follows the WHATWG event-stream rules: LF, CR and CRLF line endings (also
+    when split across network chunks), multi-line `data:` fields joined with
+    "\\n", `id:` and `retry:` fields, `:` comment lines and a leading BOM.
+    Incoming bytes accumulate in one reusable buffer; nothing is decoded
+    until an event is complete. Events are plain `(event, data, id)` tuples.
+
+    Runs of the common `event: x` / `data: {...}` / blank-line shape are split
+    by the regex engine; anything else goes through the line-by-line rules.
+    """
+
+    _BOM = b"\xef\xbb\xbf"
+    _SIMPLE_EVENT = re.compile(rb"(?:event: ?([^\n]*)\n)?data: ?([^\n]*)\n\n")
+    _SIMPLE_RUN = re.compile(rb"(?:(?:event: ?[^\n]*\n)?data: ?[^\n]*\n\n)+")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._data = []
+        self._event = b""
+        self._skip_lf = False  # previous chunk ended on CR; a leading LF belongs to it
+        self._started = False
+        self._names = {}  # decoded event names; a stream reuses a handful
+        self.last_event_id = ""
+        self.retry = None  # reconnection time in ms, if the server sent one
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str, str]]:
+        """Consume raw bytes and return the events completed by them."""
+        events = []
+        if self._skip_lf and chunk[:1] == b"\n":
+            chunk = chunk[1:]
+        self._skip_lf = False
+        if b"\r" in chunk:
+            # Normalize to LF; a trailing CR may be the first half of a CRLF
+            self._skip_lf = chunk.endswith(b"\r")
+            chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        buf = self._buffer
+        buf += chunk
+        if not self._started:
+            if len(buf) < len(self._BOM) and self._BOM.startswith(bytes(buf)):
+                return events
+            if buf.startswith(self._BOM):
+                del buf[: len(self._BOM)]
+            self._started = True
+
+        # Only whole events (up to the last blank line) are parsed; the
+        # partial one stays buffered until its blank line arrives.
+        cut = buf.rfind(b"\n\n") + 2
+        if cut < 2:
+            return events
+        text = bytes(buf[:cut])
+        del buf[:cut]
+        self._process(text, events)
+        return events
+
+    @classmethod
+    def iter_events(cls, byte_chunks):
+        """Yield events parsed from an iterable of byte chunks."""
+        parser = cls()
+        for data in byte_chunks:
+            yield from parser.feed(data)
+        yield from parser.close()
+
+    @classmethod
+    async def aiter_events(cls, byte_chunks):
+        """Async counterpart of iter_events for an async iterable of byte chunks."""
+        parser = cls()
+        async for data in byte_chunks:
+            for event in parser.feed(data):
+                yield event
+        for event in parser.close():
+            yield event
+
+    def close(self) -> List[Tuple[str, str, str]]:
+        """Finish the stream, dispatching a trailing event with no blank line after it.
+
+        The spec discards such an event; servers that close right after their
+        last `data:` line are common enough that we keep it instead.
+        """
+        events = []
+        for line in bytes(self._buffer).split(b"\n"):
+            self._process_line(line, events)
+        self._buffer.clear()
+        self._process_line(b"", events)
+        return events
+
+    def _process(self, text: bytes, events: list) -> None:
+        """Parse LF-terminated lines in `text`, appending dispatched events."""
+        pos = 0
+        end = len(text)
+        if not self._data and not self._event:
+            # Fast path: a run of simple events up to the last blank line is
+            # validated and split by the regex engine in two C-level passes.
+            stop = text.rfind(b"\n\n") + 2
+            if stop > 1 and self._SIMPLE_RUN.fullmatch(text, 0, stop):
+                names = self._names
+                last_id = self.last_event_id
+                append = events.append
+                for raw_name, raw_data in self._SIMPLE_EVENT.findall(text, 0, stop):
+                    name = names.get(raw_name) or self._event_name(raw_name)
+                    append((name, raw_data.decode("utf-8", "replace"), last_id))
+                pos = stop
+        while pos < end:
+            eol = text.index(b"\n", pos)
+            self._process_line(text[pos:eol], events)
+            pos = eol + 1
+
+    def _event_name(self, raw_name: bytes) -> str:
+        name = self._names[raw_name] = raw_name.decode("utf-8", "replace") or "message"
+        return name
+
+    def _process_line(self, line: bytes, events: list) -> None:
+        if not line:
+            if self._data:
+                events.append(
+                    (
+                        self._event.decode("utf-8", "replace") or "message",
+                        b"\n".join(self._data).decode("utf-8", "replace"),
+                        self.last_event_id,
+                    )
+                )
+                self._data = []
+            self._event = b""
+            return
+        if line[0] == 0x3A:  # ":" comment
+            return
+        field, sep, value = line.partition(b":")
+        if sep and value[:1] == b" ":
+            value = value[1:]
+        if field == b"data":
+            self._data.append(value)
+        elif field == b"event":
+            self._event = value
+        elif field == b"id":
+            if b"\0" not in value:
+                self.last_event_id = value.decode("utf-8", "replace")
+        elif field == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+
+
+# Sentinel returned by the SSE event handler when the server signals `done`.
+_SSE_DONE = object()
+
+
+def _debug_enabled(prompt) -> bool:
+    """Return True when debug output is requested via option or LLM_1MIN_DEBUG."""
+    return bool(prompt.options.debug) or os.environ.get("LLM_1MIN_DEBUG", "").lower() in (
+        "1",
+        "true",
+        "yes",
     )
 
 
-class OneMinModel(llm.Model):
+class PhaseTimer:
+    """Monotonic timings for one prompt, reported in milliseconds.
+
+    `phase()` accumulates wall time per named phase (config, conversation
+    lookup/creation, the API request up to response headers, the body or
+    stream after them).
+    `chunk()` counts yielded content and marks time-to-first-token, and
+    `count_bytes()` tallies response body bytes as they are read.
     """
-    LLM plugin for 1min.ai API
 
-    This plugin integrates 1min.ai's conversational AI capabilities into LLM.
-    Set your API key with: llm keys set 1min
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.phases = {}
+        self.ttft_ms = None
+        self.chunks = 0
+        self.bytes = 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def chunk(self) -> None:
+        if self.ttft_ms is None:
+            self.ttft_ms = (time.perf_counter() - self._start) * 1000
+        self.chunks += 1
+
+    def count_bytes(self, byte_chunks):
+        for data in byte_chunks:
+            self.bytes += len(data)
+            yield data
+
+    async def count_bytes_async(self, byte_chunks):
+        async for data in byte_chunks:
+            self.bytes += len(data)
+            yield data
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Summary for debug output and response.response_json["timings"]."""
+        return {
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 1),
+            "ttfb_ms": _round_ms(self.phases.get("request")),
+            "ttft_ms": _round_ms(self.ttft_ms),
+            "stream_ms": _round_ms(self.phases.get("stream")),
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+        }
 
-    Available providers (run `llm 1min models` for full IDs):
-    - OpenAI: GPT-3.5/4/4.1/4o/5/5.1/5.2/5.4 + Codex variants, o3, o4 (incl. deep-research)
-    - Anthropic: Claude 4 / 4.5 / 4.6 Sonnet, Claude 4 / 4.1 / 4.5 / 4.6 Opus, Claude 4.5 Haiku
-    - Google: Gemini 2.5 Flash/Pro, Gemini 3 / 3.1 (Preview)
-    - Alibaba: Qwen3 Max / VL / Coder, Qwen Plus / Max / Flash / VL
-    - DeepSeek: V3.2 Chat, V3.2 Reasoner
-    - xAI: Grok 3 / 4 / Code Fast
-    - Mistral: Mistral Small/Medium/Large, Magistral, Ministral, Open Mistral Nemo
-    - Cohere: Command R
-    - Meta / open-source: LLaMA 2/3/4, GPT OSS 20b/120b
-    - Perplexity: Sonar, Sonar Pro, Sonar Reasoning Pro, Sonar Deep Research
+
+def _round_ms(value):
+    return None if value is None else round(value, 1)
+
+
+def _body_size(response) -> int:
+    """Length of a fully read response body (0 if unavailable)."""
+    content = getattr(response, "content", None)
+    return len(content) if isinstance(content, (bytes, bytearray)) else 0
+
+
+def _read_body(response, timer) -> None:
+    """Read a response sent with stream=True in full as the "body" phase, then close it."""
+    try:
+        with timer.phase("body"):
+            response.content
+    finally:
+        response.close()
+    timer.bytes += _body_size(response)
+
+
+# Validation messages (or error codes) that reject the conversation itself, e.g.
+# "Conversation not found", "conversationId must be a valid conversation",
+# CONVERSATION_NOT_FOUND. A mere mention of the conversation ("too many
+# messages in this conversation") is not enough.
+_STALE_CONVERSATION_MESSAGE = re.compile(
+    r"conversation[\s_-]*(?:id|uuid)?.{0,40}?"
+    r"(?:not[\s_-]*found|does[\s_-]*not[\s_-]*exist|doesn't exist|no longer exists"
+    r"|(?:is|was|been)[\s_-]*deleted|is[\s_-]*invalid|not[\s_-]*valid|must be a valid)"
+    r"|(?:invalid|unknown|deleted)[\s_-]*conversation",
+    re.IGNORECASE,
+)
+
+
+class StaleConversationError(llm.ModelError):
+    """The server rejected a tracked conversation UUID (deleted or expired).
+
+    execute() recovers from this once by creating a fresh conversation.
+    """
+
+    def __init__(self, message, conversation_uuid):
+        super().__init__(message)
+        self.conversation_uuid = conversation_uuid
+
+
+class _SharedOneMin:
+    """Behaviour shared by OneMinModel and AsyncOneMinModel.
+
+    Options, conversation bookkeeping, payload building and response parsing
+    live here; the subclasses only supply the transport.
     """
 
     needs_key = "1min"
@@ -541,6 +2790,51 @@ class OneMinModel(llm.Model):
             description="Comma-separated file IDs (from Asset API)", default=None
         )
 
+        # Retry policy for 429 / 5xx / failed connections
+        max_retries: Optional[int] = Field(
+            description="Retries after a transient failure (0-10, default: 2)", default=None
+        )
+        retry_backoff_base: Optional[float] = Field(
+            description="Base delay in seconds for exponential backoff (default: 1.0)",
+            default=None,
+        )
+        retry_backoff_max: Optional[float] = Field(
+            description="Maximum delay in seconds between retries (default: 30)", default=None
+        )
+
+        # Client-side rate limit shared by all local processes using the same key
+        rate_limit_rps: Optional[float] = Field(
+            description="Max requests per second per API key across processes (default: off)",
+            default=None,
+        )
+        rate_limit_burst: Optional[int] = Field(
+            description="Token bucket size for rate_limit_rps (default: max(1, rps))",
+            default=None,
+        )
+
+        # Warm pool of pre-created conversations (opt-in)
+        warm_pool_size: Optional[int] = Field(
+            description="Pre-created conversations kept ready per model/type (0-20, default: off)",
+            default=None,
+        )
+        warm_pool_ttl: Optional[float] = Field(
+            description="Seconds a pooled conversation stays usable (default: 3600)",
+            default=None,
+        )
+
+        # Local response cache for prompts without prior turns (opt-in)
+        cache: Optional[str] = Field(
+            description="Response cache: on, off (bypass) or refresh (default: off)",
+            default=None,
+        )
+        cache_ttl: Optional[float] = Field(
+            description="Seconds a cached response stays valid (default: 86400)", default=None
+        )
+        cache_max_entries: Optional[int] = Field(
+            description="Cached responses kept before LRU eviction (default: 1000)",
+            default=None,
+        )
+
         # Debug mode
         debug: Optional[bool] = Field(
             description="Show debug information including API request details", default=False
@@ -574,6 +2868,62 @@ class OneMinModel(llm.Model):
                 raise ValueError("history_limit must be between 1 and 50")
             return value
 
+        @field_validator("max_retries")
+        @classmethod
+        def validate_max_retries(cls, value):
+            if value is not None and (value < 0 or value > 10):
+                raise ValueError("max_retries must be between 0 and 10")
+            return value
+
+        @field_validator("rate_limit_rps")
+        @classmethod
+        def validate_rate_limit_rps(cls, value):
+            if value is not None and value <= 0:
+                raise ValueError("rate_limit_rps must be > 0")
+            return value
+
+        @field_validator("rate_limit_burst")
+        @classmethod
+        def validate_rate_limit_burst(cls, value):
+            if value is not None and value < 1:
+                raise ValueError("rate_limit_burst must be >= 1")
+            return value
+
+        @field_validator("warm_pool_size")
+        @classmethod
+        def validate_warm_pool_size(cls, value):
+            if value is not None and (value < 0 or value > 20):
+                raise ValueError("warm_pool_size must be between 0 and 20")
+            return value
+
+        @field_validator("warm_pool_ttl")
+        @classmethod
+        def validate_warm_pool_ttl(cls, value):
+            if value is not None and value <= 0:
+                raise ValueError("warm_pool_ttl must be > 0")
+            return value
+
+        @field_validator("cache")
+        @classmethod
+        def validate_cache(cls, value):
+            if value is not None and value not in CACHE_MODES:
+                raise ValueError("cache must be one of: " + ", ".join(CACHE_MODES))
+            return value
+
+        @field_validator("cache_ttl", "cache_max_entries")
+        @classmethod
+        def validate_cache_limits(cls, value):
+            if value is not None and value <= 0:
+                raise ValueError("cache_ttl and cache_max_entries must be > 0")
+            return value
+
+        @field_validator("retry_backoff_base", "retry_backoff_max")
+        @classmethod
+        def validate_retry_backoff(cls, value):
+            if value is not None and value < 0:
+                raise ValueError("retry backoff delays must be >= 0")
+            return value
+
     def __init__(self, llm_model_id, api_model_id, display_name=None):
         """
         Initialize the model.
@@ -591,29 +2941,116 @@ class OneMinModel(llm.Model):
         # Show model_id (what users need to use with -m flag)
         return f"1min.ai: {self.model_id}"
 
-    def get_or_create_conversation(self, key, conversation, prompt, conversation_type=None):
+    def _resolve_options(self, prompt):
         """
-        Get existing 1min.ai conversation UUID or create a new one.
+        Merge option layers for this prompt.
 
-        Args:
-            key: API key
-            conversation: LLM conversation object (may be None)
-            prompt: LLM prompt object
-            conversation_type: Override conversation type for new conversations.
-                If None, falls back to prompt.options.conversation_type.
+        Priority: builtin < global config < model config < CLI.
 
         Returns:
-            1min.ai conversation UUID
+            (merged_options, debug_mode)
         """
-        # Reload conversation mappings from disk
-        _load_conversations()
+        # builtin < global < model-specific, memoized until config.json changes
+        merged_options = dict(_options_config.resolved_options(self.api_model_id))
 
-        # Debug logging
-        debug_mode = prompt.options.debug or os.environ.get("LLM_1MIN_DEBUG", "").lower() in (
-            "1",
-            "true",
-            "yes",
-        )
+        cli_options = {}
+        opts = prompt.options
+        if opts.conversation_type != "UNIFY_CHAT_WITH_AI":
+            cli_options["conversation_type"] = opts.conversation_type
+        if opts.web_search is not False:
+            cli_options["web_search"] = opts.web_search
+        if opts.num_of_site != 3:
+            cli_options["num_of_site"] = opts.num_of_site
+        if opts.max_word != 1000:
+            cli_options["max_word"] = opts.max_word
+        if opts.history_mixed is not False:
+            cli_options["history_mixed"] = opts.history_mixed
+        if opts.history_limit != 10:
+            cli_options["history_limit"] = opts.history_limit
+        if opts.with_memories is not False:
+            cli_options["with_memories"] = opts.with_memories
+        if opts.brand_voice_id is not None:
+            cli_options["brand_voice_id"] = opts.brand_voice_id
+        if opts.images is not None:
+            cli_options["images"] = opts.images
+        if opts.files is not None:
+            cli_options["files"] = opts.files
+        for option_key in (
+            "max_retries",
+            "retry_backoff_base",
+            "retry_backoff_max",
+            "rate_limit_rps",
+            "rate_limit_burst",
+            "warm_pool_size",
+            "warm_pool_ttl",
+            "cache",
+            "cache_ttl",
+            "cache_max_entries",
+        ):
+            if getattr(opts, option_key) is not None:
+                cli_options[option_key] = getattr(opts, option_key)
+
+        merged_options.update(cli_options)
+
+        debug_mode = _debug_enabled(prompt)
+        if debug_mode:
+            builtin_defaults = MODEL_DEFAULTS.get(self.api_model_id, {})
+            global_options = _options_config.get_defaults()
+            model_options = _options_config.get_model_options(self.api_model_id)
+            redacted_global_options = self._redact_options_for_debug(global_options)
+            redacted_model_options = self._redact_options_for_debug(model_options)
+            redacted_cli_options = self._redact_options_for_debug(cli_options)
+            redacted_merged_options = self._redact_options_for_debug(merged_options)
+            print(f"\n{'=' * 70}", file=sys.stderr)
+            print("[DEBUG] 1min.ai API Request Details", file=sys.stderr)
+            print(f"{'=' * 70}", file=sys.stderr)
+            print(f"Model: {self.api_model_id}", file=sys.stderr)
+            print("\nOptions (priority: CLI > user config > built-in defaults):", file=sys.stderr)
+            print(f"  Built-in model defaults: {builtin_defaults}", file=sys.stderr)
+            print(f"  User global options: {redacted_global_options}", file=sys.stderr)
+            print(f"  User model-specific options: {redacted_model_options}", file=sys.stderr)
+            print(f"  CLI options: {redacted_cli_options}", file=sys.stderr)
+            print("\nFinal merged options:", file=sys.stderr)
+            print(f"  {redacted_merged_options}", file=sys.stderr)
+            print(f"{'=' * 70}", file=sys.stderr)
+
+        return merged_options, debug_mode
+
+    def _preflight(self, prompt, merged_options):
+        """Raise llm.ModelError for options this model's capabilities rule out.
+
+        Attachments switch a CODE_GENERATOR prompt (often a code model's
+        default) to UNIFY_CHAT_WITH_AI in `merged_options`: /api/features
+        drops them, the chat endpoint reads them.
+        """
+        if merged_options.get("conversation_type") == "CODE_GENERATOR" and (
+            merged_options.get("images") or merged_options.get("files")
+        ):
+            merged_options["conversation_type"] = "UNIFY_CHAT_WITH_AI"
+            if _debug_enabled(prompt):
+                print(
+                    "\n[DEBUG] Attachments given: using UNIFY_CHAT_WITH_AI "
+                    "instead of CODE_GENERATOR",
+                    file=sys.stderr,
+                )
+        capabilities = ModelCapabilities.for_model(self.api_model_id)
+        if capabilities is None:
+            return
+        try:
+            capabilities.check(merged_options, prompt.prompt)
+        except ValueError as e:
+            raise llm.ModelError(f"{self.model_id} {e}")
+
+    def _lookup_conversation(self, conversation, prompt, debug_mode, fresh=False):
+        """
+        Find a tracked 1min.ai conversation for this prompt.
+
+        With `fresh` nothing is looked up, so the model-only key and other
+        models' conversations are neither reused nor migrated.
+
+        Returns:
+            (conversation_uuid or None, key to store a newly created conversation under)
+        """
         if debug_mode:
             print("\n[DEBUG] Conversation info:", file=sys.stderr)
             print(
@@ -644,22 +3081,23 @@ class OneMinModel(llm.Model):
         if debug_mode:
             print(f"  model_only_key: {model_only_key}", file=sys.stderr)
             print(f"  conv_specific_key: {conv_specific_key}", file=sys.stderr)
-            print(f"  existing mappings: {list(_conversation_mapping.keys())}", file=sys.stderr)
+            print(f"  existing mappings: {list(get_active_conversations())}", file=sys.stderr)
+
+        if fresh:
+            return None, conv_specific_key if conv_specific_key else model_only_key
 
         # Check if we have a conversation for this
         # Try conversation-specific key first, then model-only key
-        conversation_uuid = None
-        if conv_specific_key and conv_specific_key in _conversation_mapping:
-            conversation_uuid = _conversation_mapping[conv_specific_key]
+        conversation_uuid = _mapping_get(conv_specific_key) if conv_specific_key else None
+        model_only_uuid = None if conversation_uuid else _mapping_get(model_only_key)
+        if conversation_uuid:
             if debug_mode:
                 print(f"  ✓ Found via conv_specific_key: {conversation_uuid}", file=sys.stderr)
-        elif model_only_key in _conversation_mapping:
-            conversation_uuid = _conversation_mapping[model_only_key]
+        elif model_only_uuid:
+            conversation_uuid = model_only_uuid
             # Migrate to conversation-specific key if we have a conversation ID
             if conv_specific_key:
-                _conversation_mapping[conv_specific_key] = conversation_uuid
-                del _conversation_mapping[model_only_key]
-                _save_conversations()
+                _move_mapping_key(model_only_key, conv_specific_key, conversation_uuid)
                 if debug_mode:
                     print(
                         f"  ✓ Migrated from model_only_key to conv_specific_key: {conversation_uuid}",
@@ -671,132 +3109,114 @@ class OneMinModel(llm.Model):
         elif history_mixed and conversation and hasattr(conversation, "id"):
             # For history_mixed, check if there's a conversation from another model
             # with this same LLM conversation ID that we can reuse
-            for key, uuid in list(_conversation_mapping.items()):
-                if key.startswith(f"{conversation.id}_"):
-                    conversation_uuid = uuid
-                    # Migrate to conversation-only key (shared across models)
-                    _conversation_mapping[conv_specific_key] = conversation_uuid
-                    del _conversation_mapping[key]
-                    _save_conversations()
-                    if debug_mode:
-                        print(
-                            f"  ✓ Found conversation from other model, migrated to shared key: {conversation_uuid}",
-                            file=sys.stderr,
-                        )
-                        print(
-                            f"    Old key: {key} -> New key: {conv_specific_key}", file=sys.stderr
-                        )
-                    break
-
-        if conversation_uuid:
-            return conversation_uuid
+            other_keys = _mapping_keys_for_conversation(f"{conversation.id}")
+            if other_keys:
+                key = other_keys[0]
+                conversation_uuid = _mapping_get(key)
+                # Migrate to conversation-only key (shared across models)
+                _move_mapping_key(key, conv_specific_key, conversation_uuid)
+                if debug_mode:
+                    print(
+                        f"  ✓ Found conversation from other model, migrated to shared key: {conversation_uuid}",
+                        file=sys.stderr,
+                    )
+                    print(f"    Old key: {key} -> New key: {conv_specific_key}", file=sys.stderr)
 
-        # No existing conversation found, create a new one
-        conv_key = conv_specific_key if conv_specific_key else model_only_key
+        return conversation_uuid, conv_specific_key if conv_specific_key else model_only_key
 
-        # Create a new 1min.ai conversation
+    def _new_conversation_payload(self, prompt, conversation_type=None):
+        """Build the POST /api/conversations body for this model."""
         conv_type = conversation_type or prompt.options.conversation_type or "UNIFY_CHAT_WITH_AI"
-
-        headers = {"API-KEY": key, "Content-Type": "application/json"}
-
-        payload = {
-            "title": f"LLM Chat - {self.display_name}",
+        return {
+            "title": f"{PLUGIN_CONVERSATION_TITLE}{self.display_name}",
             "type": conv_type,
             "model": self.api_model_id,  # Use actual API model ID, not LLM ID
         }
 
-        try:
-            response = requests.post(
-                "https://api.1min.ai/api/conversations", headers=headers, json=payload, timeout=30
+    def _claim_pooled_conversation(self, key, payload, warm_pool, policy, limiter, debug_mode):
+        """Claim a pre-created conversation (or None) and start topping the pool up."""
+        if warm_pool is None:
+            return None
+        conversation_uuid = warm_pool.claim(key, self.api_model_id, payload["type"])
+        warm_pool.refill_in_background(
+            key, self.api_model_id, payload["type"], payload, policy, limiter
+        )
+        if debug_mode:
+            print(
+                f"  warm pool: {'claimed ' + conversation_uuid if conversation_uuid else 'empty'}",
+                file=sys.stderr,
             )
-            response.raise_for_status()
-
-            conversation_uuid = response.json()["conversation"]["uuid"]
-            _conversation_mapping[conv_key] = conversation_uuid
-            _save_conversations()  # Persist to disk
-
-            if debug_mode:
-                print(f"  ✓ Created new conversation: {conversation_uuid}", file=sys.stderr)
-                print(f"  ✓ Stored with key: {conv_key}", file=sys.stderr)
+        return conversation_uuid
 
-            return conversation_uuid
-
-        except requests.exceptions.RequestException as e:
-            raise llm.ModelError(f"Failed to create conversation: {str(e)}")
-
-    def execute(self, prompt, stream, response, conversation):
-        """Execute a prompt against the 1min.ai API"""
-        key = self.get_key()
-
-        # Load options from config (global + per-model)
-        global_options = _options_config.get_defaults()
-        model_options = _options_config.get_model_options(self.api_model_id)
-        builtin_defaults = MODEL_DEFAULTS.get(self.api_model_id, {})
+    def _cached_response(self, prompt, merged, conversation, debug_mode):
+        """
+        Look this prompt up in the response cache.
 
-        # Merge: builtin < global < model-specific < CLI
-        merged_options = {**builtin_defaults, **global_options, **model_options}
+        Only prompts without prior turns are eligible; their reply does not
+        depend on server-side conversation state. A hit is only served when
+        the prompt cannot be continued (no conversation, or a one-off batch /
+        compare one): it creates no server conversation, so a later `llm -c`
+        turn would lose it. Other first turns still store their reply.
 
-        cli_options = {}
-        opts = prompt.options
-        if opts.conversation_type != "UNIFY_CHAT_WITH_AI":
-            cli_options["conversation_type"] = opts.conversation_type
-        if opts.web_search is not False:
-            cli_options["web_search"] = opts.web_search
-        if opts.num_of_site != 3:
-            cli_options["num_of_site"] = opts.num_of_site
-        if opts.max_word != 1000:
-            cli_options["max_word"] = opts.max_word
-        if opts.history_mixed is not False:
-            cli_options["history_mixed"] = opts.history_mixed
-        if opts.history_limit != 10:
-            cli_options["history_limit"] = opts.history_limit
-        if opts.with_memories is not False:
-            cli_options["with_memories"] = opts.with_memories
-        if opts.brand_voice_id is not None:
-            cli_options["brand_voice_id"] = opts.brand_voice_id
-        if opts.images is not None:
-            cli_options["images"] = opts.images
-        if opts.files is not None:
-            cli_options["files"] = opts.files
+        Returns:
+            (cache, key, cached_chunks); cache and key are None when caching
+            does not apply, cached_chunks is None on a miss.
+        """
+        cache = ResponseCache.from_options(merged)
+        if cache is None or getattr(conversation, "responses", None):
+            return None, None, None
+        if merged.get("conversation_type") == "CODE_GENERATOR":
+            url, payload = self._build_feature_request(prompt, None, merged)
+        else:
+            url, payload = self._build_chat_request(prompt, None, merged, False)
+        key = cache.key_for(self.api_model_id, url, payload)
+        if conversation is not None and not _is_one_off(conversation):
+            if debug_mode:
+                print(f"\n[DEBUG] Response cache ({cache.mode}): store only", file=sys.stderr)
+            return cache, key, None
+        chunks = cache.get(key)
+        if debug_mode:
+            print(
+                f"\n[DEBUG] Response cache ({cache.mode}): {'hit' if chunks is not None else 'miss'}",
+                file=sys.stderr,
+            )
+        return cache, key, chunks
 
-        merged_options.update(cli_options)
+    @staticmethod
+    def _replay_cached(chunks, stream):
+        """Yield cached chunks as streamed, or joined for non-streaming callers."""
+        if stream:
+            yield from chunks
+        else:
+            yield "".join(chunks)
 
-        debug_mode = opts.debug or os.environ.get("LLM_1MIN_DEBUG", "").lower() in (
-            "1",
-            "true",
-            "yes",
-        )
+    @staticmethod
+    def _report_timings(response, timer, debug_mode):
+        """Attach timings to the llm response record (logs.db) and print them in debug mode."""
+        timings = timer.as_dict()
+        if response is not None:
+            existing = getattr(response, "response_json", None)
+            if isinstance(existing, dict):
+                response.response_json = {**existing, "timings": timings}
+            else:
+                response.response_json = {"timings": timings}
         if debug_mode:
-            redacted_global_options = self._redact_options_for_debug(global_options)
-            redacted_model_options = self._redact_options_for_debug(model_options)
-            redacted_cli_options = self._redact_options_for_debug(cli_options)
-            redacted_merged_options = self._redact_options_for_debug(merged_options)
-            print(f"\n{'=' * 70}", file=sys.stderr)
-            print("[DEBUG] 1min.ai API Request Details", file=sys.stderr)
-            print(f"{'=' * 70}", file=sys.stderr)
-            print(f"Model: {self.api_model_id}", file=sys.stderr)
-            print("\nOptions (priority: CLI > user config > built-in defaults):", file=sys.stderr)
-            print(f"  Built-in model defaults: {builtin_defaults}", file=sys.stderr)
-            print(f"  User global options: {redacted_global_options}", file=sys.stderr)
-            print(f"  User model-specific options: {redacted_model_options}", file=sys.stderr)
-            print(f"  CLI options: {redacted_cli_options}", file=sys.stderr)
-            print("\nFinal merged options:", file=sys.stderr)
-            print(f"  {redacted_merged_options}", file=sys.stderr)
-            print(f"{'=' * 70}", file=sys.stderr)
+            print("\n[DEBUG] Timings (ms):", file=sys.stderr)
+            for name in ("total_ms", "ttfb_ms", "ttft_ms", "stream_ms", "chunks", "bytes"):
+                print(f"  {name}: {timings[name]}", file=sys.stderr)
+            for name, ms in timings["phases_ms"].items():
+                print(f"  phase {name}: {ms}", file=sys.stderr)
 
-        conversation_type = merged_options.get("conversation_type", "UNIFY_CHAT_WITH_AI")
-        conversation_uuid = self.get_or_create_conversation(
-            key, conversation, prompt, conversation_type=conversation_type
-        )
+    @staticmethod
+    def _remember_conversation(conv_key, conversation_uuid, debug_mode):
+        """Record a newly created conversation UUID under its mapping key."""
+        with _mapping_lock:
+            _conversation_mapping[conv_key] = conversation_uuid
+            _persist_mapping({conv_key: conversation_uuid})  # Persist to disk
 
-        if conversation_type == "CODE_GENERATOR":
-            yield from self._execute_feature(
-                key, prompt, conversation_uuid, merged_options, debug_mode, conversation
-            )
-        else:
-            yield from self._execute_chat(
-                key, prompt, conversation_uuid, merged_options, debug_mode, stream, conversation
-            )
+        if debug_mode:
+            print(f"  ✓ Created new conversation: {conversation_uuid}", file=sys.stderr)
+            print(f"  ✓ Stored with key: {conv_key}", file=sys.stderr)
 
     def _build_mixed_prompt(self, prompt, conversation, limit):
         """Inline prior LLM-DB turns into the prompt for cross-model recall."""
@@ -819,10 +3239,8 @@ class OneMinModel(llm.Model):
             return prompt.prompt
         return "\n".join(lines) + f"\n\nUser: {prompt.prompt}"
 
-    def _execute_chat(
-        self, key, prompt, conversation_uuid, merged, debug_mode, stream, conversation=None
-    ):
-        """POST /api/chat-with-ai with type=UNIFY_CHAT_WITH_AI."""
+    def _build_chat_request(self, prompt, conversation_uuid, merged, stream, conversation=None):
+        """Build (url, payload) for POST /api/chat-with-ai with type=UNIFY_CHAT_WITH_AI."""
         prompt_text = prompt.prompt
         if merged.get("history_mixed", False) and conversation is not None:
             prompt_text = self._build_mixed_prompt(
@@ -870,170 +3288,1014 @@ class OneMinModel(llm.Model):
         url = "https://api.1min.ai/api/chat-with-ai"
         if stream:
             url = url + "?isStreaming=true"
+        return url, payload
+
+    def _build_feature_request(self, prompt, conversation_uuid, merged, conversation=None):
+        """Build (url, payload) for POST /api/features with type=CODE_GENERATOR."""
+        prompt_text = prompt.prompt
+        if merged.get("history_mixed", False) and conversation is not None:
+            prompt_text = self._build_mixed_prompt(
+                prompt, conversation, merged.get("history_limit", 10)
+            )
+        prompt_object = {"prompt": prompt_text}
+        if merged.get("web_search", False):
+            prompt_object["webSearch"] = True
+            prompt_object["numOfSite"] = merged.get("num_of_site", 3)
+            prompt_object["maxWord"] = merged.get("max_word", 1000)
+
+        payload = {
+            "type": "CODE_GENERATOR",
+            "model": self.api_model_id,
+            "conversationId": conversation_uuid,
+            "promptObject": prompt_object,
+        }
+        return "https://api.1min.ai/api/features", payload
+
+    @staticmethod
+    def _handle_sse_event(event):
+        """
+        Process one `(event, data, id)` tuple from SSEParser for /api/chat-with-ai.
+
+        Returns a content chunk, None when there is nothing to emit, or
+        _SSE_DONE at end of stream. Raises llm.ModelError on `error` events.
+        """
+        name, data, _event_id = event
+        if name == "done":
+            return _SSE_DONE
+        if name != "content" and name != "error":
+            # "result" carries the final aiRecord; its chunks were already yielded
+            return None
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError:
+            return None
+        if name == "error":
+            msg = data.get("message") or data.get("error") or "Unknown stream error"
+            raise llm.ModelError(f"Stream error: {msg}")
+        return data.get("content", "") or None
+
+    @staticmethod
+    def _extract_result_text(result_data):
+        """Pull human-readable text out of an aiRecord response body.
+
+        Spec: `aiRecord.aiRecordDetail.resultObject` is a list[str].
+        """
+        detail = result_data.get("aiRecord", {}).get("aiRecordDetail", {})
+        result_object = detail.get("resultObject")
+        if result_object is None:
+            # Defensive: surface the raw body so failures aren't silent.
+            return json.dumps(result_data, indent=2)
+        if isinstance(result_object, list):
+            return "\n".join(str(item) for item in result_object)
+        if isinstance(result_object, dict):
+            return json.dumps(result_object, indent=2)
+        return str(result_object)
+
+    @staticmethod
+    def _is_stale_conversation_response(response) -> bool:
+        """404, or a 400/422 saying the conversation is missing or invalid."""
+        status = getattr(response, "status_code", None)
+        if status == 404:
+            return True
+        if status not in (400, 422):
+            return False
+        try:
+            body = response.text
+        except Exception:
+            return False
+        return isinstance(body, str) and bool(_STALE_CONVERSATION_MESSAGE.search(body))
+
+    @staticmethod
+    def _raise_http_error(e, conversation_uuid=None):
+        status = getattr(e.response, "status_code", None)
+        if status == 401:
+            raise llm.ModelError("Authentication failed. Please check your API key.")
+        if status == 429:
+            raise llm.ModelError("Rate limit exceeded. Please try again later.")
+        if conversation_uuid and _SharedOneMin._is_stale_conversation_response(e.response):
+            raise StaleConversationError(f"API request failed: {str(e)}", conversation_uuid)
+        raise llm.ModelError(f"API request failed: {str(e)}")
+
+    @staticmethod
+    def _forget_stale_conversation(conversation_uuid, debug_mode) -> List[str]:
+        """Unmap a conversation the server no longer knows; returns the keys it had."""
+        with _mapping_lock:
+            stale_keys = _forget_conversation_uuid(conversation_uuid)
+            _persist_mapping(deletes=stale_keys)
+        if debug_mode:
+            print(
+                f"\n[DEBUG] Conversation {conversation_uuid} rejected by the server, "
+                f"recreating it for: {stale_keys}",
+                file=sys.stderr,
+            )
+        return stale_keys
+
+    @staticmethod
+    def _rebind_conversation(stale_keys, conversation_uuid):
+        """Point every key of a replaced conversation at its successor."""
+        with _mapping_lock:
+            for stale_key in stale_keys:
+                _conversation_mapping[stale_key] = conversation_uuid
+            _persist_mapping({stale_key: conversation_uuid for stale_key in stale_keys})
+
+    @staticmethod
+    def _log_payload(url, payload, debug_mode):
+        """Print the API request payload to stderr when debug is on."""
+        if not debug_mode:
+            return
+        redacted_payload = _SharedOneMin._redact_payload_for_debug(payload)
+        print(f"\n{'=' * 70}", file=sys.stderr)
+        print("[DEBUG] API Request Payload (sensitive fields redacted)", file=sys.stderr)
+        print(f"{'=' * 70}", file=sys.stderr)
+        print(f"Endpoint: {url}", file=sys.stderr)
+        print("\nPayload:", file=sys.stderr)
+        print(json.dumps(redacted_payload, indent=2), file=sys.stderr)
+        print(f"{'=' * 70}\n", file=sys.stderr)
+
+    @staticmethod
+    def _redact_options_for_debug(options):
+        """Redact sensitive option values before logging."""
+        redacted = {}
+        for key, value in options.items():
+            if key in {"images", "files", "brand_voice_id"} and value is not None:
+                redacted[key] = "<redacted>"
+            else:
+                redacted[key] = value
+        return redacted
+
+    @staticmethod
+    def _redact_payload_for_debug(payload):
+        """Redact prompt and attachment identifiers before logging payloads."""
+        safe_payload = json.loads(json.dumps(payload))
+        prompt_object = safe_payload.get("promptObject", {})
+        prompt_text = prompt_object.get("prompt")
+        if isinstance(prompt_text, str):
+            prompt_object["prompt"] = f"<redacted:{len(prompt_text)} chars>"
+
+        attachments = prompt_object.get("attachments")
+        if isinstance(attachments, dict):
+            for attachment_key in ("images", "files"):
+                if attachment_key in attachments:
+                    value = attachments.get(attachment_key)
+                    count = len(value) if isinstance(value, list) else 1
+                    attachments[attachment_key] = f"<redacted:{count} item(s)>"
+
+        if safe_payload.get("brandVoiceId"):
+            safe_payload["brandVoiceId"] = "<redacted>"
+
+        return safe_payload
+
+
+class OneMinModel(_SharedOneMin, llm.Model):
+    """
+    LLM plugin for 1min.ai API
 
+    This plugin integrates 1min.ai's conversational AI capabilities into LLM.
+    Set your API key with: llm keys set 1min
+
+    Available providers (run `llm 1min models` for full IDs):
+    - OpenAI: GPT-3.5/4/4.1/4o/5/5.1/5.2/5.4 + Codex variants, o3, o4 (incl. deep-research)
+    - Anthropic: Claude 4 / 4.5 / 4.6 Sonnet, Claude 4 / 4.1 / 4.5 / 4.6 Opus, Claude 4.5 Haiku
+    - Google: Gemini 2.5 Flash/Pro, Gemini 3 / 3.1 (Preview)
+    - Alibaba: Qwen3 Max / VL / Coder, Qwen Plus / Max / Flash / VL
+    - DeepSeek: V3.2 Chat, V3.2 Reasoner
+    - xAI: Grok 3 / 4 / Code Fast
+    - Mistral: Mistral Small/Medium/Large, Magistral, Ministral, Open Mistral Nemo
+    - Cohere: Command R
+    - Meta / open-source: LLaMA 2/3/4, GPT OSS 20b/120b
+    - Perplexity: Sonar, Sonar Pro, Sonar Reasoning Pro, Sonar Deep Research
+    """
+
+    def get_or_create_conversation(
+        self,
+        key,
+        conversation,
+        prompt,
+        conversation_type=None,
+        retry_policy=None,
+        rate_limiter=None,
+        warm_pool=None,
+        timer=None,
+        fresh=False,
+    ):
+        """
+        Get existing 1min.ai conversation UUID or create a new one.
+
+        Args:
+            key: API key
+            conversation: LLM conversation object (may be None)
+            prompt: LLM prompt object
+            conversation_type: Override conversation type for new conversations.
+                If None, falls back to prompt.options.conversation_type.
+            retry_policy: RetryPolicy for the create call. If None, uses the
+                saved global options.
+            rate_limiter: RateLimiter for the create call. If None, uses the
+                saved global options.
+            warm_pool: ConversationPool to claim a pre-created conversation
+                from. If None, the conversation is created inline.
+            timer: PhaseTimer recording the lookup / creation phases.
+            fresh: Always start a new conversation (see _lookup_conversation).
+
+        Returns:
+            1min.ai conversation UUID
+        """
+        timer = timer or PhaseTimer()
+        debug_mode = _debug_enabled(prompt)
+        with timer.phase("lookup"):
+            conversation_uuid, conv_key = self._lookup_conversation(
+                conversation, prompt, debug_mode, fresh
+            )
+        if conversation_uuid:
+            return conversation_uuid
+
+        # No existing conversation found, claim a pooled one or create a new one
+        payload = self._new_conversation_payload(prompt, conversation_type)
+        policy = retry_policy or _default_retry_policy()
+        limiter = rate_limiter or _default_rate_limiter()
+        with timer.phase("warm_pool"):
+            conversation_uuid = self._claim_pooled_conversation(
+                key, payload, warm_pool, policy, limiter, debug_mode
+            )
+        if conversation_uuid:
+            self._remember_conversation(conv_key, conversation_uuid, debug_mode)
+            return conversation_uuid
+
+        try:
+            with timer.phase("create_conversation"):
+                conversation_uuid = _create_remote_conversation(key, payload, policy, limiter)
+        except requests.exceptions.RequestException as e:
+            raise llm.ModelError(f"Failed to create conversation: {str(e)}")
+
+        self._remember_conversation(conv_key, conversation_uuid, debug_mode)
+        return conversation_uuid
+
+    def execute(self, prompt, stream, response, conversation):
+        """Execute a prompt against the 1min.ai API"""
+        timer = PhaseTimer()
+        key = self.get_key()
+        with timer.phase("options"):
+            merged_options, debug_mode = self._resolve_options(prompt)
+            self._preflight(prompt, merged_options)
+        _refresh_stale_catalog(key)
+
+        try:
+            with timer.phase("cache_lookup"):
+                cache, cache_key, cached = self._cached_response(
+                    prompt, merged_options, conversation, debug_mode
+                )
+            if cached is not None:
+                for chunk in self._replay_cached(cached, stream):
+                    timer.chunk()
+                    yield chunk
+                return
+
+            conversation_type = merged_options.get("conversation_type", "UNIFY_CHAT_WITH_AI")
+            lookup = dict(
+                conversation_type=conversation_type,
+                retry_policy=RetryPolicy.from_options(merged_options),
+                rate_limiter=RateLimiter.from_options(merged_options),
+                warm_pool=ConversationPool.from_options(merged_options),
+                timer=timer,
+                fresh=_is_one_off(conversation),
+            )
+            conversation_uuid = self.get_or_create_conversation(key, conversation, prompt, **lookup)
+
+            received = []
+            for attempt in range(2):
+                if conversation_type == "CODE_GENERATOR":
+                    chunks = self._execute_feature(
+                        key,
+                        prompt,
+                        conversation_uuid,
+                        merged_options,
+                        debug_mode,
+                        conversation,
+                        timer,
+                    )
+                else:
+                    chunks = self._execute_chat(
+                        key,
+                        prompt,
+                        conversation_uuid,
+                        merged_options,
+                        debug_mode,
+                        stream,
+                        conversation,
+                        timer,
+                    )
+                try:
+                    for chunk in chunks:
+                        timer.chunk()
+                        received.append(chunk)
+                        yield chunk
+                    break
+                except StaleConversationError as e:
+                    # Replay once with a fresh conversation, unless output already went out
+                    if attempt or received:
+                        raise
+                    stale_keys = self._forget_stale_conversation(e.conversation_uuid, debug_mode)
+                    conversation_uuid = self.get_or_create_conversation(
+                        key, conversation, prompt, **lookup
+                    )
+                    self._rebind_conversation(stale_keys, conversation_uuid)
+            if cache is not None and received:
+                cache.put(cache_key, self.api_model_id, received)
+        finally:
+            with timer.phase("persist"):
+                flush_conversations()
+            self._report_timings(response, timer, debug_mode)
+
+    def _execute_chat(
+        self,
+        key,
+        prompt,
+        conversation_uuid,
+        merged,
+        debug_mode,
+        stream,
+        conversation=None,
+        timer=None,
+    ):
+        """POST /api/chat-with-ai with type=UNIFY_CHAT_WITH_AI."""
+        url, payload = self._build_chat_request(
+            prompt, conversation_uuid, merged, stream, conversation
+        )
         headers = {"API-KEY": key, "Content-Type": "application/json"}
 
         self._log_payload(url, payload, debug_mode)
+        policy = RetryPolicy.from_options(merged)
+        limiter = RateLimiter.from_options(merged)
+        timer = timer or PhaseTimer()
 
         try:
             if stream:
-                yield from self._stream_chat(url, headers, payload)
+                yield from self._stream_chat(url, headers, payload, policy, limiter, timer)
             else:
-                api_response = requests.post(url, headers=headers, json=payload, timeout=120)
+                with timer.phase("request"):
+                    api_response = _send_with_retry(
+                        "post",
+                        url,
+                        policy,
+                        limiter=limiter,
+                        headers=headers,
+                        json=payload,
+                        stream=True,
+                        timeout=120,
+                    )
+                _read_body(api_response, timer)
                 api_response.raise_for_status()
                 result_data = api_response.json()
                 yield self._extract_result_text(result_data)
         except requests.exceptions.HTTPError as e:
-            self._raise_http_error(e)
+            self._raise_http_error(e, conversation_uuid)
         except requests.exceptions.RequestException as e:
             raise llm.ModelError(f"API request failed: {str(e)}")
         except (KeyError, json.JSONDecodeError) as e:
             raise llm.ModelError(f"Failed to parse API response: {str(e)}")
 
-    def _stream_chat(self, url, headers, payload):
-        """Parse SSE stream from /api/chat-with-ai."""
-        with requests.post(url, headers=headers, json=payload, stream=True, timeout=120) as r:
+    def _stream_chat(self, url, headers, payload, policy=None, limiter=None, timer=None):
+        """Parse SSE stream from /api/chat-with-ai.
+
+        A connection dropped mid-stream is not replayed: the server already
+        has the prompt (see RetryPolicy). Time to response headers is recorded
+        as the "request" phase, the body as "stream".
+        """
+        policy = policy or RetryPolicy()
+        timer = timer or PhaseTimer()
+        with timer.phase("request"):
+            response = _send_with_retry(
+                "post",
+                url,
+                policy,
+                limiter=limiter,
+                headers=headers,
+                json=payload,
+                stream=True,
+                timeout=120,
+            )
+        with response as r, timer.phase("stream"):
+            if not r.ok:
+                r.content  # read while open: the body tells a stale conversation apart
             r.raise_for_status()
-            event_name = None
-            for raw_line in r.iter_lines(decode_unicode=True):
-                if raw_line is None:
-                    continue
-                line = raw_line.strip()
-                if not line:
-                    event_name = None
-                    continue
-                if line.startswith("event:"):
-                    event_name = line[len("event:") :].strip()
-                    continue
-                if line.startswith("data:"):
-                    data_str = line[len("data:") :].strip()
-                    if not data_str:
-                        continue
-                    try:
-                        data = json.loads(data_str)
-                    except json.JSONDecodeError:
-                        continue
-                    if event_name == "content":
-                        chunk = data.get("content", "")
-                        if chunk:
-                            yield chunk
-                    elif event_name == "error":
-                        msg = data.get("message") or data.get("error") or "Unknown stream error"
-                        raise llm.ModelError(f"Stream error: {msg}")
-                    elif event_name == "done":
-                        return
-                    # event_name == "result" -> ignore (final aiRecord; chunks already yielded)
+            body = timer.count_bytes(r.iter_content(chunk_size=None))
+            for event in SSEParser.iter_events(body):
+                chunk = self._handle_sse_event(event)
+                if chunk is _SSE_DONE:
+                    return
+                if chunk:
+                    yield chunk
 
     def _execute_feature(
-        self, key, prompt, conversation_uuid, merged, debug_mode, conversation=None
+        self, key, prompt, conversation_uuid, merged, debug_mode, conversation=None, timer=None
     ):
         """POST /api/features with type=CODE_GENERATOR (legacy flat shape)."""
-        prompt_text = prompt.prompt
-        if merged.get("history_mixed", False) and conversation is not None:
-            prompt_text = self._build_mixed_prompt(
-                prompt, conversation, merged.get("history_limit", 10)
+        url, payload = self._build_feature_request(prompt, conversation_uuid, merged, conversation)
+        headers = {"API-KEY": key, "Content-Type": "application/json"}
+        timer = timer or PhaseTimer()
+
+        self._log_payload(url, payload, debug_mode)
+
+        try:
+            with timer.phase("request"):
+                api_response = _send_with_retry(
+                    "post",
+                    url,
+                    RetryPolicy.from_options(merged),
+                    limiter=RateLimiter.from_options(merged),
+                    headers=headers,
+                    json=payload,
+                    stream=True,
+                    timeout=120,
+                )
+            _read_body(api_response, timer)
+            api_response.raise_for_status()
+            yield self._extract_result_text(api_response.json())
+        except requests.exceptions.HTTPError as e:
+            self._raise_http_error(e, conversation_uuid)
+        except requests.exceptions.RequestException as e:
+            raise llm.ModelError(f"API request failed: {str(e)}")
+        except (KeyError, json.JSONDecodeError) as e:
+            raise llm.ModelError(f"Failed to parse API response: {str(e)}")
+
+
+class AsyncOneMinModel(_SharedOneMin, llm.AsyncModel):
+    """
+    Async variant of OneMinModel for llm.get_async_model("1min/...").
+
+    Requests go through one pooled httpx.AsyncClient per event loop, so many
+    concurrent prompts share connections instead of tying up threads.
+    """
+
+    async def get_or_create_conversation(
+        self,
+        key,
+        conversation,
+        prompt,
+        conversation_type=None,
+        retry_policy=None,
+        rate_limiter=None,
+        warm_pool=None,
+        timer=None,
+        fresh=False,
+    ):
+        """Async counterpart of OneMinModel.get_or_create_conversation."""
+        import httpx
+
+        timer = timer or PhaseTimer()
+        debug_mode = _debug_enabled(prompt)
+        # Mapping, warm-pool and journal access lock and write local files,
+        # so it runs on the default executor rather than the event loop
+        with timer.phase("lookup"):
+            conversation_uuid, conv_key = await _in_thread(
+                self._lookup_conversation, conversation, prompt, debug_mode, fresh
             )
-        prompt_object = {"prompt": prompt_text}
-        if merged.get("web_search", False):
-            prompt_object["webSearch"] = True
-            prompt_object["numOfSite"] = merged.get("num_of_site", 3)
-            prompt_object["maxWord"] = merged.get("max_word", 1000)
+        if conversation_uuid:
+            return conversation_uuid
+
+        headers = {"API-KEY": key, "Content-Type": "application/json"}
+        payload = self._new_conversation_payload(prompt, conversation_type)
+        policy = retry_policy or _default_retry_policy()
+        limiter = rate_limiter or _default_rate_limiter()
+        # The refill runs on its own thread
+        with timer.phase("warm_pool"):
+            conversation_uuid = await _in_thread(
+                self._claim_pooled_conversation,
+                key,
+                payload,
+                warm_pool,
+                policy,
+                limiter,
+                debug_mode,
+            )
+        if conversation_uuid:
+            await _in_thread(self._remember_conversation, conv_key, conversation_uuid, debug_mode)
+            return conversation_uuid
+
+        try:
+            with timer.phase("create_conversation"):
+                response = await _async_send_with_retry(
+                    get_async_http_client(),
+                    "POST",
+                    "https://api.1min.ai/api/conversations",
+                    policy,
+                    limiter=limiter,
+                    headers=headers,
+                    json=payload,
+                    timeout=30,
+                )
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+            response.raise_for_status()
+            conversation_uuid = response.json()["conversation"]["uuid"]
+        except httpx.HTTPError as e:
+            raise llm.ModelError(f"Failed to create conversation: {str(e)}")
+
+        await _in_thread(self._remember_conversation, conv_key, conversation_uuid, debug_mode)
+        return conversation_uuid
+
+    async def execute(self, prompt, stream, response, conversation):
+        """Execute a prompt against the 1min.ai API without blocking the event loop"""
+        timer = PhaseTimer()
+        key = self.get_key()
+        with timer.phase("options"):
+            # Reads config.json (and may create its directory)
+            merged_options, debug_mode = await _in_thread(self._resolve_options, prompt)
+            self._preflight(prompt, merged_options)
+        await _in_thread(_refresh_stale_catalog, key)
+
+        try:
+            with timer.phase("cache_lookup"):
+                cache, cache_key, cached = await _in_thread(
+                    self._cached_response, prompt, merged_options, conversation, debug_mode
+                )
+            if cached is not None:
+                for chunk in self._replay_cached(cached, stream):
+                    timer.chunk()
+                    yield chunk
+                return
+
+            conversation_type = merged_options.get("conversation_type", "UNIFY_CHAT_WITH_AI")
+            policy = RetryPolicy.from_options(merged_options)
+            limiter = RateLimiter.from_options(merged_options)
+            lookup = dict(
+                conversation_type=conversation_type,
+                retry_policy=policy,
+                rate_limiter=limiter,
+                warm_pool=ConversationPool.from_options(merged_options),
+                timer=timer,
+                fresh=_is_one_off(conversation),
+            )
+            conversation_uuid = await self.get_or_create_conversation(
+                key, conversation, prompt, **lookup
+            )
+            if conversation_type == "CODE_GENERATOR":
+                stream = False
+            headers = {"API-KEY": key, "Content-Type": "application/json"}
+
+            received = []
+            for attempt in range(2):
+                if conversation_type == "CODE_GENERATOR":
+                    url, payload = self._build_feature_request(
+                        prompt, conversation_uuid, merged_options, conversation
+                    )
+                else:
+                    url, payload = self._build_chat_request(
+                        prompt, conversation_uuid, merged_options, stream, conversation
+                    )
+                self._log_payload(url, payload, debug_mode)
+                try:
+                    async for chunk in self._send(
+                        url, headers, payload, stream, policy, limiter, timer, conversation_uuid
+                    ):
+                        timer.chunk()
+                        received.append(chunk)
+                        yield chunk
+                    break
+                except StaleConversationError as e:
+                    # Replay once with a fresh conversation, unless output already went out
+                    if attempt or received:
+                        raise
+                    stale_keys = await _in_thread(
+                        self._forget_stale_conversation, e.conversation_uuid, debug_mode
+                    )
+                    conversation_uuid = await self.get_or_create_conversation(
+                        key, conversation, prompt, **lookup
+                    )
+                    await _in_thread(self._rebind_conversation, stale_keys, conversation_uuid)
+            if cache is not None and received:
+                await _in_thread(cache.put, cache_key, self.api_model_id, received)
+        finally:
+            with timer.phase("persist"):
+                await _in_thread(flush_conversations)
+            self._report_timings(response, timer, debug_mode)
+
+    async def _send(
+        self,
+        url,
+        headers,
+        payload,
+        stream,
+        policy,
+        limiter=None,
+        timer=None,
+        conversation_uuid=None,
+    ):
+        """POST a chat/feature payload and yield text, mapping httpx errors to ModelError.
+
+        An error status for `conversation_uuid` that marks it as gone raises
+        StaleConversationError.
+        """
+        import httpx
+
+        client = get_async_http_client()
+        timer = timer or PhaseTimer()
+        try:
+            with timer.phase("request"):
+                r = await _async_send_with_retry(
+                    client,
+                    "POST",
+                    url,
+                    policy,
+                    limiter=limiter,
+                    headers=headers,
+                    json=payload,
+                    timeout=120,
+                )
+            try:
+                if not stream:
+                    with timer.phase("body"):
+                        await r.aread()
+                    timer.bytes += _body_size(r)
+                    r.raise_for_status()
+                    yield self._extract_result_text(r.json())
+                    return
+                if r.is_error:
+                    await r.aread()  # the body tells a stale conversation apart
+                r.raise_for_status()
+                # A dropped stream is not replayed: the server already has the prompt
+                with timer.phase("stream"):
+                    body = timer.count_bytes_async(r.aiter_bytes())
+                    async for event in SSEParser.aiter_events(body):
+                        chunk = self._handle_sse_event(event)
+                        if chunk is _SSE_DONE:
+                            return
+                        if chunk:
+                            yield chunk
+            finally:
+                await r.aclose()
+        except httpx.HTTPStatusError as e:
+            self._raise_http_error(e, conversation_uuid)
+        except httpx.HTTPError as e:
+            raise llm.ModelError(f"API request failed: {str(e)}")
+        except (KeyError, json.JSONDecodeError) as e:
+            raise llm.ModelError(f"Failed to parse API response: {str(e)}")
+
+
+# One-off runs (`batch`, `compare`): models are looked up in the catalog and
+# every prompt gets its own conversation, deleted once it is answered. Their
+# LLM conversation ids are kept here so execute always creates a new server
+# conversation for them instead of taking over one the user already has.
+_one_off_conversations = set()
+
+
+def _one_off_conversation(model):
+    """Start an LLM conversation whose prompts never reuse a tracked server conversation."""
+    conversation = model.conversation()
+    _one_off_conversations.add(f"{conversation.id}")
+    return conversation
+
+
+def _is_one_off(conversation) -> bool:
+    return conversation is not None and f"{getattr(conversation, 'id', '')}" in (
+        _one_off_conversations
+    )
+
+
+def _end_one_off_conversation(api_key, conversation, limiter, keep: bool) -> None:
+    """Delete a one-off conversation's server side (unless `keep`) and stop tracking it."""
+    conversation_id = f"{conversation.id}"
+    try:
+        if not keep:
+            _discard_conversation(api_key, conversation_id, limiter)
+    finally:
+        _one_off_conversations.discard(conversation_id)
+
+
+def _model_for_name(name: str, models: Dict[str, "OneMinModel"], api_key: str) -> "OneMinModel":
+    """Resolve an LLM id, bare id or API id to a model instance shared by the run."""
+    if name not in models:
+        for info in model_catalog():
+            if name in (info.model_id, info.api_model_id) or f"1min/{name}" == info.model_id:
+                model = OneMinModel(info.model_id, info.api_model_id, info.display_name)
+                model.key = api_key
+                models[name] = model
+                break
+        else:
+            raise ValueError(f"Unknown 1min.ai model: {name}")
+    return models[name]
+
+
+def _discard_conversation(api_key, conversation_id, limiter):
+    """Delete the server conversation(s) of one LLM conversation and drop their mapping keys.
+
+    A UUID that keys of other conversations still point at is only unmapped
+    here, never deleted on the server.
+    """
+    with _mapping_lock:
+        keys = [conversation_id] + _mapping_keys_for_conversation(conversation_id)
+        owned = {}
+        for key in keys:
+            conversation_uuid = _mapping_get(key)
+            if conversation_uuid is not None:
+                owned.setdefault(conversation_uuid, []).append(key)
+    for conversation_uuid, uuid_keys in owned.items():
+        if set(_mapping_keys_for_uuid(conversation_uuid)) <= set(uuid_keys):
+            _delete_remote_conversation(
+                api_key, conversation_uuid, _default_retry_policy(), limiter
+            )
+        # Forget it either way; an undeleted one is left for `conversations gc`
+        with _mapping_lock:
+            for key in uuid_keys:
+                _conversation_mapping.pop(key, None)
+            _persist_mapping(deletes=uuid_keys)
+
 
-        payload = {
-            "type": "CODE_GENERATOR",
-            "model": self.api_model_id,
-            "conversationId": conversation_uuid,
-            "promptObject": prompt_object,
-        }
+# Batch runs: JSONL prompts on a bounded worker pool in one process, sharing
+# the pooled HTTP session, the options snapshot and OneMinModel.execute.
+BATCH_CONCURRENCY = 8
 
-        url = "https://api.1min.ai/api/features"
-        headers = {"API-KEY": key, "Content-Type": "application/json"}
 
-        self._log_payload(url, payload, debug_mode)
+def parse_batch_line(number: int, line: str, default_model: Optional[str] = None):
+    """
+    Parse one JSONL batch input line.
+
+    Lines look like {"id": ..., "model": ..., "prompt": ..., "system": ...,
+    "options": {...}}; only "prompt" is required ("model" falls back to
+    `default_model`, "id" to the line number).
+
+    Returns:
+        Item dict, None for a blank line, or an item carrying "error" when
+        the line cannot be run
+    """
+    if not line.strip():
+        return None
+    item = {"id": number, "model": default_model, "options": {}}
+    try:
+        data = json.loads(line)
+    except ValueError as e:
+        return {**item, "error": f"Invalid JSON on line {number}: {e}"}
+    if not isinstance(data, dict):
+        return {**item, "error": f"Line {number} is not a JSON object"}
+    item["id"] = data.get("id", number)
+    item["model"] = data.get("model") or default_model
+    if not isinstance(data.get("prompt"), str):
+        return {**item, "error": 'Missing "prompt"'}
+    if not item["model"]:
+        return {**item, "error": 'Missing "model" (or pass --model)'}
+    if not isinstance(data.get("options", {}), dict):
+        return {**item, "error": '"options" must be an object'}
+    item.update(prompt=data["prompt"], system=data.get("system"), options=data.get("options", {}))
+    return item
+
+
+def _run_batch_item(item, model, api_key, rate, keep_conversations, limiter):
+    """Run one batch item in its own conversation; return its result record."""
+    started = time.perf_counter()
+    record = {"id": item["id"], "model": model.model_id if model else item["model"]}
+    conversation = None
+    try:
+        if item.get("error"):
+            raise ValueError(item["error"])
+        options = dict(item["options"])
+        if rate:
+            options.setdefault("rate_limit_rps", rate)
+        conversation = _one_off_conversation(model)
+        response = conversation.prompt(
+            item["prompt"], system=item.get("system"), stream=False, **options
+        )
+        record.update(response=response.text(), error=None)
+        record["timings"] = (response.response_json or {}).get("timings")
+    except Exception as e:  # one bad item must not stop the batch
+        record.update(response=None, error=str(e) or type(e).__name__)
+    finally:
+        if conversation is not None:
+            _end_one_off_conversation(api_key, conversation, limiter, keep_conversations)
+    record["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+def iter_batch(
+    items,
+    api_key: str,
+    concurrency: int = BATCH_CONCURRENCY,
+    rate: Optional[float] = None,
+    ordered: bool = True,
+    keep_conversations: bool = False,
+):
+    """
+    Run batch items (see parse_batch_line) concurrently.
 
+    Every item gets a fresh conversation, deleted again once it finishes
+    unless `keep_conversations` is set, so items never share context.
+
+    Args:
+        items: Parsed batch items
+        api_key: 1min.ai API key
+        concurrency: Maximum number of items in flight
+        rate: Client-side API requests per second, applied as rate_limit_rps
+            to items that do not set it themselves
+        ordered: Yield in input order (buffering early finishers) instead of
+            completion order
+        keep_conversations: Keep each item's server conversation
+
+    Yields:
+        Result records {"id", "model", "response", "error", "timings",
+        "latency_ms"} on the calling thread
+    """
+    items = list(items)
+    if not items:
+        return
+    models = {}
+    resolved = []
+    for item in items:
         try:
-            api_response = requests.post(url, headers=headers, json=payload, timeout=120)
-            api_response.raise_for_status()
-            yield self._extract_result_text(api_response.json())
-        except requests.exceptions.HTTPError as e:
-            self._raise_http_error(e)
-        except requests.exceptions.RequestException as e:
-            raise llm.ModelError(f"API request failed: {str(e)}")
-        except (KeyError, json.JSONDecodeError) as e:
-            raise llm.ModelError(f"Failed to parse API response: {str(e)}")
+            model = None if item.get("error") else _model_for_name(item["model"], models, api_key)
+        except ValueError as e:
+            item, model = {**item, "error": str(e)}, None
+        resolved.append((item, model))
+    limiter = RateLimiter(rate) if rate else _default_rate_limiter()
+    workers = max(1, min(int(concurrency), len(items)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-1min-batch") as pool:
+            futures = {
+                pool.submit(
+                    _run_batch_item, item, model, api_key, rate, keep_conversations, limiter
+                ): index
+                for index, (item, model) in enumerate(resolved)
+            }
+            finished = {}
+            next_index = 0
+            for future in as_completed(futures):
+                if not ordered:
+                    yield future.result()
+                    continue
+                finished[futures[future]] = future.result()
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+    finally:
+        flush_conversations()
 
-    @staticmethod
-    def _extract_result_text(result_data):
-        """Pull human-readable text out of an aiRecord response body.
 
-        Spec: `aiRecord.aiRecordDetail.resultObject` is a list[str].
-        """
-        detail = result_data.get("aiRecord", {}).get("aiRecordDetail", {})
-        result_object = detail.get("resultObject")
-        if result_object is None:
-            # Defensive: surface the raw body so failures aren't silent.
-            return json.dumps(result_data, indent=2)
-        if isinstance(result_object, list):
-            return "\n".join(str(item) for item in result_object)
-        if isinstance(result_object, dict):
-            return json.dumps(result_object, indent=2)
-        return str(result_object)
+def _resume_batch_output(path: Path) -> set:
+    """
+    Prepare a partial batch output file for `--resume`.
 
-    @staticmethod
-    def _raise_http_error(e):
-        status = getattr(e.response, "status_code", None)
-        if status == 401:
-            raise llm.ModelError("Authentication failed. Please check your API key.")
-        if status == 429:
-            raise llm.ModelError("Rate limit exceeded. Please try again later.")
-        raise llm.ModelError(f"API request failed: {str(e)}")
+    Keeps only successful records, dropping failed ones (to be retried) and a
+    line torn by an interrupted run, and rewrites the file atomically so new
+    records can be appended.
 
-    @staticmethod
-    def _log_payload(url, payload, debug_mode):
-        """Print the API request payload to stderr when debug is on."""
-        if not debug_mode:
-            return
-        redacted_payload = OneMinModel._redact_payload_for_debug(payload)
-        print(f"\n{'=' * 70}", file=sys.stderr)
-        print("[DEBUG] API Request Payload (sensitive fields redacted)", file=sys.stderr)
-        print(f"{'=' * 70}", file=sys.stderr)
-        print(f"Endpoint: {url}", file=sys.stderr)
-        print("\nPayload:", file=sys.stderr)
-        print(json.dumps(redacted_payload, indent=2), file=sys.stderr)
-        print(f"{'=' * 70}\n", file=sys.stderr)
+    Returns:
+        IDs of items that already have a successful result
+    """
+    kept = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return set()
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "id" in record and record.get("error") is None:
+            kept.append(record)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for record in kept:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+    return {json.dumps(record["id"]) for record in kept}
+
+
+def iter_compare(
+    models,
+    prompt: str,
+    api_key: str,
+    system: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    keep_conversations: bool = False,
+):
+    """
+    Send one prompt to several models at once and stream their replies.
 
-    @staticmethod
-    def _redact_options_for_debug(options):
-        """Redact sensitive option values before logging."""
-        redacted = {}
-        for key, value in options.items():
-            if key in {"images", "files", "brand_voice_id"} and value is not None:
-                redacted[key] = "<redacted>"
-            else:
-                redacted[key] = value
-        return redacted
+    Every model runs on its own thread in a fresh conversation (deleted
+    afterwards unless `keep_conversations` is set), so the comparison takes
+    as long as the slowest model rather than the sum of all of them.
 
-    @staticmethod
-    def _redact_payload_for_debug(payload):
-        """Redact prompt and attachment identifiers before logging payloads."""
-        safe_payload = json.loads(json.dumps(payload))
-        prompt_object = safe_payload.get("promptObject", {})
-        prompt_text = prompt_object.get("prompt")
-        if isinstance(prompt_text, str):
-            prompt_object["prompt"] = f"<redacted:{len(prompt_text)} chars>"
+    Args:
+        models: Model ids (LLM id, bare id or API id)
+        prompt: Prompt text sent to every model
+        api_key: 1min.ai API key
+        system: Optional system prompt
+        options: Model options (as with -o) applied to every model
+        keep_conversations: Keep each model's server conversation
 
-        attachments = prompt_object.get("attachments")
-        if isinstance(attachments, dict):
-            for attachment_key in ("images", "files"):
-                if attachment_key in attachments:
-                    value = attachments.get(attachment_key)
-                    count = len(value) if isinstance(value, list) else 1
-                    attachments[attachment_key] = f"<redacted:{count} item(s)>"
+    Yields:
+        (index, chunk, None) for each piece of output as it arrives, and
+        (index, None, record) once per model when it finishes, where record
+        is {"model", "response", "error", "ttft_ms", "total_ms", "chars"}
 
-        if safe_payload.get("brandVoiceId"):
-            safe_payload["brandVoiceId"] = "<redacted>"
+    Raises:
+        ValueError: If a model id is unknown (before anything is sent)
+    """
+    instances = {}
+    resolved = [_model_for_name(name, instances, api_key) for name in models]
+    events = queue.Queue()
+    limiter = _default_rate_limiter()
+
+    def run(index, model):
+        timer = PhaseTimer()
+        parts = []
+        record = {"model": model.model_id, "error": None}
+        conversation = _one_off_conversation(model)
+        try:
+            try:
+                response = conversation.prompt(prompt, system=system, **(options or {}))
+                for chunk in response:
+                    timer.chunk()
+                    parts.append(chunk)
+                    events.put((index, chunk, None))
+            except Exception as e:  # reported in the record; other models keep going
+                record["error"] = str(e) or type(e).__name__
+            text = "".join(parts)
+            record.update(
+                response=text,
+                ttft_ms=_round_ms(timer.ttft_ms),
+                total_ms=timer.as_dict()["total_ms"],
+                chars=len(text),
+            )
+            _end_one_off_conversation(api_key, conversation, limiter, keep_conversations)
+        finally:
+            events.put((index, None, record))
 
-        return safe_payload
+    if not resolved:
+        return
+    try:
+        with ThreadPoolExecutor(
+            max_workers=len(resolved), thread_name_prefix="llm-1min-compare"
+        ) as pool:
+            for index, model in enumerate(resolved):
+                pool.submit(run, index, model)
+            remaining = len(resolved)
+            while remaining:
+                event = events.get()
+                if event[2] is not None:
+                    remaining -= 1
+                yield event
+    finally:
+        flush_conversations()
+
+
+def _compare_columns(records, width: int) -> List[str]:
+    """Lay finished compare records out side by side within `width` characters."""
+    gutter = " | "
+    column = max(20, (width - len(gutter) * (len(records) - 1)) // len(records))
+    wrapped = []
+    for record in records:
+        lines = [record["model"], "-" * min(column, len(record["model"]))]
+        body = f"Error: {record['error']}" if record["error"] else record["response"]
+        for paragraph in body.splitlines() or [""]:
+            lines.extend(textwrap.wrap(paragraph, column) or [""])
+        wrapped.append(lines)
+    return [
+        gutter.join(cell.ljust(column) for cell in row).rstrip()
+        for row in zip_longest(*wrapped, fillvalue="")
+    ]
+
+
+def _compare_table(records) -> List[str]:
+    """Summary table: TTFT, total latency and output length per model."""
+    rows = [("Model", "TTFT ms", "Total ms", "Chars")]
+    for record in records:
+        ttft = "-" if record.get("ttft_ms") is None else f"{record['ttft_ms']:.0f}"
+        total = "-" if record.get("total_ms") is None else f"{record['total_ms']:.0f}"
+        chars = "failed" if record.get("error") else str(record.get("chars", 0))
+        rows.append((record["model"], ttft, total, chars))
+    widths = [max(len(row[i]) for row in rows) for i in range(4)]
+    return [
+        "  ".join(
+            [row[0].ljust(widths[0])] + [cell.rjust(w) for cell, w in zip(row[1:], widths[1:])]
+        )
+        for row in rows
+    ]
+
+
+def _cli_api_key() -> Optional[str]:
+    """API key for CLI commands: ONEMIN_API_KEY, then LLM's key storage."""
+    api_key = os.environ.get("ONEMIN_API_KEY")
+
+    if not api_key:
+        # Try to get from LLM's key storage
+        try:
+            # This is a bit hacky but works
+            temp_model = OneMinModel("1min/gpt-4o-mini", "gpt-4o-mini", "GPT-4o Mini")
+            api_key = temp_model.get_key()
+        except Exception:
+            click.echo(
+                "Error: No API key found. Set ONEMIN_API_KEY or use 'llm keys set 1min'",
+                err=True,
+            )
+            return None
+    return api_key
 
 
 @llm.hookimpl
@@ -1059,48 +4321,78 @@ def register_commands(cli):
         pass
 
     @onemin_group.command(name="models")
-    def list_models():
+    @click.option(
+        "--refresh", is_flag=True, help="Fetch the server's model list and cache it locally"
+    )
+    @click.option(
+        "--builtin", is_flag=True, help="List the built-in catalog, ignoring the cached one"
+    )
+    def list_models(refresh, builtin):
         """List all available 1min.ai models.
 
-        Roster is derived from register_models(); registration order also
-        controls grouping in the output.
+        Roster is read from the same catalog register_models() uses; its
+        order controls grouping by provider in the output. After a first
+        --refresh, the cached server list replaces the built-in one and is
+        revalidated in the background once a day.
 
-        Example:
+        \b
+        Examples:
           llm 1min models | grep -i claude
+          llm 1min models --refresh
         """
-        captured = []
-        register_models(lambda m: captured.append(m))
-
-        click.echo(f"Available 1min.ai models ({len(captured)} total):\n")
-        for m in captured:
-            defaults = MODEL_DEFAULTS.get(m.api_model_id, {})
-            tags = []
-            if defaults.get("conversation_type") == "CODE_GENERATOR":
-                tags.append("code")
-            if defaults.get("web_search"):
-                tags.append("web")
-            tag_str = f"  [{', '.join(tags)}]" if tags else ""
-            click.echo(f"  {click.style(m.model_id, fg='cyan', bold=True)}{tag_str}")
-            click.echo(f"    Name: {m.display_name}")
-            click.echo(f"    API: {m.api_model_id}")
+        if refresh:
+            api_key = _cli_api_key()
+            if not api_key:
+                return
+            try:
+                changed, count = ModelCatalog().refresh(api_key)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                click.echo(f"Error: could not refresh the model catalog: {e}", err=True)
+                return
+            state = "Fetched" if changed else "Catalog unchanged:"
+            click.echo(f"{state} {count} model(s) from the 1min.ai catalog\n", err=True)
+
+        catalog = builtin_model_catalog() if builtin else model_catalog()
+
+        click.echo(f"Available 1min.ai models ({len(catalog)} total):\n")
+        provider = None
+        for info in catalog:
+            if info.provider != provider:
+                provider = info.provider
+                click.echo(click.style(f"{provider}:", bold=True))
+            tag_str = f"  [{', '.join(info.tags)}]" if info.tags else ""
+            click.echo(f"  {click.style(info.model_id, fg='cyan', bold=True)}{tag_str}")
+            click.echo(f"    Name: {info.display_name}")
+            click.echo(f"    API: {info.api_model_id}")
+            if info.capabilities is not None:
+                click.echo(f"    Accepts: {info.capabilities.summary()}")
             click.echo()
 
         click.echo("Tags: [code]=auto CODE_GENERATOR, [web]=auto web_search")
+        click.echo(
+            "Accepts: vision=images option, files=files option, code=CODE_GENERATOR, "
+            "web=built-in web search; latency is fast, standard or slow"
+        )
         click.echo("\nUsage:")
         click.echo('  llm -m <model-id> "your prompt"')
         click.echo("\nExample:")
         click.echo('  llm -m 1min/gpt-4o-mini "Explain Python decorators"')
 
-    @onemin_group.command(name="conversations")
-    def list_conversations():
+    @onemin_group.group(name="conversations", invoke_without_command=True)
+    @click.pass_context
+    def list_conversations(ctx):
         """List active 1min.ai conversations.
 
         Shows all tracked conversation UUIDs and their associated models.
         Each conversation maintains context across multiple messages.
 
-        Example:
+        \b
+        Examples:
           llm 1min conversations
+          llm 1min conversations gc --dry-run
         """
+        if ctx.invoked_subcommand is not None:
+            return
         conversations = get_active_conversations()
 
         if not conversations:
@@ -1111,10 +4403,75 @@ def register_commands(cli):
         for key, uuid in conversations.items():
             click.echo(f"  {key}: {uuid}")
 
+    @list_conversations.command(name="gc")
+    @click.option(
+        "--delete-orphans-older-than",
+        "orphan_days",
+        type=click.FloatRange(min=0),
+        help="Also delete unreferenced plugin conversations older than DAYS",
+        metavar="DAYS",
+    )
+    @click.option("--dry-run", is_flag=True, help="Report without deleting or saving anything")
+    @click.option(
+        "--concurrency",
+        "-j",
+        type=click.IntRange(1, 64),
+        default=DELETE_CONCURRENCY,
+        show_default=True,
+        help="Parallel GET/DELETE requests",
+    )
+    def gc_conversations_cmd(orphan_days, dry_run, concurrency):
+        """Drop mappings to deleted conversations and prune orphans.
+
+        Pages through the server's conversation list and removes local
+        mappings whose conversation no longer exists (confirmed by a 404).
+        Orphan deletion only touches conversations this plugin created
+        ("LLM Chat - ..." titles) that no mapping or warm pool entry uses.
+
+        \b
+        Examples:
+          llm 1min conversations gc
+          llm 1min conversations gc --delete-orphans-older-than 30 --dry-run
+        """
+        api_key = _cli_api_key()
+        if not api_key:
+            return
+        max_age = orphan_days * 86400 if orphan_days is not None else None
+        try:
+            report = gc_conversations(api_key, max_age, dry_run=dry_run, concurrency=concurrency)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            raise click.ClickException(f"Could not list server conversations: {e}")
+
+        prefix = "Would drop" if dry_run else "Dropped"
+        click.echo(f"Server conversations: {report['server']}, tracked locally: {report['local']}")
+        click.echo(
+            f"{prefix} {len(report['dropped_keys'])} mapping(s) "
+            f"to {len(report['dead'])} deleted conversation(s)"
+        )
+        for key in report["dropped_keys"]:
+            click.echo(f"  {key}")
+        if orphan_days is not None:
+            if dry_run:
+                click.echo(f"Would delete {len(report['orphans'])} orphaned conversation(s)")
+                for uuid in report["orphans"]:
+                    click.echo(f"  {uuid}")
+            else:
+                click.echo(f"Deleted {report['deleted']} orphaned conversation(s)")
+                if report["failed"]:
+                    click.echo(f"Failed to delete {report['failed']} conversation(s)", err=True)
+
     @onemin_group.command(name="clear")
     @click.option("--model", "-m", help="Model ID to clear conversation for (e.g., 1min/gpt-4o)")
     @click.option("--all", "clear_all", is_flag=True, help="Clear all conversations")
-    def clear_conversations_cmd(model, clear_all):
+    @click.option(
+        "--concurrency",
+        "-j",
+        type=click.IntRange(1, 64),
+        default=DELETE_CONCURRENCY,
+        show_default=True,
+        help="Parallel DELETE requests for --all",
+    )
+    def clear_conversations_cmd(model, clear_all, concurrency):
         """Clear conversation history.
 
         Use this to start fresh conversations or manage memory.
@@ -1122,25 +4479,20 @@ def register_commands(cli):
         Examples:
           llm 1min clear --model 1min/gpt-4o    # Clear specific model
           llm 1min clear --all                  # Clear all conversations
+          llm 1min clear --all -j 32            # 32 deletions in flight
         """
-        # Get API key from environment or LLM's key storage
-        api_key = os.environ.get("ONEMIN_API_KEY")
-
+        api_key = _cli_api_key()
         if not api_key:
-            # Try to get from LLM's key storage
-            try:
-                # This is a bit hacky but works
-                temp_model = OneMinModel("1min/gpt-4o-mini", "gpt-4o-mini", "GPT-4o Mini")
-                api_key = temp_model.get_key()
-            except Exception:
-                click.echo(
-                    "Error: No API key found. Set ONEMIN_API_KEY or use 'llm keys set 1min'",
-                    err=True,
-                )
-                return
+            return
 
         if clear_all:
-            count = clear_all_conversations(api_key)
+            total = len(set(get_active_conversations().values()))
+            with click.progressbar(
+                length=total, label="Deleting conversations", file=sys.stderr
+            ) as bar:
+                count = clear_all_conversations(
+                    api_key, concurrency=concurrency, progress=lambda done, _total: bar.update(1)
+                )
             click.echo(f"Cleared {count} conversation(s)")
         elif model:
             success = clear_conversation(model, api_key)
@@ -1151,6 +4503,77 @@ def register_commands(cli):
         else:
             click.echo("Error: Specify --model or --all", err=True)
 
+    @onemin_group.group(name="pool")
+    def pool_group():
+        """Inspect or empty the warm pool of pre-created conversations.
+
+        Enable the pool with `llm 1min options set warm_pool_size 2`.
+
+        \b
+        Examples:
+          llm 1min pool status
+          llm 1min pool drain
+        """
+
+    @pool_group.command(name="status")
+    def pool_status():
+        """Show ready and expired pooled conversations per model/type."""
+        stats = ConversationPool(0).stats()
+        if not stats:
+            click.echo("Warm pool is empty")
+            return
+        for pool_name, counts in sorted(stats.items()):
+            click.echo(f"  {pool_name}: {counts['ready']} ready, {counts['expired']} expired")
+
+    @pool_group.command(name="drain")
+    @click.option(
+        "--concurrency",
+        "-j",
+        type=click.IntRange(1, 64),
+        default=DELETE_CONCURRENCY,
+        show_default=True,
+        help="Parallel DELETE requests",
+    )
+    def pool_drain(concurrency):
+        """Delete every pooled conversation for the current API key."""
+        api_key = _cli_api_key()
+        if not api_key:
+            return
+        uuids = ConversationPool(0).drain(api_key)
+        count = sum(ok for _uuid, ok in iter_delete_conversations(api_key, uuids, concurrency))
+        click.echo(f"Drained {count} pooled conversation(s)")
+
+    @onemin_group.group(name="cache")
+    def cache_group():
+        """Inspect or empty the local response cache.
+
+        Enable it with `llm 1min options set cache on`; bypass it for one
+        prompt with `-o cache off` or re-fetch with `-o cache refresh`.
+
+        \b
+        Examples:
+          llm 1min cache stats
+          llm 1min cache clear
+        """
+
+    @cache_group.command(name="stats")
+    def cache_stats():
+        """Show cached entries, size and hit rate."""
+        cache = ResponseCache()
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = f"{100 * stats['hits'] / lookups:.1f}%" if lookups else "n/a"
+        click.echo(f"Cache file: {cache.path}")
+        click.echo(f"Entries: {stats['entries']}")
+        click.echo(f"Cached text: {stats['size']} characters")
+        click.echo(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {hit_rate}")
+
+    @cache_group.command(name="clear")
+    def cache_clear():
+        """Delete every cached response."""
+        removed = ResponseCache().clear()
+        click.echo(f"Removed {removed} cached response(s)")
+
     @onemin_group.command(name="upload")
     @click.argument("file", type=click.Path(exists=True, dir_okay=False, readable=True))
     @click.option("--quiet", "-q", is_flag=True, help="Print only the asset key (no usage hint)")
@@ -1179,7 +4602,7 @@ def register_commands(cli):
 
         try:
             with open(file, "rb") as fh:
-                response = requests.post(
+                response = get_http_session().post(
                     "https://api.1min.ai/api/assets",
                     headers={"API-KEY": api_key},
                     files={"asset": (os.path.basename(file), fh)},
@@ -1211,6 +4634,187 @@ def register_commands(cli):
         click.echo("", err=True)
         click.echo(f'Use: llm -m 1min/<model> -o {opt} "{key}" "your prompt"', err=True)
 
+    @onemin_group.command(name="batch")
+    @click.argument("input_file", type=click.File("r", encoding="utf-8"))
+    @click.option(
+        "--output",
+        "-o",
+        type=click.Path(dir_okay=False),
+        help="Write results to this JSONL file instead of stdout",
+    )
+    @click.option("--model", "-m", "default_model", help='Model for lines without a "model"')
+    @click.option(
+        "--concurrency",
+        "-j",
+        type=click.IntRange(1, HTTP_POOL_MAXSIZE),
+        default=BATCH_CONCURRENCY,
+        show_default=True,
+        help="Prompts in flight at once",
+    )
+    @click.option(
+        "--rate",
+        type=click.FloatRange(min=0, min_open=True),
+        help="Client-side API requests per second (rate_limit_rps for every item)",
+    )
+    @click.option(
+        "--order",
+        type=click.Choice(["input", "completion"]),
+        default="input",
+        show_default=True,
+        help="Write results in input order or as they complete",
+    )
+    @click.option(
+        "--resume", is_flag=True, help="Skip items already answered in --output and append"
+    )
+    @click.option(
+        "--keep-conversations", is_flag=True, help="Keep each item's 1min.ai conversation"
+    )
+    def batch_cmd(
+        input_file, output, default_model, concurrency, rate, order, resume, keep_conversations
+    ):
+        """Run many prompts from a JSONL file concurrently.
+
+        Each input line is a JSON object with "prompt" and optionally "id",
+        "model", "system" and "options" (any -o option). Every prompt runs in
+        its own conversation, deleted afterwards unless --keep-conversations
+        is given. Each output line has id, model, response, error, timings
+        and latency_ms. Exits with status 1 if any item failed.
+
+        \b
+        Examples:
+          llm 1min batch prompts.jsonl -m gpt-4o-mini -o results.jsonl
+          llm 1min batch prompts.jsonl -o results.jsonl -j 16 --rate 5
+          llm 1min batch prompts.jsonl -o results.jsonl --resume
+        """
+        if resume and not output:
+            raise click.UsageError("--resume needs --output")
+        api_key = _cli_api_key()
+        if not api_key:
+            sys.exit(1)
+
+        done = _resume_batch_output(Path(output)) if resume else set()
+        items = []
+        for number, line in enumerate(input_file, start=1):
+            item = parse_batch_line(number, line, default_model)
+            if item is not None and json.dumps(item["id"]) not in done:
+                items.append(item)
+
+        sink = open(output, "a" if resume else "w", encoding="utf-8") if output else sys.stdout
+        failed = 0
+        try:
+            for record in iter_batch(
+                items,
+                api_key,
+                concurrency=concurrency,
+                rate=rate,
+                ordered=order == "input",
+                keep_conversations=keep_conversations,
+            ):
+                failed += record["error"] is not None
+                sink.write(json.dumps(record) + "\n")
+                sink.flush()
+        finally:
+            if output:
+                sink.close()
+
+        skipped = f", {len(done)} already done" if done else ""
+        click.echo(f"Batch: {len(items) - failed} succeeded, {failed} failed{skipped}", err=True)
+        if failed:
+            sys.exit(1)
+
+    @onemin_group.command(name="compare")
+    @click.argument("prompt")
+    @click.option(
+        "--model", "-m", "models", multiple=True, required=True, help="Model to compare (repeat)"
+    )
+    @click.option("--system", "-s", help="System prompt sent to every model")
+    @click.option(
+        "--option",
+        "-o",
+        "options",
+        type=(str, str),
+        multiple=True,
+        help="Model option applied to every model, e.g. -o web_search true",
+    )
+    @click.option(
+        "--columns", is_flag=True, help="Show replies side by side once all have finished"
+    )
+    @click.option(
+        "--keep-conversations", is_flag=True, help="Keep each model's 1min.ai conversation"
+    )
+    def compare_cmd(prompt, models, system, options, columns, keep_conversations):
+        """Send one prompt to several models at once and compare them.
+
+        All models run concurrently, so the comparison takes as long as the
+        slowest one. Replies stream into a labeled section per model: the
+        first section streams live while later ones buffer, then each is
+        printed and continues live in turn. With --columns the replies are
+        laid out side by side once all have finished. Ends with a table of
+        time to first token, total latency and reply length per model, and
+        exits with status 1 if any model failed.
+
+        \b
+        Examples:
+          llm 1min compare -m gpt-4o -m sonar -m claude-4-6-sonnet "Explain CRDTs"
+          llm 1min compare -m gpt-4o -m sonar -o web_search true --columns "AI news today"
+        """
+        api_key = _cli_api_key()
+        if not api_key:
+            sys.exit(1)
+
+        events = iter_compare(
+            models,
+            prompt,
+            api_key,
+            system=system,
+            options=dict(options),
+            keep_conversations=keep_conversations,
+        )
+        buffers = [[] for _ in models]
+        records = [None] * len(models)
+        current = 0
+
+        def header(index):
+            click.echo(click.style(f"=== {models[index]} ===", bold=True))
+
+        started = False
+        try:
+            for index, chunk, record in events:
+                if not started and not columns:
+                    header(0)  # only once the model ids have resolved
+                started = True
+                if chunk is not None:
+                    buffers[index].append(chunk)
+                    if index == current and not columns:
+                        click.echo(chunk, nl=False)
+                    continue
+                records[index] = record
+                if columns:
+                    state = f"failed: {record['error']}" if record["error"] else "done"
+                    click.echo(f"{record['model']}: {state}", err=True)
+                    continue
+                # Close finished sections in order; the next one catches up from its buffer
+                while current < len(models) and records[current] is not None:
+                    if records[current]["error"]:
+                        click.echo(click.style(f"Error: {records[current]['error']}", fg="red"))
+                    click.echo("\n")
+                    current += 1
+                    if current < len(models):
+                        header(current)
+                        click.echo("".join(buffers[current]), nl=False)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        if columns:
+            width = shutil.get_terminal_size().columns
+            for line in _compare_columns(records, width):
+                click.echo(line)
+            click.echo()
+        for line in _compare_table(records):
+            click.echo(line)
+        if any(record["error"] for record in records):
+            sys.exit(1)
+
     @onemin_group.group(name="options")
     def options_group():
         """Manage persistent configuration options.
@@ -1218,6 +4822,7 @@ def register_commands(cli):
         Configure default behavior for web search, conversation types, and more.
         Settings can be global or per-model.
 
+        \b
         Available options:
           - conversation_type (UNIFY_CHAT_WITH_AI / CODE_GENERATOR)
           - web_search (true/false): Enable web search
@@ -1229,8 +4834,19 @@ def register_commands(cli):
           - brand_voice_id (string): Brand voice ID for response style
           - images (csv): Image asset keys (from Asset API), comma-separated
           - files (csv): File IDs (from Asset API), comma-separated
+          - max_retries (0-10): Retries on 429 / 5xx / failed connections
+          - retry_backoff_base (seconds): Base delay for exponential backoff
+          - retry_backoff_max (seconds): Cap on delay between retries
+          - rate_limit_rps (number): Requests/second per API key, shared by all processes
+          - rate_limit_burst (int): Burst size for rate_limit_rps
+          - warm_pool_size (0-20): Conversations pre-created per model and type
+          - warm_pool_ttl (seconds): How long a pooled conversation stays usable
+          - cache (on/off/refresh): Local response cache for first turns
+          - cache_ttl (seconds): How long a cached response stays valid
+          - cache_max_entries (int): Cached responses kept before LRU eviction
           - debug (true/false): Show API request details
 
+        \b
         Examples:
           llm 1min options list              # View all settings
           llm 1min options set web_search true
@@ -1275,6 +4891,8 @@ def register_commands(cli):
             value = False
         elif value.isdigit():
             value = int(value)
+        elif re.fullmatch(r"\d+\.\d+", value):
+            value = float(value)
 
         try:
             _options_config.set_option(key, value, model)
@@ -1496,6 +5114,10 @@ def register_commands(cli):
             click.echo(f"Error reading config: {e}", err=True)
             return
 
+        if not isinstance(config, dict):
+            click.echo("Error reading config: not a JSON object", err=True)
+            return
+
         changes = []
 
         def rename_in(scope_name, options):
@@ -1504,28 +5126,31 @@ def register_commands(cli):
                     options[new] = options.pop(old)
                     changes.append(f"{scope_name}: {old} → {new}")
 
-        defaults = config.get("defaults") or {}
-        if isinstance(defaults, dict):
-            rename_in("defaults", defaults)
-            config["defaults"] = defaults
-
-        models = config.get("models") or {}
-        if isinstance(models, dict):
-            for model_id, opts in models.items():
-                if isinstance(opts, dict):
-                    rename_in(f"models.{model_id}", opts)
-            config["models"] = models
-
-        if not changes:
-            click.echo("No legacy keys found. Config is up to date.")
-            return
+        def rename_all(config):
+            changes.clear()
+            defaults = config.get("defaults") or {}
+            if isinstance(defaults, dict):
+                rename_in("defaults", defaults)
+                config["defaults"] = defaults
+
+            models = config.get("models") or {}
+            if isinstance(models, dict):
+                for model_id, opts in models.items():
+                    if isinstance(opts, dict):
+                        rename_in(f"models.{model_id}", opts)
+                config["models"] = models
+            return bool(changes)
 
         try:
-            _options_config.save(config)
+            migrated = _options_config.update(rename_all, validate=False)
         except Exception as e:
             click.echo(f"Error writing config: {e}", err=True)
             return
 
+        if not migrated:
+            click.echo("No legacy keys found. Config is up to date.")
+            return
+
         click.echo(f"Migrated {len(changes)} key(s):")
         for change in changes:
             click.echo(f"  {change}")
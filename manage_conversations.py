@@ -11,7 +11,7 @@ This script provides commands to:
 Usage:
     python manage_conversations.py list
     python manage_conversations.py delete <conversation_uuid>
-    python manage_conversations.py clear --all
+    python manage_conversations.py clear --all [--concurrency 16]
     python manage_conversations.py export
 """
 
@@ -23,6 +23,8 @@ from typing import Dict, List, Optional
 
 import requests
 
+from llm_1min import DELETE_CONCURRENCY, get_http_session, iter_delete_conversations
+
 
 class ConversationManager:
     """Manage 1min.ai conversations via API"""
@@ -31,6 +33,8 @@ class ConversationManager:
         self.api_key = api_key
         self.base_url = "https://api.1min.ai"
         self.headers = {"API-KEY": api_key, "Content-Type": "application/json"}
+        # Reuse the plugin's pooled keep-alive session across all calls
+        self.session = get_http_session()
 
     def list_conversations(self) -> List[Dict]:
         """
@@ -40,7 +44,7 @@ class ConversationManager:
             List of conversation objects
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/conversations", headers=self.headers, timeout=30
             )
             response.raise_for_status()
@@ -60,7 +64,7 @@ class ConversationManager:
             Conversation object or None
         """
         try:
-            response = requests.get(
+            response = self.session.get(
                 f"{self.base_url}/api/conversations/{conversation_uuid}",
                 headers=self.headers,
                 timeout=30,
@@ -82,7 +86,7 @@ class ConversationManager:
             True if successful, False otherwise
         """
         try:
-            response = requests.delete(
+            response = self.session.delete(
                 f"{self.base_url}/api/conversations/{conversation_uuid}",
                 headers=self.headers,
                 timeout=30,
@@ -92,20 +96,27 @@ class ConversationManager:
             print(f"Error deleting conversation: {e}", file=sys.stderr)
             return False
 
-    def clear_all_conversations(self) -> int:
+    def clear_all_conversations(self, concurrency: int = DELETE_CONCURRENCY, progress=None) -> int:
         """
         Delete all conversations.
 
+        Args:
+            concurrency: Maximum number of DELETE requests in flight
+            progress: Optional callback(done, total) called after each deletion
+
         Returns:
             Number of conversations deleted
         """
-        conversations = self.list_conversations()
+        uuids = [conv.get("uuid") for conv in self.list_conversations() if conv.get("uuid")]
         count = 0
 
-        for conv in conversations:
-            uuid = conv.get("uuid")
-            if uuid and self.delete_conversation(uuid):
+        for done, (_uuid, success) in enumerate(
+            iter_delete_conversations(self.api_key, uuids, concurrency), start=1
+        ):
+            if success:
                 count += 1
+            if progress is not None:
+                progress(done, len(uuids))
 
         return count
 
@@ -137,6 +148,13 @@ def main():
         "--all", action="store_true", help="Apply to all conversations (for clear command)"
     )
     parser.add_argument("--output", "-o", help="Output file for export command")
+    parser.add_argument(
+        "--concurrency",
+        "-j",
+        type=int,
+        default=DELETE_CONCURRENCY,
+        help=f"Parallel DELETE requests for clear (default: {DELETE_CONCURRENCY})",
+    )
     parser.add_argument("--api-key", help="1min.ai API key (or set ONEMIN_API_KEY env var)")
 
     args = parser.parse_args()
@@ -192,7 +210,11 @@ def main():
             print("Error: Use --all flag to confirm clearing all conversations", file=sys.stderr)
             sys.exit(1)
 
-        count = manager.clear_all_conversations()
+        def report(done, total):
+            print(f"\rDeleted {done}/{total}", end="", file=sys.stderr, flush=True)
+
+        count = manager.clear_all_conversations(concurrency=args.concurrency, progress=report)
+        print("", file=sys.stderr)
         print(f"Cleared {count} conversation(s)")
 
     elif args.command == "export":
@@ -7,6 +7,7 @@ from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
+import requests
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -164,6 +165,16 @@ def mock_llm_prompt():
     prompt.options.brand_voice_id = None
     prompt.options.images = None
     prompt.options.files = None
+    prompt.options.max_retries = None
+    prompt.options.retry_backoff_base = None
+    prompt.options.retry_backoff_max = None
+    prompt.options.rate_limit_rps = None
+    prompt.options.rate_limit_burst = None
+    prompt.options.warm_pool_size = None
+    prompt.options.warm_pool_ttl = None
+    prompt.options.cache = None
+    prompt.options.cache_ttl = None
+    prompt.options.cache_max_entries = None
     prompt.options.debug = False
     return prompt
 
@@ -191,14 +202,87 @@ def cli_runner():
     return CliRunner()
 
 
+@pytest.fixture
+def onemin_cli():
+    """Root click group with the plugin's `1min` commands registered."""
+    import click
+
+    import llm_1min
+
+    @click.group()
+    def cli():
+        pass
+
+    llm_1min.register_commands(cli)
+    return cli
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock (`time.time`) for TTLs and token buckets."""
+    import llm_1min
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_1min.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def http_session(monkeypatch):
+    """Mock installed as the pooled HTTP session; tests script post/get/delete."""
+    import llm_1min
+
+    session = Mock()
+    monkeypatch.setattr(llm_1min, "_http_session", session)
+    return session
+
+
+class _PassthroughSession:
+    """Stand-in for the pooled session that defers to module-level requests.*.
+
+    Resolving ``requests.post`` / ``requests.delete`` / ``requests.get`` at call
+    time keeps ``patch("requests.post")`` style mocks working for code that
+    goes through ``llm_1min.get_http_session()``.
+    """
+
+    def post(self, url, **kwargs):
+        return requests.post(url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return requests.delete(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return requests.get(url, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def passthrough_http_session(monkeypatch):
+    """Route the shared HTTP session through patchable requests.* functions."""
+    import llm_1min
+
+    monkeypatch.setattr(llm_1min, "_http_session", _PassthroughSession())
+
+
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Keep retries instant in tests; individual tests can still patch sleeps."""
+    import llm_1min
+
+    monkeypatch.setitem(llm_1min.RETRY_DEFAULTS, "retry_backoff_base", 0.0)
+
+
 @pytest.fixture(autouse=True)
 def reset_conversation_mapping():
     """Reset global conversation mapping before each test."""
     import llm_1min
 
     llm_1min._conversation_mapping.clear()
+    llm_1min._pending_upserts.clear()
+    llm_1min._pending_deletes.clear()
     yield
     llm_1min._conversation_mapping.clear()
+    llm_1min._pending_upserts.clear()
+    llm_1min._pending_deletes.clear()
 
 
 @pytest.fixture(autouse=True)
@@ -221,10 +305,11 @@ def mock_config_path(tmp_path, monkeypatch):
 
     # Patch conversation file path
     monkeypatch.setattr(llm_1min, "_conversation_file", conversations_path)
+    monkeypatch.setattr(llm_1min, "_catalog_checked", False)
 
     # Reset global config instance and conversation mapping
     llm_1min._options_config = llm_1min.OptionsConfig()
-    llm_1min._conversation_mapping = {}
+    llm_1min._conversation_mapping = llm_1min.ConversationMapping()
 
     yield config_path
 
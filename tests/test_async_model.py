@@ -0,0 +1,202 @@
+"""Tests for AsyncOneMinModel (llm.AsyncModel over httpx)."""
+
+import asyncio
+import json
+import threading
+from unittest.mock import Mock
+
+import httpx
+import llm
+import pytest
+
+import llm_1min
+
+
+def _sse_body(events):
+    return "".join(f"event: {name}\ndata: {data}\n\n" for name, data in events).encode()
+
+
+@pytest.fixture
+def async_transport(monkeypatch):
+    """Install an httpx.MockTransport-backed client and record requests."""
+
+    def _factory(handler):
+        requests_seen = []
+
+        def recording_handler(request):
+            requests_seen.append(request)
+            return handler(request)
+
+        def client_factory():
+            return httpx.AsyncClient(transport=httpx.MockTransport(recording_handler))
+
+        monkeypatch.setattr(llm_1min, "get_async_http_client", client_factory)
+        monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "test-key")
+        return requests_seen
+
+    return _factory
+
+
+async def _collect(agen):
+    return [chunk async for chunk in agen]
+
+
+def _run(model, prompt, stream, conversation=None):
+    return asyncio.run(
+        _collect(
+            model.execute(prompt=prompt, stream=stream, response=Mock(), conversation=conversation)
+        )
+    )
+
+
+class TestAsyncExecute:
+    def test_streaming_yields_content_chunks(self, async_transport, mock_llm_prompt):
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "conv-async"}})
+            body = _sse_body(
+                [
+                    ("content", '{"content": "Hello "}'),
+                    ("content", '{"content": "async"}'),
+                    ("result", '{"aiRecord": {}}'),
+                    ("done", "{}"),
+                ]
+            )
+            return httpx.Response(200, content=body)
+
+        seen = async_transport(handler)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        assert _run(model, mock_llm_prompt, stream=True) == ["Hello ", "async"]
+        assert seen[1].url.params["isStreaming"] == "true"
+        payload = json.loads(seen[1].content)
+        assert payload["promptObject"]["conversationId"] == "conv-async"
+        assert llm_1min._conversation_mapping["1min/gpt-4o"] == "conv-async"
+
+    def test_non_streaming_returns_result_text(self, async_transport, mock_llm_prompt):
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "conv-async"}})
+            return httpx.Response(
+                200, json={"aiRecord": {"aiRecordDetail": {"resultObject": ["full reply"]}}}
+            )
+
+        async_transport(handler)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        assert _run(model, mock_llm_prompt, stream=False) == ["full reply"]
+
+    def test_code_generator_uses_features_endpoint(self, async_transport, mock_llm_prompt):
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "conv-code"}})
+            return httpx.Response(
+                200, json={"aiRecord": {"aiRecordDetail": {"resultObject": ["code"]}}}
+            )
+
+        seen = async_transport(handler)
+        mock_llm_prompt.options.conversation_type = "CODE_GENERATOR"
+        model = llm_1min.AsyncOneMinModel("1min/gpt-5.1-codex", "gpt-5.1-codex", "GPT-5.1 Codex")
+
+        assert _run(model, mock_llm_prompt, stream=True) == ["code"]
+        assert seen[-1].url.path == "/api/features"
+        assert json.loads(seen[-1].content)["type"] == "CODE_GENERATOR"
+
+    def test_reuses_tracked_conversation(self, async_transport, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "existing-uuid"
+
+        def handler(request):
+            return httpx.Response(200, content=_sse_body([("content", '{"content": "hi"}')]))
+
+        seen = async_transport(handler)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        assert _run(model, mock_llm_prompt, stream=True) == ["hi"]
+        assert [r.url.path for r in seen] == ["/api/chat-with-ai"]
+
+    def test_stream_error_event_raises_modelerror(self, async_transport, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "existing-uuid"
+
+        def handler(request):
+            return httpx.Response(200, content=_sse_body([("error", '{"message": "overload"}')]))
+
+        async_transport(handler)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        with pytest.raises(llm.ModelError, match="overload"):
+            _run(model, mock_llm_prompt, stream=True)
+
+    def test_http_401_maps_to_authentication_error(self, async_transport, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "existing-uuid"
+        async_transport(lambda request: httpx.Response(401, json={}))
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        with pytest.raises(llm.ModelError, match="Authentication failed"):
+            _run(model, mock_llm_prompt, stream=False)
+
+    def test_conversation_creation_failure_raises_modelerror(
+        self, async_transport, mock_llm_prompt
+    ):
+        async_transport(lambda request: httpx.Response(500, json={}))
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        with pytest.raises(llm.ModelError, match="Failed to create conversation"):
+            _run(model, mock_llm_prompt, stream=True)
+
+
+def test_local_file_io_runs_off_the_event_loop(async_transport, mock_llm_prompt, monkeypatch):
+    threads = {}
+
+    def spy(name, func):
+        def wrapper(*args, **kwargs):
+            threads.setdefault(name, set()).add(threading.get_ident())
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    for name in (
+        "_resolve_options",
+        "_lookup_conversation",
+        "_claim_pooled_conversation",
+        "_cached_response",
+    ):
+        monkeypatch.setattr(
+            llm_1min._SharedOneMin, name, spy(name, getattr(llm_1min._SharedOneMin, name))
+        )
+    monkeypatch.setattr(llm_1min.RateLimiter, "reserve", spy("reserve", lambda self, key: 0.0))
+    for name in ("_persist_mapping", "flush_conversations"):
+        monkeypatch.setattr(llm_1min, name, spy(name, getattr(llm_1min, name)))
+    mock_llm_prompt.options.rate_limit_rps = 5
+
+    def handler(request):
+        if request.url.path == "/api/conversations":
+            return httpx.Response(200, json={"conversation": {"uuid": "conv-async"}})
+        return httpx.Response(200, content=_sse_body([("content", '{"content": "hi"}')]))
+
+    async_transport(handler)
+    model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+    assert _run(model, mock_llm_prompt, stream=True) == ["hi"]
+    assert set(threads) == {
+        "_resolve_options",
+        "_lookup_conversation",
+        "_claim_pooled_conversation",
+        "_cached_response",
+        "reserve",
+        "_persist_mapping",
+        "flush_conversations",
+    }
+    assert all(threading.get_ident() not in idents for idents in threads.values())
+
+
+class TestAsyncHttpClient:
+    def test_one_client_per_event_loop(self):
+        async def get_twice():
+            return llm_1min.get_async_http_client(), llm_1min.get_async_http_client()
+
+        first, second = asyncio.run(get_twice())
+        other, _ = asyncio.run(get_twice())
+
+        assert first is second
+        assert isinstance(first, httpx.AsyncClient)
+        assert other is not first
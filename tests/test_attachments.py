@@ -152,7 +152,7 @@ class TestEndpointSelection:
         monkeypatch.setattr("requests.post", fake_post)
         mock_llm_prompt.options.conversation_type = "CODE_GENERATOR"
 
-        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model = llm_1min.OneMinModel("1min/gpt-5.1-codex", "gpt-5.1-codex", "GPT-5.1 Codex")
         list(
             model.execute(prompt=mock_llm_prompt, stream=False, response=Mock(), conversation=None)
         )
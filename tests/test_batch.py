@@ -0,0 +1,262 @@
+"""Tests for `llm 1min batch` (concurrent JSONL prompt runner)."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+class FakeAPI:
+    """Conversation create/delete and a non-streaming chat endpoint that echoes prompts."""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.created = 0
+        self.deleted = []
+        self.sent_to = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, **kwargs):
+        if url.endswith("/api/conversations"):
+            with self.lock:
+                self.created += 1
+                uuid = f"conv{self.created}"
+            return Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": uuid}}))
+        prompt = json["promptObject"]["prompt"]
+        with self.lock:
+            self.sent_to.append(json["promptObject"].get("conversationId"))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delays.get(prompt, 0.01))
+        with self.lock:
+            self.in_flight -= 1
+        body = {"aiRecord": {"aiRecordDetail": {"resultObject": [f"echo: {prompt}"]}}}
+        return Mock(status_code=200, json=Mock(return_value=body), content=b"{}")
+
+    def delete(self, url, **kwargs):
+        with self.lock:
+            self.deleted.append(url.rsplit("/", 1)[-1])
+        return Mock(status_code=204)
+
+
+@pytest.fixture
+def api(http_session):
+    fake = FakeAPI()
+    http_session.post.side_effect = fake.post
+    http_session.delete.side_effect = fake.delete
+    return fake
+
+
+def _items(*lines, default_model="gpt-4o"):
+    parsed = [
+        llm_1min.parse_batch_line(number, line, default_model)
+        for number, line in enumerate(lines, start=1)
+    ]
+    return [item for item in parsed if item is not None]
+
+
+class TestParse:
+    def test_defaults(self):
+        item = llm_1min.parse_batch_line(3, '{"prompt": "hi"}', "gpt-4o")
+        assert item == {"id": 3, "model": "gpt-4o", "options": {}, "prompt": "hi", "system": None}
+
+    @pytest.mark.parametrize(
+        "line, message",
+        [
+            ("{torn", "Invalid JSON"),
+            ("[1, 2]", "not a JSON object"),
+            ('{"model": "gpt-4o"}', 'Missing "prompt"'),
+            ('{"prompt": "hi", "options": []}', '"options" must be an object'),
+        ],
+    )
+    def test_bad_lines_become_error_items(self, line, message):
+        assert message in llm_1min.parse_batch_line(1, line, "gpt-4o")["error"]
+
+    def test_blank_line_is_skipped(self):
+        assert llm_1min.parse_batch_line(1, "  \n") is None
+
+
+class TestRun:
+    def test_results_in_input_order_despite_completion_order(self, api):
+        api.delays = {"slow": 0.3}
+        items = _items('{"prompt": "slow"}', '{"prompt": "fast"}')
+
+        records = list(llm_1min.iter_batch(items, "key", concurrency=2))
+
+        assert [r["response"] for r in records] == ["echo: slow", "echo: fast"]
+        assert [r["id"] for r in records] == [1, 2]
+        assert all(r["error"] is None and r["latency_ms"] > 0 for r in records)
+        assert records[0]["timings"]["total_ms"] > 0
+
+    def test_completion_order(self, api):
+        api.delays = {"slow": 0.3}
+        items = _items('{"prompt": "slow"}', '{"prompt": "fast"}')
+
+        records = list(llm_1min.iter_batch(items, "key", concurrency=2, ordered=False))
+
+        assert [r["response"] for r in records] == ["echo: fast", "echo: slow"]
+
+    def test_concurrency_is_bounded(self, api):
+        api.delays = {f"p{i}": 0.05 for i in range(8)}
+        items = _items(*[json.dumps({"prompt": f"p{i}"}) for i in range(8)])
+
+        list(llm_1min.iter_batch(items, "key", concurrency=3))
+
+        assert 1 < api.max_in_flight <= 3
+
+    def test_errors_are_recorded_per_item(self, api):
+        items = _items(
+            '{"prompt": "ok"}',
+            '{"prompt": "x", "model": "no-such-model"}',
+            '{"prompt": "x", "options": {"web_search": "not a bool"}}',
+            '{"prompt": "x", "model": "deepseek-chat", "options": {"images": "images/a.png"}}',
+            "{torn",
+        )
+
+        records = list(llm_1min.iter_batch(items, "key"))
+
+        assert records[0]["error"] is None
+        assert "Unknown 1min.ai model" in records[1]["error"]
+        assert "web_search" in records[2]["error"]
+        assert "image input" in records[3]["error"]
+        assert "Invalid JSON" in records[4]["error"]
+        assert all(r["response"] is None for r in records[1:])
+
+    def test_models_resolve_by_llm_or_api_id(self, api):
+        items = _items(
+            '{"prompt": "a", "model": "1min/claude-4-6-sonnet"}',
+            '{"prompt": "b", "model": "claude-sonnet-4-6"}',
+        )
+
+        records = list(llm_1min.iter_batch(items, "key"))
+
+        assert [r["model"] for r in records] == ["1min/claude-4-6-sonnet"] * 2
+
+    def test_item_conversations_are_deleted_and_forgotten(self, api):
+        items = _items('{"prompt": "a"}', '{"prompt": "b"}')
+
+        list(llm_1min.iter_batch(items, "key"))
+
+        assert api.created == 2
+        assert sorted(api.deleted) == ["conv1", "conv2"]
+        assert llm_1min.get_active_conversations() == {}
+
+    def test_user_conversation_is_neither_reused_nor_deleted(self, api):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "USER-UUID"
+        llm_1min._persist_mapping({"1min/gpt-4o": "USER-UUID"})
+        llm_1min.flush_conversations()
+        items = _items('{"prompt": "a"}', '{"prompt": "b"}')
+
+        records = list(llm_1min.iter_batch(items, "key", concurrency=1))
+
+        assert all(r["error"] is None for r in records)
+        assert api.created == 2
+        assert "USER-UUID" not in api.sent_to
+        assert sorted(api.deleted) == ["conv1", "conv2"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "USER-UUID"}
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_concurrent_items_delete_every_conversation(self, api, monkeypatch, backend):
+        monkeypatch.setenv("LLM_1MIN_MAPPING_BACKEND", backend)
+        api.delays = {f"p{i}": 0.001 * (i % 5) for i in range(60)}
+        items = _items(*[json.dumps({"prompt": f"p{i}"}) for i in range(60)])
+
+        records = list(llm_1min.iter_batch(items, "key", concurrency=8))
+
+        assert all(r["error"] is None for r in records)
+        assert api.created == 60
+        assert sorted(api.deleted) == sorted(f"conv{i}" for i in range(1, 61))
+        assert llm_1min.get_active_conversations() == {}
+
+    def test_keep_conversations(self, api):
+        list(llm_1min.iter_batch(_items('{"prompt": "a"}'), "key", keep_conversations=True))
+
+        assert api.deleted == []
+        assert list(llm_1min.get_active_conversations().values()) == ["conv1"]
+
+    def test_rate_applies_client_side_rate_limit(self, api, monkeypatch):
+        reserved = []
+        monkeypatch.setattr(
+            llm_1min.RateLimiter, "reserve", lambda self, key: reserved.append(self.rate) or 0.0
+        )
+
+        list(llm_1min.iter_batch(_items('{"prompt": "a"}'), "key", rate=5))
+
+        # create + chat + delete, all drawn from the same 5 rps budget
+        assert reserved == [5.0, 5.0, 5.0]
+
+
+class TestBatchCommand:
+    def _write(self, path, *lines):
+        path.write_text("".join(line + "\n" for line in lines))
+        return str(path)
+
+    def test_writes_jsonl_and_summary(self, api, tmp_path, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        source = self._write(tmp_path / "in.jsonl", '{"id": "a", "prompt": "hi"}')
+        out = tmp_path / "out.jsonl"
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "batch", source, "-m", "gpt-4o-mini", "-o", str(out)]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "1 succeeded, 0 failed" in result.output
+        record = json.loads(out.read_text())
+        assert record["id"] == "a"
+        assert record["model"] == "1min/gpt-4o-mini"
+        assert record["response"] == "echo: hi"
+
+    def test_failures_set_exit_status(self, api, tmp_path, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        source = self._write(tmp_path / "in.jsonl", '{"prompt": "hi"}')
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "batch", source])
+
+        assert result.exit_code == 1
+        assert 'Missing \\"model\\"' in result.output
+
+    def test_resume_skips_done_and_retries_failed(
+        self, api, tmp_path, cli_runner, onemin_cli, monkeypatch
+    ):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        source = self._write(
+            tmp_path / "in.jsonl",
+            '{"id": 1, "prompt": "done"}',
+            '{"id": 2, "prompt": "failed before"}',
+            '{"id": 3, "prompt": "never ran"}',
+        )
+        out = tmp_path / "out.jsonl"
+        out.write_text(
+            json.dumps({"id": 1, "response": "old", "error": None})
+            + "\n"
+            + json.dumps({"id": 2, "response": None, "error": "boom"})
+            + '\n{"id": 3, "resp'
+        )
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "batch", source, "-m", "gpt-4o", "-o", str(out), "--resume"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "2 succeeded, 0 failed, 1 already done" in result.output
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        assert [(r["id"], r["response"]) for r in records] == [
+            (1, "old"),
+            (2, "echo: failed before"),
+            (3, "echo: never ran"),
+        ]
+
+    def test_resume_requires_output(self, tmp_path, cli_runner, onemin_cli):
+        source = self._write(tmp_path / "in.jsonl", '{"prompt": "hi"}')
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "batch", source, "--resume"])
+
+        assert result.exit_code != 0
+        assert "--resume needs --output" in result.output
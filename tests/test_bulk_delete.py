@@ -0,0 +1,160 @@
+"""Tests for concurrent bulk deletion of conversations."""
+
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+@pytest.fixture
+def session(http_session):
+    http_session.delete.return_value = Mock(status_code=204)
+    return http_session
+
+
+@pytest.fixture
+def saves(monkeypatch):
+    calls = []
+    original = llm_1min._persist_mapping
+
+    def counting_save(*args, **kwargs):
+        calls.append(dict(llm_1min._conversation_mapping))
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(llm_1min, "_persist_mapping", counting_save)
+    return calls
+
+
+def _track(n):
+    for i in range(n):
+        llm_1min._conversation_mapping[f"model{i}"] = f"uuid{i}"
+
+
+class TestClearAllConcurrency:
+    def test_deletes_run_in_parallel(self, session):
+        _track(4)
+        barrier = threading.Barrier(4, timeout=5)
+
+        def delete(url, **kwargs):
+            barrier.wait()  # only passes if 4 requests are in flight together
+            return Mock(status_code=204)
+
+        session.delete.side_effect = delete
+
+        assert llm_1min.clear_all_conversations("key", concurrency=4) == 4
+
+    def test_concurrency_bound_is_respected(self, session):
+        _track(12)
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def delete(url, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight[0] -= 1
+            return Mock(status_code=204)
+
+        session.delete.side_effect = delete
+
+        assert llm_1min.clear_all_conversations("key", concurrency=3) == 12
+        assert peak[0] <= 3
+
+    def test_mapping_is_persisted_once_at_the_end(self, session, saves):
+        _track(10)
+
+        assert llm_1min.clear_all_conversations("key") == 10
+        assert len(saves) == 1
+        assert saves[0] == {}
+
+    def test_mapping_is_persisted_in_periodic_batches(self, session, saves, monkeypatch):
+        monkeypatch.setattr(llm_1min, "DELETE_PERSIST_EVERY", 3)
+        _track(7)
+
+        llm_1min.clear_all_conversations("key", concurrency=1)
+
+        assert [len(s) for s in saves] == [4, 1, 0]
+
+    def test_failed_deletions_keep_their_mapping(self, session):
+        _track(3)
+        session.delete.side_effect = lambda url, **kw: Mock(
+            status_code=403 if url.endswith("uuid1") else 204
+        )
+
+        assert llm_1min.clear_all_conversations("key") == 2
+        assert llm_1min._conversation_mapping == {"model1": "uuid1"}
+
+    def test_progress_reports_every_completion(self, session):
+        _track(5)
+        seen = []
+
+        llm_1min.clear_all_conversations("key", progress=lambda done, total: seen.append(done))
+
+        assert sorted(seen) == [1, 2, 3, 4, 5]
+
+    def test_nothing_tracked_sends_nothing(self, session, saves):
+        assert llm_1min.clear_all_conversations("key") == 0
+        session.delete.assert_not_called()
+        assert saves == []
+
+
+class TestClearCommand:
+    def test_clear_all_with_concurrency_flag(self, session, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        _track(3)
+        llm_1min._persist_mapping(dict(llm_1min._conversation_mapping))
+        llm_1min.flush_conversations()
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "clear", "--all", "--concurrency", "2"])
+
+        assert result.exit_code == 0, result.output
+        assert "Cleared 3 conversation(s)" in result.output
+        assert session.delete.call_count == 3
+
+    def test_concurrency_must_be_positive(self, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "clear", "--all", "-j", "0"])
+
+        assert result.exit_code != 0
+
+
+class TestConversationManagerBulkDelete:
+    def test_server_side_clear_uses_engine(self, session):
+        import manage_conversations
+
+        session.get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"conversations": [{"uuid": f"u{i}"} for i in range(6)]}),
+        )
+        seen = []
+        manager = manage_conversations.ConversationManager("key")
+
+        count = manager.clear_all_conversations(
+            concurrency=3, progress=lambda done, total: seen.append((done, total))
+        )
+
+        assert count == 6
+        assert session.delete.call_count == 6
+        assert seen[-1] == (6, 6)
+
+    def test_server_side_clear_survives_legacy_config(self, session, capsys):
+        import manage_conversations
+
+        llm_1min._options_config.config_path.write_text(
+            json.dumps({"defaults": {"is_mixed": True}, "models": {}})
+        )
+        session.get.return_value = Mock(
+            status_code=200,
+            json=Mock(return_value={"conversations": [{"uuid": "u1"}, {"uuid": "u2"}]}),
+        )
+        manager = manage_conversations.ConversationManager("key")
+
+        assert manager.clear_all_conversations() == 2
+        assert capsys.readouterr().err.count("Ignoring saved options") == 1
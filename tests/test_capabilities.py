@@ -0,0 +1,169 @@
+"""Tests for model capability metadata and local preflight validation."""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+@pytest.fixture
+def offline(http_session, monkeypatch):
+    """Fail the test if anything reaches the network."""
+    http_session.post.side_effect = AssertionError("network I/O before preflight")
+    monkeypatch.setattr(
+        llm_1min,
+        "get_async_http_client",
+        Mock(side_effect=AssertionError("network I/O before preflight")),
+    )
+    monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+    monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "key")
+    return http_session
+
+
+def _run(api_model_id, prompt):
+    model = llm_1min.OneMinModel(f"1min/{api_model_id}", api_model_id)
+    return list(model.execute(prompt, True, Mock(response_json=None), None))
+
+
+class TestTable:
+    def test_every_builtin_model_has_capabilities(self):
+        for info in llm_1min.builtin_model_catalog():
+            caps = info.capabilities
+            assert caps is not None, info.api_model_id
+            assert caps.latency in {"fast", "standard", "slow"}
+            assert caps.max_context > 0
+
+    def test_flags_use_known_letters(self):
+        for flags, _context, _latency in llm_1min.MODEL_CAPABILITIES.values():
+            assert set(flags) <= set("vfcw")
+
+    def test_consistent_with_model_defaults(self):
+        for api_id, defaults in llm_1min.MODEL_DEFAULTS.items():
+            caps = llm_1min.ModelCapabilities.for_model(api_id)
+            if defaults.get("conversation_type") == "CODE_GENERATOR":
+                assert caps.code_generator, api_id
+            if defaults.get("web_search"):
+                assert caps.web, api_id
+
+    def test_unknown_model_has_none(self):
+        info = llm_1min.ModelInfo("1min/brand-new", "brand-new", "Brand New", "NewCo")
+        assert info.capabilities is None
+
+    def test_summary(self):
+        assert llm_1min.ModelCapabilities.for_model("gpt-4o").summary() == (
+            "vision, files | 128k context | standard"
+        )
+        assert (
+            llm_1min.ModelCapabilities.for_model("gpt-4.1")
+            .summary()
+            .startswith("vision, files | 1.05M context")
+        )
+        assert llm_1min.ModelCapabilities.for_model("gpt-5.1-codex").summary() == (
+            "vision, files, code | 400k context | standard"
+        )
+
+    def test_code_flag_matches_code_generator_defaults(self):
+        code_models = {
+            api_id
+            for api_id, (flags, _context, _latency) in llm_1min.MODEL_CAPABILITIES.items()
+            if "c" in flags
+        }
+        assert code_models == {
+            api_id
+            for api_id, defaults in llm_1min.MODEL_DEFAULTS.items()
+            if defaults.get("conversation_type") == "CODE_GENERATOR"
+        }
+
+
+class TestPreflight:
+    def test_images_on_text_only_model(self, offline, mock_llm_prompt):
+        mock_llm_prompt.options.images = "images/a.png"
+
+        with pytest.raises(llm_1min.llm.ModelError, match="does not accept image input"):
+            _run("deepseek-chat", mock_llm_prompt)
+
+    def test_files_on_model_without_file_input(self, offline, mock_llm_prompt):
+        mock_llm_prompt.options.files = "file-1"
+
+        with pytest.raises(llm_1min.llm.ModelError, match="does not accept file input"):
+            _run("meta/llama-2-70b-chat", mock_llm_prompt)
+
+    @pytest.mark.parametrize("api_id", ["sonar", "gpt-4o"])
+    def test_code_generator_on_ineligible_model(self, offline, mock_llm_prompt, api_id):
+        mock_llm_prompt.options.conversation_type = "CODE_GENERATOR"
+
+        with pytest.raises(llm_1min.llm.ModelError, match=f"1min/{api_id} does not support"):
+            _run(api_id, mock_llm_prompt)
+
+    def test_attachments_switch_code_generator_to_chat(self, mock_llm_prompt):
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o")
+        merged = {"conversation_type": "CODE_GENERATOR", "files": "file-1"}
+
+        model._preflight(mock_llm_prompt, merged)
+
+        assert merged["conversation_type"] == "UNIFY_CHAT_WITH_AI"
+
+    def test_code_model_default_with_images_is_sent_as_chat(
+        self, mock_llm_prompt, http_session, monkeypatch
+    ):
+        def post(url, **kwargs):
+            body = {
+                "conversation": {"uuid": "conv-1"},
+                "aiRecord": {"aiRecordDetail": {"resultObject": ["a cat"]}},
+            }
+            return Mock(status_code=200, json=Mock(return_value=body))
+
+        http_session.post.side_effect = post
+        monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+        mock_llm_prompt.options.images = "images/a.png"
+
+        # claude-sonnet-4-6 defaults to CODE_GENERATOR
+        model = llm_1min.OneMinModel("1min/claude-4-6-sonnet", "claude-sonnet-4-6")
+        assert list(model.execute(mock_llm_prompt, False, Mock(), None)) == ["a cat"]
+
+        url = http_session.post.call_args_list[-1].args[0]
+        payload = http_session.post.call_args_list[-1].kwargs["json"]
+        assert "/api/chat-with-ai" in url
+        assert payload["type"] == "UNIFY_CHAT_WITH_AI"
+
+    def test_prompt_clearly_over_context(self, offline, mock_llm_prompt):
+        mock_llm_prompt.prompt = "x" * (4 * 4_096 + 4)
+
+        with pytest.raises(llm_1min.llm.ModelError, match="context window"):
+            _run("meta/llama-2-70b-chat", mock_llm_prompt)
+
+    def test_saved_options_are_validated_too(self, offline, mock_llm_prompt):
+        llm_1min._options_config.set_option("images", "images/a.png", "deepseek-chat")
+
+        with pytest.raises(llm_1min.llm.ModelError, match="image input"):
+            _run("deepseek-chat", mock_llm_prompt)
+
+    def test_async_model_fails_before_network(self, offline, mock_llm_prompt):
+        mock_llm_prompt.options.images = "images/a.png"
+        model = llm_1min.AsyncOneMinModel("1min/deepseek-chat", "deepseek-chat")
+
+        async def collect():
+            return [
+                c
+                async for c in model.execute(mock_llm_prompt, True, Mock(response_json=None), None)
+            ]
+
+        with pytest.raises(llm_1min.llm.ModelError, match="image input"):
+            asyncio.run(collect())
+
+    def test_supported_and_unknown_models_pass(self, mock_llm_prompt):
+        mock_llm_prompt.options.images = "images/a.png"
+        for api_id in ("gpt-4o", "brand-new-model"):
+            model = llm_1min.OneMinModel(f"1min/{api_id}", api_id)
+            model._preflight(mock_llm_prompt, {"images": "images/a.png"})
+
+
+def test_models_command_shows_capabilities(cli_runner, onemin_cli):
+    result = cli_runner.invoke(onemin_cli, ["1min", "models", "--builtin"])
+
+    assert result.exit_code == 0, result.output
+    assert "Accepts: vision, files | 128k context | standard" in result.output
+    assert "Accepts: vision, files, code | 400k context | standard" in result.output
+    assert "Accepts: vision, files, web | 128k context | fast" in result.output
@@ -389,3 +389,14 @@ class TestConversationFunctions:
 
         # Verify cleared
         assert len(llm_1min._conversation_mapping) == 0
+
+
+class TestOptionsHelp:
+    """Test 'llm 1min options --help'."""
+
+    def test_help_lists_every_model_option(self, cli_runner, onemin_cli):
+        result = cli_runner.invoke(onemin_cli, ["1min", "options", "--help"])
+
+        assert result.exit_code == 0, result.output
+        for name in llm_1min.OneMinModel.Options.model_fields:
+            assert f"- {name} (" in result.output, name
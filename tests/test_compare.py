@@ -0,0 +1,200 @@
+"""Tests for `llm 1min compare` (concurrent multi-model fan-out)."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+def _sse(*chunks):
+    return b"".join(
+        f'event: content\ndata: {{"content": "{chunk}"}}\n\n'.encode() for chunk in chunks
+    )
+
+
+class FakeAPI:
+    """Conversation create/delete and a streaming chat endpoint with per-model replies."""
+
+    def __init__(self, replies, delays=None, barrier=None):
+        self.replies = replies
+        self.delays = delays or {}
+        self.barrier = barrier
+        self.created = 0
+        self.deleted = []
+        self.sent_to = []
+        self.lock = threading.Lock()
+
+    def post(self, url, json=None, **kwargs):
+        if url.endswith("/api/conversations"):
+            with self.lock:
+                self.created += 1
+                uuid = f"conv{self.created}"
+            return Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": uuid}}))
+        model = json["model"]
+        with self.lock:
+            self.sent_to.append(json["promptObject"].get("conversationId"))
+        if self.barrier is not None:
+            self.barrier.wait()
+        time.sleep(self.delays.get(model, 0))
+        reply = self.replies[model]
+        if isinstance(reply, int):
+            response = Mock(status_code=reply, text="")
+            response.raise_for_status.side_effect = llm_1min.requests.exceptions.HTTPError(
+                f"{reply} Server Error", response=response
+            )
+        else:
+            response = Mock(status_code=200)
+            response.iter_content = Mock(return_value=iter([_sse(*reply)]))
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        return response
+
+    def delete(self, url, **kwargs):
+        with self.lock:
+            self.deleted.append(url.rsplit("/", 1)[-1])
+        return Mock(status_code=204)
+
+
+@pytest.fixture
+def api(http_session, monkeypatch):
+    fake = FakeAPI({"gpt-4o": ["Hello", " world"], "sonar": ["Sonar reply"]})
+    http_session.post.side_effect = fake.post
+    http_session.delete.side_effect = fake.delete
+    monkeypatch.setattr(llm_1min, "_default_retry_policy", lambda: llm_1min.RetryPolicy(0))
+    return fake
+
+
+def _records(events):
+    return [record for _index, chunk, record in events if chunk is None]
+
+
+class TestIterCompare:
+    def test_models_run_concurrently(self, api):
+        # Both chat requests must be in flight at once to pass the barrier
+        api.barrier = threading.Barrier(2, timeout=5)
+
+        records = _records(llm_1min.iter_compare(["gpt-4o", "sonar"], "hi", "key"))
+
+        by_model = {record["model"]: record for record in records}
+        assert by_model["1min/gpt-4o"]["response"] == "Hello world"
+        assert by_model["1min/gpt-4o"]["chars"] == 11
+        assert by_model["1min/sonar"]["response"] == "Sonar reply"
+        assert all(r["ttft_ms"] is not None and r["total_ms"] >= r["ttft_ms"] for r in records)
+
+    def test_chunks_are_labeled_with_their_model(self, api):
+        events = list(llm_1min.iter_compare(["gpt-4o", "sonar"], "hi", "key"))
+
+        chunks = [(index, chunk) for index, chunk, _record in events if chunk is not None]
+        assert [chunk for index, chunk in chunks if index == 0] == ["Hello", " world"]
+        assert [chunk for index, chunk in chunks if index == 1] == ["Sonar reply"]
+
+    def test_failure_does_not_stop_other_models(self, api):
+        api.replies["sonar"] = 500
+
+        records = _records(llm_1min.iter_compare(["gpt-4o", "sonar"], "hi", "key"))
+
+        by_model = {record["model"]: record for record in records}
+        assert by_model["1min/gpt-4o"]["error"] is None
+        assert "500" in by_model["1min/sonar"]["error"]
+
+    def test_unknown_model_fails_before_sending(self, api):
+        with pytest.raises(ValueError, match="Unknown 1min.ai model"):
+            list(llm_1min.iter_compare(["gpt-4o", "nope"], "hi", "key"))
+
+        assert api.created == 0
+
+    def test_conversations_are_deleted(self, api):
+        list(llm_1min.iter_compare(["gpt-4o", "sonar"], "hi", "key"))
+
+        assert sorted(api.deleted) == ["conv1", "conv2"]
+        assert llm_1min.get_active_conversations() == {}
+
+    def test_user_conversation_is_neither_reused_nor_deleted(self, api):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "USER-UUID"
+        llm_1min._persist_mapping({"1min/gpt-4o": "USER-UUID"})
+        llm_1min.flush_conversations()
+
+        records = _records(llm_1min.iter_compare(["gpt-4o", "sonar"], "hi", "key"))
+
+        assert all(r["error"] is None for r in records)
+        assert api.created == 2
+        assert "USER-UUID" not in api.sent_to
+        assert sorted(api.deleted) == ["conv1", "conv2"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "USER-UUID"}
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_many_concurrent_models_delete_every_conversation(self, api, monkeypatch, backend):
+        monkeypatch.setenv("LLM_1MIN_MAPPING_BACKEND", backend)
+        models = ["gpt-4o", "sonar"] * 12
+
+        records = _records(llm_1min.iter_compare(models, "hi", "key"))
+
+        assert all(record["error"] is None for record in records)
+        assert sorted(api.deleted) == sorted(f"conv{i}" for i in range(1, 25))
+        assert llm_1min.get_active_conversations() == {}
+
+
+def test_columns_layout():
+    records = [
+        {"model": "a", "response": "one two three four", "error": None},
+        {"model": "b", "response": "", "error": "boom"},
+    ]
+
+    lines = llm_1min._compare_columns(records, 43)
+
+    assert lines[0] == "a" + " " * 19 + " | b"
+    assert lines[2] == "one two three four   | Error: boom"
+
+
+class TestCompareCommand:
+    def test_sections_in_model_order_then_table(self, api, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        api.delays = {"gpt-4o": 0.2}  # the second model finishes first
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "compare", "-m", "gpt-4o", "-m", "sonar", "hi"]
+        )
+
+        assert result.exit_code == 0, result.output
+        out = result.output
+        assert out.index("=== gpt-4o ===") < out.index("Hello world") < out.index("=== sonar ===")
+        assert out.index("=== sonar ===") < out.index("Sonar reply") < out.index("TTFT ms")
+        table = out[out.index("Model") :].splitlines()
+        assert table[1].startswith("1min/gpt-4o") and table[1].endswith("11")
+        assert table[2].startswith("1min/sonar") and table[2].endswith("11")
+
+    def test_columns(self, api, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "compare", "-m", "gpt-4o", "-m", "sonar", "--columns", "hi"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert any(
+            "Hello world" in line and "Sonar reply" in line for line in result.output.splitlines()
+        )
+
+    def test_failure_sets_exit_status(self, api, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        api.replies["sonar"] = 500
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "compare", "-m", "gpt-4o", "-m", "sonar", "hi"]
+        )
+
+        assert result.exit_code == 1
+        assert "Error:" in result.output
+        assert "failed" in result.output
+
+    def test_unknown_model(self, api, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "compare", "-m", "nope", "hi"])
+
+        assert result.exit_code == 1
+        assert "Unknown 1min.ai model: nope" in result.output
+        assert "===" not in result.output
@@ -0,0 +1,205 @@
+"""Tests for `llm 1min conversations gc` (server reconciliation of the mapping)."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+import llm_1min
+
+OLD = "2020-01-01T00:00:00Z"
+
+
+def _conv(uuid, title="LLM Chat - GPT-4o", created=OLD):
+    return {"uuid": uuid, "title": title, "createdAt": created}
+
+
+class FakeServer:
+    """Paged GET /api/conversations, GET/DELETE by UUID."""
+
+    def __init__(self, conversations, ignores_paging=False):
+        self.conversations = list(conversations)
+        self.ignores_paging = ignores_paging
+        self.pages = []
+        self.gets = []
+        self.deleted = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, **kwargs):
+        if url.endswith("/api/conversations"):
+            self.pages.append(params)
+            if self.ignores_paging:
+                batch = self.conversations
+            else:
+                start = (params["page"] - 1) * params["limit"]
+                batch = self.conversations[start : start + params["limit"]]
+            return Mock(status_code=200, json=Mock(return_value={"conversations": batch}))
+        uuid = url.rsplit("/", 1)[-1]
+        with self.lock:
+            self.gets.append(uuid)
+        known = any(conv["uuid"] == uuid for conv in self.conversations)
+        return Mock(status_code=200 if known else 404)
+
+    def delete(self, url, **kwargs):
+        with self.lock:
+            self.deleted.append(url.rsplit("/", 1)[-1])
+        return Mock(status_code=204)
+
+
+@pytest.fixture
+def server(http_session):
+    fake = FakeServer([])
+    http_session.get.side_effect = fake.get
+    http_session.delete.side_effect = fake.delete
+    return fake
+
+
+def _track(mapping):
+    llm_1min._conversation_mapping.update(mapping)
+    llm_1min._persist_mapping(dict(llm_1min._conversation_mapping))
+    llm_1min.flush_conversations()
+
+
+class TestListing:
+    def test_pages_until_short_page(self, server, monkeypatch):
+        monkeypatch.setattr(llm_1min, "GC_PAGE_SIZE", 2)
+        server.conversations = [_conv(f"u{i}") for i in range(5)]
+
+        report = llm_1min.gc_conversations("key")
+
+        assert report["server"] == 5
+        assert [p["page"] for p in server.pages] == [1, 2, 3]
+
+    def test_server_ignoring_paging_stops_after_repeat(self, server, monkeypatch):
+        monkeypatch.setattr(llm_1min, "GC_PAGE_SIZE", 2)
+        server.conversations = [_conv("u1"), _conv("u2")]
+        server.ignores_paging = True
+
+        assert llm_1min.gc_conversations("key")["server"] == 2
+        assert len(server.pages) == 2
+
+    def test_listing_failure_changes_nothing(self, server, monkeypatch):
+        _track({"1min/gpt-4o": "u1"})
+        failing = Mock(status_code=500)
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError(response=failing)
+        monkeypatch.setattr(llm_1min._http_session, "get", Mock(return_value=failing))
+        monkeypatch.setattr(llm_1min, "_default_retry_policy", lambda: llm_1min.RetryPolicy(0))
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            llm_1min.gc_conversations("key")
+
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "u1"}
+
+
+class TestDeadMappings:
+    def test_drops_keys_confirmed_missing(self, server):
+        server.conversations = [_conv("alive")]
+        _track({"1min/gpt-4o": "alive", "c1_1min/gpt-4o": "gone", "1min/claude": "gone"})
+
+        report = llm_1min.gc_conversations("key")
+
+        assert report["dead"] == ["gone"]
+        assert sorted(report["dropped_keys"]) == ["1min/claude", "c1_1min/gpt-4o"]
+        assert llm_1min.JSONConversationStore(llm_1min._get_conversation_file()).load() == {
+            "1min/gpt-4o": "alive"
+        }
+
+    def test_unlisted_but_existing_conversation_is_kept(self, server, monkeypatch):
+        # A truncated listing must not cost live mappings: only a 404 drops them
+        server.conversations = [_conv("alive")]
+        _track({"1min/gpt-4o": "alive"})
+        monkeypatch.setattr(llm_1min, "_iter_remote_conversations", lambda *a, **kw: iter([]))
+
+        report = llm_1min.gc_conversations("key")
+
+        assert report["dead"] == []
+        assert server.gets == ["alive"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "alive"}
+
+    def test_dry_run_reports_without_saving(self, server):
+        _track({"1min/gpt-4o": "gone"})
+
+        report = llm_1min.gc_conversations("key", dry_run=True)
+
+        assert report["dropped_keys"] == ["1min/gpt-4o"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "gone"}
+
+    def test_confirmations_run_concurrently(self, server, monkeypatch):
+        _track({f"m{i}": f"gone{i}" for i in range(4)})
+        barrier = threading.Barrier(4, timeout=5)
+        original = server.get
+
+        def get(url, params=None, **kwargs):
+            if not url.endswith("/api/conversations"):
+                barrier.wait()
+            return original(url, params, **kwargs)
+
+        monkeypatch.setattr(llm_1min._http_session, "get", get)
+
+        assert len(llm_1min.gc_conversations("key", concurrency=4)["dead"]) == 4
+
+
+class TestOrphans:
+    def test_kept_unless_requested(self, server):
+        server.conversations = [_conv("orphan")]
+
+        report = llm_1min.gc_conversations("key")
+
+        assert report["orphans"] == []
+        assert server.deleted == []
+
+    def test_only_old_unreferenced_plugin_conversations_are_deleted(self, server):
+        recent = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        server.conversations = [
+            _conv("orphan"),
+            _conv("tracked"),
+            _conv("pooled"),
+            _conv("recent", created=recent),
+            _conv("web-app", title="My notes"),
+            _conv("undated", created=None),
+        ]
+        _track({"1min/gpt-4o": "tracked"})
+        pool = llm_1min.ConversationPool(1)
+        llm_1min._atomic_write_json(
+            pool.state_file, {"k:gpt-4o:UNIFY_CHAT_WITH_AI": [{"uuid": "pooled", "created": 0}]}
+        )
+
+        report = llm_1min.gc_conversations("key", orphan_max_age=86400)
+
+        assert report["orphans"] == ["orphan"]
+        assert server.deleted == ["orphan"]
+        assert report["deleted"] == 1
+
+    def test_dry_run_deletes_nothing(self, server):
+        server.conversations = [_conv("orphan")]
+
+        report = llm_1min.gc_conversations("key", orphan_max_age=0, dry_run=True)
+
+        assert report["orphans"] == ["orphan"]
+        assert server.deleted == []
+
+
+class TestGCCommand:
+    def test_reports_dropped_and_deleted(self, server, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        server.conversations = [_conv("orphan")]
+        _track({"1min/gpt-4o": "gone"})
+
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "conversations", "gc", "--delete-orphans-older-than", "7"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert "Server conversations: 1, tracked locally: 1" in result.output
+        assert "Dropped 1 mapping(s) to 1 deleted conversation(s)" in result.output
+        assert "Deleted 1 orphaned conversation(s)" in result.output
+
+    def test_listing_still_works_without_subcommand(self, cli_runner, onemin_cli):
+        _track({"1min/gpt-4o": "u1"})
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "conversations"])
+
+        assert result.exit_code == 0, result.output
+        assert "1min/gpt-4o: u1" in result.output
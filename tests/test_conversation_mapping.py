@@ -0,0 +1,152 @@
+"""Tests for ConversationMapping's UUID and model secondary indexes."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+def _scan_model(mapping, model_id):
+    return [k for k in mapping if k == model_id or k.endswith(f"_{model_id}")]
+
+
+def _scan_uuid(mapping, conversation_uuid):
+    return [k for k, v in mapping.items() if v == conversation_uuid]
+
+
+def _assert_consistent(mapping):
+    models = {"1min/gpt-4o", "gpt-4o", "1min/sonar", "model1", "c1", "x_y"}
+    for model_id in models | set(mapping):
+        assert mapping.keys_for_model(model_id) == _scan_model(mapping, model_id)
+    for conversation_uuid in set(mapping.values()) | {"missing"}:
+        assert sorted(mapping.keys_for_uuid(conversation_uuid)) == sorted(
+            _scan_uuid(mapping, conversation_uuid)
+        )
+    assert sorted(mapping.uuids()) == sorted(set(mapping.values()))
+    for conversation_id in {"c1", "c2", "c3", "c9", "x_y"}:
+        assert mapping.keys_for_conversation(conversation_id) == [
+            k
+            for k in mapping
+            if llm_1min.split_mapping_key(k)[0] == conversation_id
+            and llm_1min.split_mapping_key(k)[1]
+        ]
+
+
+@pytest.fixture
+def mapping():
+    return llm_1min.ConversationMapping(
+        {
+            "1min/gpt-4o": "u1",
+            "c1_1min/gpt-4o": "u1",
+            "c2_1min/sonar": "u2",
+            "c1": "u3",
+            "x_y_model1": "u4",
+        }
+    )
+
+
+class TestIndexes:
+    def test_model_lookup_matches_suffix_scan(self, mapping):
+        assert mapping.keys_for_model("1min/gpt-4o") == ["1min/gpt-4o", "c1_1min/gpt-4o"]
+        assert mapping.keys_for_model("model1") == ["x_y_model1"]
+        assert mapping.keys_for_model("gpt-4o") == []
+        _assert_consistent(mapping)
+
+    def test_uuid_lookup(self, mapping):
+        assert mapping.keys_for_uuid("u1") == ["1min/gpt-4o", "c1_1min/gpt-4o"]
+        assert mapping.keys_for_uuid("missing") == []
+
+    @pytest.mark.parametrize(
+        "mutate",
+        [
+            lambda m: m.__setitem__("1min/gpt-4o", "u9"),
+            lambda m: m.__delitem__("c1_1min/gpt-4o"),
+            lambda m: m.pop("c2_1min/sonar"),
+            lambda m: m.pop("absent", None),
+            lambda m: m.popitem(),
+            lambda m: m.setdefault("1min/sonar", "u5"),
+            lambda m: m.update({"c3_1min/sonar": "u2"}, extra="u1"),
+            lambda m: m.__ior__({"c1": "u1"}),
+            lambda m: m.clear(),
+        ],
+    )
+    def test_indexes_follow_every_mutation(self, mapping, mutate):
+        mutate(mapping)
+        _assert_consistent(mapping)
+
+    def test_migration_moves_key_between_buckets(self, mapping):
+        uuid = mapping.pop("1min/gpt-4o")
+        mapping["c9_1min/gpt-4o"] = uuid
+
+        assert mapping.keys_for_model("1min/gpt-4o") == ["c1_1min/gpt-4o", "c9_1min/gpt-4o"]
+        _assert_consistent(mapping)
+
+    def test_conversation_lookup(self, mapping):
+        assert mapping.keys_for_conversation("c1") == ["c1_1min/gpt-4o"]
+        assert mapping.keys_for_conversation("c2") == ["c2_1min/sonar"]
+        assert mapping.keys_for_conversation("x") == []
+
+    @pytest.mark.parametrize(
+        "key, expected",
+        [
+            ("1min/gpt-4o", (None, "1min/gpt-4o")),
+            ("01j9abc_1min/gpt-4o", ("01j9abc", "1min/gpt-4o")),
+            ("01j9abc", ("01j9abc", None)),
+            ("a_b_1min/sonar", ("a_b", "1min/sonar")),
+            ("x_y_model1", ("x_y_model1", None)),
+        ],
+    )
+    def test_split_mapping_key(self, key, expected):
+        assert llm_1min.split_mapping_key(key) == expected
+
+    def test_pop_missing_key_raises(self, mapping):
+        with pytest.raises(KeyError):
+            mapping.pop("absent")
+
+    def test_copy_is_a_plain_snapshot(self, mapping):
+        snapshot = mapping.copy()
+        mapping["new"] = "u7"
+        assert type(snapshot) is dict
+        assert "new" not in snapshot
+
+
+class TestHistoryMixedLookup:
+    def test_conversation_from_other_model_moves_to_shared_key(self, mock_llm_prompt):
+        mock_llm_prompt.options.history_mixed = True
+        llm_1min._conversation_mapping.update({"c10_1min/sonar": "other", "c1_1min/sonar": "u1"})
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        uuid, key = model._lookup_conversation(Mock(id="c1"), mock_llm_prompt, False)
+
+        assert (uuid, key) == ("u1", "c1")
+        assert dict(llm_1min._conversation_mapping) == {"c10_1min/sonar": "other", "c1": "u1"}
+        assert llm_1min._conversation_mapping.keys_for_conversation("c1") == []
+
+
+class TestModuleMapping:
+    def test_load_builds_indexed_mapping(self):
+        llm_1min._get_conversation_file().write_text(json.dumps({"c1_1min/gpt-4o": "u1"}))
+
+        llm_1min._load_conversations()
+
+        assert isinstance(llm_1min._conversation_mapping, llm_1min.ConversationMapping)
+        assert llm_1min._conversation_mapping.keys_for_uuid("u1") == ["c1_1min/gpt-4o"]
+
+    def test_clear_conversation_uses_first_key_for_model(self, monkeypatch):
+        deleted = []
+
+        def fake_delete(api_key, conversation_uuid, policy, limiter):
+            deleted.append(conversation_uuid)
+            return True
+
+        monkeypatch.setattr(llm_1min, "_delete_remote_conversation", fake_delete)
+        llm_1min._conversation_mapping.update(
+            {"c1_1min/gpt-4o": "u1", "1min/gpt-4o": "u2", "c2": "u1", "1min/sonar": "u3"}
+        )
+
+        assert llm_1min.clear_conversation("1min/gpt-4o", "key") is True
+
+        assert deleted == ["u1"]
+        assert dict(llm_1min._conversation_mapping) == {"1min/gpt-4o": "u2", "1min/sonar": "u3"}
@@ -0,0 +1,70 @@
+"""Tests for the shared pooled HTTP session."""
+
+from unittest.mock import Mock
+
+import requests
+
+import llm_1min
+
+
+class TestHttpSession:
+    def test_session_is_created_once(self, monkeypatch):
+        monkeypatch.setattr(llm_1min, "_http_session", None)
+
+        first = llm_1min.get_http_session()
+        second = llm_1min.get_http_session()
+
+        assert isinstance(first, requests.Session)
+        assert first is second
+
+    def test_https_adapter_uses_tuned_pool_sizes(self, monkeypatch):
+        monkeypatch.setattr(llm_1min, "_http_session", None)
+
+        adapter = llm_1min.get_http_session().get_adapter("https://api.1min.ai/api/chat-with-ai")
+
+        assert adapter._pool_connections == llm_1min.HTTP_POOL_CONNECTIONS
+        assert adapter._pool_maxsize == llm_1min.HTTP_POOL_MAXSIZE
+
+    def test_conversation_and_chat_share_the_session(
+        self, http_session, monkeypatch, mock_llm_prompt
+    ):
+        conv_response = Mock(status_code=200)
+        conv_response.json.return_value = {"conversation": {"uuid": "conv-1"}}
+        chat_response = Mock(status_code=200)
+        chat_response.json.return_value = {"aiRecord": {"aiRecordDetail": {"resultObject": ["ok"]}}}
+        http_session.post.side_effect = [conv_response, chat_response]
+        monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "test-key")
+
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        chunks = list(
+            model.execute(prompt=mock_llm_prompt, stream=False, response=Mock(), conversation=None)
+        )
+
+        assert chunks == ["ok"]
+        urls = [call.args[0] for call in http_session.post.call_args_list]
+        assert urls == [
+            "https://api.1min.ai/api/conversations",
+            "https://api.1min.ai/api/chat-with-ai",
+        ]
+
+    def test_clear_all_conversations_uses_session(self, http_session):
+        http_session.delete.return_value = Mock(status_code=204)
+        llm_1min._conversation_mapping["model1"] = "uuid1"
+        llm_1min._conversation_mapping["model2"] = "uuid2"
+
+        assert llm_1min.clear_all_conversations("test-key") == 2
+        assert http_session.delete.call_count == 2
+
+    def test_conversation_manager_uses_session(self, http_session):
+        import manage_conversations
+
+        http_session.get.return_value = Mock(
+            status_code=200, json=Mock(return_value={"conversations": [{"uuid": "a"}]})
+        )
+        http_session.delete.return_value = Mock(status_code=204)
+
+        manager = manage_conversations.ConversationManager("test-key")
+
+        assert manager.clear_all_conversations() == 1
+        http_session.get.assert_called_once()
+        http_session.delete.assert_called_once()
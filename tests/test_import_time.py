@@ -0,0 +1,82 @@
+"""Importing the plugin must not touch plugin state on disk.
+
+llm imports every installed plugin on each invocation (`llm --help`,
+`llm models`, prompts to other providers), so import cost has to stay flat no
+matter how large the conversation mapping grows.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+IMPORT_BUDGET_MS = 500  # generous: includes bytecode compilation on cold CI runners
+
+
+def _import_plugin(home: Path, *args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+    env.pop("LLM_1MIN_DEBUG", None)
+    return subprocess.run(
+        [sys.executable, *args, "-c", "import llm_1min"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=True,
+    )
+
+
+def _self_time_ms(home: Path) -> float:
+    """Self time of the llm_1min module body, from `python -X importtime`."""
+    result = _import_plugin(home, "-X", "importtime")
+    for line in result.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "llm_1min":
+            return int(fields[0].rsplit(":", 1)[-1]) / 1000
+    raise AssertionError(f"llm_1min missing from importtime output:\n{result.stderr}")
+
+
+def _plugin_dir(home: Path) -> Path:
+    path = home / ".config" / "llm-1min"
+    path.mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def home(tmp_path):
+    path = tmp_path / "home"
+    path.mkdir()
+    return path
+
+
+def test_import_creates_no_directories(home):
+    _import_plugin(home)
+    assert not (home / ".config" / "llm-1min").exists()
+    assert not (home / ".llm-1min.json").exists()
+
+
+def test_import_does_not_read_mapping(home):
+    (_plugin_dir(home) / "conversations.json").write_text("{not json")
+
+    result = _import_plugin(home)
+
+    assert "conversation mapping" not in result.stderr
+
+
+def test_import_time_is_flat_in_mapping_size(tmp_path):
+    small, large = tmp_path / "small", tmp_path / "large"
+    (_plugin_dir(small) / "conversations.json").write_text("{}")
+    mapping = {f"01j{i:023d}_1min/gpt-4o": f"{i:032x}" for i in range(100_000)}
+    (_plugin_dir(large) / "conversations.json").write_text(json.dumps(mapping, indent=2))
+
+    small_ms = min(_self_time_ms(small) for _ in range(2))
+    large_ms = min(_self_time_ms(large) for _ in range(2))
+
+    assert large_ms < IMPORT_BUDGET_MS
+    # Parsing and indexing 100k mappings takes far longer than this slack
+    assert large_ms < small_ms + 40
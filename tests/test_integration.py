@@ -276,7 +276,7 @@ class TestOptionsConfigBehavior:
         with open(config.config_path) as f:
             loaded = json.load(f)
 
-        assert loaded == data
+        assert loaded == {"version": 1, **data}
 
     def test_set_and_get_consistency(self, mock_config_path):
         """Test that set and get operations are consistent."""
@@ -480,6 +480,16 @@ class TestAdditionalCoverage:
         prompt.options.brand_voice_id = None
         prompt.options.images = None
         prompt.options.files = None
+        prompt.options.max_retries = None
+        prompt.options.retry_backoff_base = None
+        prompt.options.retry_backoff_max = None
+        prompt.options.rate_limit_rps = None
+        prompt.options.rate_limit_burst = None
+        prompt.options.warm_pool_size = None
+        prompt.options.warm_pool_ttl = None
+        prompt.options.cache = None
+        prompt.options.cache_ttl = None
+        prompt.options.cache_max_entries = None
         prompt.options.debug = False
 
         model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
@@ -0,0 +1,418 @@
+"""Tests for the pluggable conversation mapping store (JSON / SQLite)."""
+
+import json
+import multiprocessing
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+@pytest.fixture
+def sqlite_backend(monkeypatch):
+    monkeypatch.setenv("LLM_1MIN_MAPPING_BACKEND", "sqlite")
+    return llm_1min._get_conversation_file().with_suffix(".sqlite")
+
+
+def _rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT key, uuid FROM mappings"))
+
+
+class TestBackendSelection:
+    def test_json_is_the_default(self, monkeypatch):
+        monkeypatch.delenv("LLM_1MIN_MAPPING_BACKEND", raising=False)
+        store = llm_1min._get_conversation_store()
+        assert isinstance(store, llm_1min.JSONConversationStore)
+        assert store.path == llm_1min._get_conversation_file()
+
+    def test_sqlite_lives_next_to_conversations_json(self, sqlite_backend):
+        store = llm_1min._get_conversation_store()
+        assert isinstance(store, llm_1min.SQLiteConversationStore)
+        assert store.path == sqlite_backend
+
+    def test_unknown_backend_warns_and_uses_json(self, monkeypatch, capsys):
+        monkeypatch.setenv("LLM_1MIN_MAPPING_BACKEND", "redis")
+        store = llm_1min._get_conversation_store()
+        assert isinstance(store, llm_1min.JSONConversationStore)
+        assert "Unknown LLM_1MIN_MAPPING_BACKEND" in capsys.readouterr().err
+
+
+class TestSQLiteStore:
+    def test_apply_upserts_and_deletes_rows(self, tmp_path):
+        store = llm_1min.SQLiteConversationStore(tmp_path / "m.sqlite")
+        store.apply({}, {"a": "u1", "b": "u1", "c": "u2"}, [])
+        store.apply({}, {"a": "u3"}, ["c"])
+
+        assert store.load() == {"a": "u3", "b": "u1"}
+        assert store.get("b") == "u1"
+        assert store.get("missing") is None
+        assert store.keys_for_uuid("u1") == ["b"]
+
+    def test_apply_replaces_a_key_in_one_call(self, tmp_path):
+        store = llm_1min.SQLiteConversationStore(tmp_path / "m.sqlite")
+        store.apply({}, {"old": "u1"}, [])
+        store.apply({}, {"new": "u2"}, ["old"])
+        assert store.load() == {"new": "u2"}
+
+    def test_uses_wal_and_records_schema_version(self, tmp_path):
+        path = tmp_path / "m.sqlite"
+        llm_1min.SQLiteConversationStore(path).load()
+        with sqlite3.connect(path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == (
+                llm_1min.SQLiteConversationStore.SCHEMA_VERSION
+            )
+        assert path.stat().st_mode & 0o777 == 0o600
+
+    def test_imports_legacy_json_once(self, tmp_path):
+        legacy = tmp_path / "conversations.json"
+        legacy.write_text(json.dumps({"1min/gpt-4o": "u1", "c1_1min/sonar": "u2"}))
+        path = tmp_path / "conversations.sqlite"
+
+        store = llm_1min.SQLiteConversationStore(path, legacy)
+        assert store.load() == {"1min/gpt-4o": "u1", "c1_1min/sonar": "u2"}
+        store.apply({}, {}, ["1min/gpt-4o"])
+
+        # A fresh process must not resurrect the deleted key from the old file
+        assert llm_1min.SQLiteConversationStore(path, legacy).load() == {"c1_1min/sonar": "u2"}
+
+    def test_keys_are_stored_split_and_indexed_by_conversation(self, tmp_path):
+        path = tmp_path / "m.sqlite"
+        store = llm_1min.SQLiteConversationStore(path)
+        store.apply({}, {"c1_1min/gpt-4o": "u1", "c1_1min/sonar": "u2", "c1": "u3"}, [])
+
+        assert store.keys_for_conversation("c1") == ["c1_1min/gpt-4o", "c1_1min/sonar"]
+        with sqlite3.connect(path) as conn:
+            row = conn.execute(
+                "SELECT conversation_id, model_id FROM mappings WHERE key = 'c1_1min/sonar'"
+            ).fetchone()
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT key FROM mappings WHERE conversation_id = 'c1'"
+            ).fetchall()
+        assert row == ("c1", "1min/sonar")
+        assert "mappings_conversation" in str(plan)
+
+    def test_version_1_database_is_upgraded_in_place(self, tmp_path):
+        path = tmp_path / "m.sqlite"
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE mappings (key TEXT PRIMARY KEY, uuid TEXT NOT NULL)")
+            conn.execute("INSERT INTO mappings VALUES ('c1_1min/gpt-4o', 'u1')")
+            conn.execute("PRAGMA user_version = 1")
+        conn.close()
+
+        store = llm_1min.SQLiteConversationStore(path)
+
+        assert store.load() == {"c1_1min/gpt-4o": "u1"}
+        assert store.keys_for_conversation("c1") == ["c1_1min/gpt-4o"]
+
+    def test_unreadable_database_warns_and_keeps_memory(self, tmp_path, capsys):
+        path = tmp_path / "m.sqlite"
+        path.write_bytes(b"not a database" * 100)
+        assert llm_1min.SQLiteConversationStore(path).load() is None
+        assert "Could not load conversation mapping" in capsys.readouterr().err
+
+
+class TestModelUsesStore:
+    @pytest.fixture
+    def session(self, http_session, monkeypatch):
+
+        def post(url, **kwargs):
+            if url.endswith("/api/conversations"):
+                body = {"conversation": {"uuid": "fresh-uuid"}}
+            else:
+                body = {"aiRecord": {"aiRecordDetail": {"resultObject": ["ok"]}}}
+            return Mock(status_code=200, json=Mock(return_value=body))
+
+        http_session.post.side_effect = post
+        http_session.delete.return_value = Mock(status_code=204)
+        monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+        return http_session
+
+    def test_new_conversation_is_upserted(self, sqlite_backend, session, mock_llm_prompt):
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+
+        assert _rows(sqlite_backend) == {"1min/gpt-4o": "fresh-uuid"}
+        assert not llm_1min._get_conversation_file().exists()
+
+    def test_model_only_key_migration_is_one_transaction(
+        self, sqlite_backend, session, mock_llm_prompt
+    ):
+        llm_1min._get_conversation_store().apply({}, {"1min/gpt-4o": "old-uuid"}, [])
+        conversation = Mock(id="c1", responses=[Mock()])
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        list(model.execute(mock_llm_prompt, False, Mock(), conversation))
+
+        assert _rows(sqlite_backend) == {"c1_1min/gpt-4o": "old-uuid"}
+
+    def test_clear_conversation_deletes_every_key_for_uuid(self, sqlite_backend, session):
+        llm_1min._conversation_mapping.update({"1min/gpt-4o": "u1", "c1_1min/gpt-4o": "u1"})
+        llm_1min._conversation_mapping["other"] = "u2"
+        llm_1min._persist_mapping(dict(llm_1min._conversation_mapping))
+        llm_1min.flush_conversations()
+
+        assert llm_1min.clear_conversation("1min/gpt-4o", "key") is True
+        assert _rows(sqlite_backend) == {"other": "u2"}
+
+    def test_prompts_use_indexed_lookups_not_a_full_load(
+        self, sqlite_backend, session, mock_llm_prompt, monkeypatch
+    ):
+        store = llm_1min._get_conversation_store()
+        store.apply({}, {"c1_1min/gpt-4o": "u1", "c2_1min/gpt-4o": "u2"}, [])
+        monkeypatch.setattr(
+            llm_1min.SQLiteConversationStore,
+            "load",
+            Mock(side_effect=AssertionError("full table scan")),
+        )
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        list(model.execute(mock_llm_prompt, False, Mock(), Mock(id="c1", responses=[Mock()])))
+        assert llm_1min.clear_conversation("1min/gpt-4o", "key", "u2") is True
+
+        assert (
+            session.post.call_args_list[0].kwargs["json"]["promptObject"]["conversationId"] == "u1"
+        )
+        assert _rows(sqlite_backend) == {"c1_1min/gpt-4o": "u1"}
+
+    def test_lookups_see_unflushed_changes(self, sqlite_backend):
+        llm_1min._get_conversation_store().apply({}, {"c1_1min/gpt-4o": "u1", "gone": "u2"}, [])
+        llm_1min._persist_mapping({"c2_1min/gpt-4o": "u1", "c1_1min/gpt-4o": "u3"}, ["gone"])
+
+        assert llm_1min._mapping_get("gone") is None
+        assert llm_1min._mapping_get("c1_1min/gpt-4o") == "u3"
+        assert llm_1min._mapping_keys_for_uuid("u1") == ["c2_1min/gpt-4o"]
+        assert sorted(llm_1min._mapping_keys_for_model("1min/gpt-4o")) == [
+            "c1_1min/gpt-4o",
+            "c2_1min/gpt-4o",
+        ]
+        assert llm_1min._mapping_keys_for_conversation("c2") == ["c2_1min/gpt-4o"]
+
+
+class TestChangeDetection:
+    @pytest.fixture
+    def parses(self, monkeypatch):
+        calls = []
+        original = llm_1min.json.load
+
+        def counting_load(f):
+            calls.append(f.name)
+            return original(f)
+
+        monkeypatch.setattr(llm_1min.json, "load", counting_load)
+        return calls
+
+    def test_unchanged_file_is_not_reparsed(self, parses):
+        llm_1min._get_conversation_file().write_text(json.dumps({"k": "u1"}))
+
+        for _ in range(3):
+            assert llm_1min.get_active_conversations() == {"k": "u1"}
+        assert len(parses) == 1
+
+    def test_own_write_is_not_reparsed(self, parses):
+        llm_1min._conversation_mapping["k"] = "u1"
+        llm_1min._persist_mapping({"k": "u1"})
+        llm_1min.flush_conversations()
+
+        assert llm_1min.get_active_conversations() == {"k": "u1"}
+        assert parses == []
+
+    def test_write_by_another_process_is_picked_up(self, parses):
+        conv_file = llm_1min._get_conversation_file()
+        conv_file.write_text(json.dumps({"k": "u1"}))
+        assert llm_1min.get_active_conversations() == {"k": "u1"}
+
+        other = llm_1min.JSONConversationStore(conv_file)
+        other.apply({}, {"k": "u2"}, [])  # journal appended
+
+        assert llm_1min.get_active_conversations() == {"k": "u2"}
+        assert len(parses) == 2  # once per change
+
+    def test_sqlite_write_by_another_connection_is_picked_up(self, sqlite_backend):
+        llm_1min._conversation_mapping["k"] = "u1"
+        llm_1min._persist_mapping({"k": "u1"})
+        llm_1min.flush_conversations()
+        assert llm_1min.get_active_conversations() == {"k": "u1"}
+
+        store = llm_1min._get_conversation_store()
+        assert store.load() is None  # unchanged since the last read
+
+        llm_1min.SQLiteConversationStore(sqlite_backend).apply({}, {"k2": "u2"}, [])
+
+        assert llm_1min.get_active_conversations() == {"k": "u1", "k2": "u2"}
+
+
+def _journal_writer(path, worker, count):
+    store = llm_1min.JSONConversationStore(path)
+    for i in range(count):
+        store.apply({}, {f"w{worker}-{i}": f"u{worker}-{i}"}, [])
+
+
+class TestJSONJournal:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "conversations.json"
+
+    def test_changes_are_appended_not_rewritten(self, path):
+        store = llm_1min.JSONConversationStore(path)
+        store.apply({}, {"a": "u1", "b": "u2"}, [])
+        store.apply({}, {"c": "u3"}, ["a"])
+
+        assert not path.exists()
+        assert len(store.journal_path.read_text().splitlines()) == 2
+        assert llm_1min.JSONConversationStore(path).load() == {"b": "u2", "c": "u3"}
+        assert store.journal_path.stat().st_mode & 0o777 == 0o600
+
+    def test_concurrent_writers_do_not_lose_updates(self, path):
+        first = llm_1min.JSONConversationStore(path)
+        second = llm_1min.JSONConversationStore(path)
+        first.apply({}, {"base": "u0"}, [])
+        assert second.load() == {"base": "u0"}
+
+        # Both processes hold the same view and each adds a different key
+        first.apply({}, {"from-first": "u1"}, [])
+        second.apply({}, {"from-second": "u2"}, [])
+
+        expected = {"base": "u0", "from-first": "u1", "from-second": "u2"}
+        assert llm_1min.JSONConversationStore(path).load() == expected
+        assert first.load() == expected  # first must notice second's write
+
+    def test_journal_is_compacted_into_snapshot(self, path, monkeypatch):
+        monkeypatch.setattr(llm_1min, "MAPPING_JOURNAL_MAX_BYTES", 100)
+        store = llm_1min.JSONConversationStore(path)
+        for i in range(10):
+            store.apply({}, {f"key-{i}": f"uuid-{i}"}, [])
+
+        assert store.journal_path.stat().st_size <= 100
+        assert len(json.loads(path.read_text())) >= 3
+        assert llm_1min.JSONConversationStore(path).load() == {
+            f"key-{i}": f"uuid-{i}" for i in range(10)
+        }
+
+    def test_replaying_a_compacted_journal_is_harmless(self, path):
+        store = llm_1min.JSONConversationStore(path)
+        store.apply({}, {"a": "u1"}, [])
+        store.apply({}, {}, ["a"])
+        store.apply({}, {"a": "u2"}, [])
+        journal = store.journal_path.read_text()
+        path.write_text(json.dumps({"a": "u2"}))  # crash after snapshot, before truncate
+
+        assert store.journal_path.read_text() == journal
+        assert llm_1min.JSONConversationStore(path).load() == {"a": "u2"}
+
+    def test_torn_last_line_is_skipped(self, path, capsys):
+        store = llm_1min.JSONConversationStore(path)
+        store.apply({}, {"a": "u1"}, [])
+        with open(store.journal_path, "a") as f:
+            f.write('{"set": {"b": ')
+
+        assert llm_1min.JSONConversationStore(path).load() == {"a": "u1"}
+        assert "Skipping unreadable entry" in capsys.readouterr().err
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork()"
+    )
+    def test_parallel_processes_keep_every_entry(self, path, monkeypatch):
+        monkeypatch.setattr(llm_1min, "MAPPING_JOURNAL_MAX_BYTES", 512)
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_journal_writer, args=(path, w, 40)) for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+            assert worker.exitcode == 0
+
+        loaded = llm_1min.JSONConversationStore(path).load()
+        assert loaded == {f"w{w}-{i}": f"u{w}-{i}" for w in range(4) for i in range(40)}
+
+
+class TestWriteBehind:
+    @pytest.fixture
+    def applied(self, monkeypatch):
+        calls = []
+        store = llm_1min._get_conversation_store()
+        original = store.apply
+
+        def recording_apply(mapping, upserts, deletes):
+            calls.append((dict(upserts), list(deletes)))
+            original(mapping, upserts, deletes)
+
+        monkeypatch.setattr(store, "apply", recording_apply)
+        return calls
+
+    def test_changes_are_coalesced_until_flush(self, applied):
+        llm_1min._persist_mapping({"1min/gpt-4o": "u1"})
+        llm_1min._persist_mapping({"c1_1min/gpt-4o": "u1"}, ["1min/gpt-4o"])
+        llm_1min._persist_mapping({"gone": "u2"})
+        llm_1min._persist_mapping(deletes=["gone"])
+        assert applied == []
+
+        llm_1min.flush_conversations()
+        llm_1min.flush_conversations()  # nothing left to write
+
+        assert applied == [({"c1_1min/gpt-4o": "u1"}, ["1min/gpt-4o", "gone"])]
+
+    def test_immediate_durability_writes_every_change(self, applied, monkeypatch):
+        monkeypatch.setenv("LLM_1MIN_MAPPING_DURABILITY", "immediate")
+        llm_1min._persist_mapping({"a": "u1"})
+        llm_1min._persist_mapping({"b": "u2"})
+        assert applied == [({"a": "u1"}, []), ({"b": "u2"}, [])]
+
+    def test_unknown_durability_warns_and_batches(self, applied, monkeypatch, capsys):
+        monkeypatch.setenv("LLM_1MIN_MAPPING_DURABILITY", "sometimes")
+        llm_1min._persist_mapping({"a": "u1"})
+        assert applied == []
+        assert "Unknown LLM_1MIN_MAPPING_DURABILITY" in capsys.readouterr().err
+
+    def test_execute_flushes_once_at_the_end(
+        self, applied, mock_llm_prompt, http_session, monkeypatch
+    ):
+        http_session.post.side_effect = lambda url, **kw: Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "conversation": {"uuid": "new-uuid"},
+                    "aiRecord": {"aiRecordDetail": {"resultObject": ["ok"]}},
+                }
+            ),
+        )
+        monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        response = Mock(response_json=None)
+
+        list(model.execute(mock_llm_prompt, False, response, None))
+
+        assert applied == [({"1min/gpt-4o": "new-uuid"}, [])]
+        assert "persist" in response.response_json["timings"]["phases_ms"]
+
+    def test_reload_keeps_unflushed_changes(self):
+        llm_1min._conversation_mapping["mine"] = "u1"
+        llm_1min._persist_mapping({"mine": "u1"})
+        llm_1min.JSONConversationStore(llm_1min._get_conversation_file()).apply(
+            {}, {"theirs": "u2"}, []
+        )
+
+        assert llm_1min.get_active_conversations() == {"mine": "u1", "theirs": "u2"}
+
+    def test_pending_changes_are_flushed_at_exit(self, tmp_path):
+        conv_file = tmp_path / "conversations.json"
+        script = (
+            "import pathlib, llm_1min\n"
+            f"llm_1min._conversation_file = pathlib.Path({str(conv_file)!r})\n"
+            "llm_1min._conversation_mapping['k'] = 'u1'\n"
+            "llm_1min._persist_mapping({'k': 'u1'})\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parent.parent,
+            check=True,
+            timeout=60,
+        )
+
+        assert llm_1min.JSONConversationStore(conv_file).load() == {"k": "u1"}
@@ -0,0 +1,238 @@
+"""Tests for the cached dynamic model catalog."""
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+SERVER_MODELS = {
+    "models": [
+        {"id": "gpt-4o", "name": "GPT-4o (server name)", "provider": "OpenAI"},
+        {"id": "sonar", "name": "Sonar"},
+        {"id": "brand-new-model", "name": "Brand New", "provider": "NewCo"},
+    ]
+}
+
+
+def _response(status=200, body=None, headers=None):
+    return Mock(
+        status_code=status,
+        headers=headers or {},
+        json=Mock(return_value=body),
+        raise_for_status=Mock(),
+    )
+
+
+@pytest.fixture
+def session(http_session):
+    http_session.get.return_value = _response(
+        body=SERVER_MODELS, headers={"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026"}
+    )
+    return http_session
+
+
+@pytest.fixture
+def catalog():
+    return llm_1min.ModelCatalog()
+
+
+class TestParse:
+    @pytest.mark.parametrize(
+        "body",
+        [
+            ["gpt-4o"],
+            {"data": [{"modelId": "gpt-4o"}]},
+            {"models": [{"model": "gpt-4o", "displayName": None}, 42, {"name": "no id"}]},
+        ],
+    )
+    def test_accepts_common_shapes(self, body):
+        assert llm_1min.ModelCatalog.parse(body) == [{"id": "gpt-4o"}]
+
+    def test_keeps_name_and_provider(self):
+        entries = llm_1min.ModelCatalog.parse([{"id": "x", "name": "X", "ownedBy": "Acme"}])
+        assert entries == [{"id": "x", "name": "X", "provider": "Acme"}]
+
+
+class TestModels:
+    def test_builtin_table_without_cache(self, catalog):
+        assert catalog.models() == llm_1min.builtin_model_catalog()
+
+    def test_corrupt_cache_falls_back_to_builtin(self, catalog):
+        catalog.path.write_text("{torn")
+        assert catalog.models() == llm_1min.builtin_model_catalog()
+
+    def test_server_list_replaces_builtin(self, catalog, session):
+        catalog.refresh("key")
+
+        models = catalog.models()
+
+        assert [info.model_id for info in models] == [
+            "1min/gpt-4o",
+            "1min/sonar",
+            "1min/brand-new-model",
+        ]
+        # Known API ids keep their built-in descriptors (and tags)
+        assert models[0].display_name == "GPT-4o"
+        assert models[1].tags == ["web"]
+        assert models[2] == llm_1min.ModelInfo(
+            "1min/brand-new-model", "brand-new-model", "Brand New", "NewCo"
+        )
+
+    def test_underscore_ids_get_dash_llm_ids(self, catalog, session):
+        session.get.return_value = _response(
+            body=["brand_new_model", "gpt-4o", "other_model", "brand-new-model"]
+        )
+        catalog.refresh("key")
+
+        ids = [(info.model_id, info.api_model_id) for info in catalog.models()]
+
+        assert ids == [
+            ("1min/gpt-4o", "gpt-4o"),
+            ("1min/brand-new-model", "brand-new-model"),
+            ("1min/other-model", "other_model"),
+        ]
+        for model_id, _api_id in ids:
+            assert llm_1min.split_mapping_key(f"c1_{model_id}") == ("c1", model_id)
+
+    def test_registration_uses_cached_catalog(self, catalog, session):
+        catalog.refresh("key")
+        captured = []
+
+        llm_1min.register_models(lambda model, async_model=None: captured.append(model))
+
+        assert [m.api_model_id for m in captured] == ["gpt-4o", "sonar", "brand-new-model"]
+
+
+class TestRefresh:
+    def test_stores_validators_and_revalidates(self, catalog, session):
+        assert catalog.refresh("key") == (True, 3)
+        session.get.return_value = _response(status=304)
+
+        assert catalog.refresh("key") == (False, 3)
+
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Mon, 05 Oct 2026"
+        assert len(catalog.models()) == 3
+
+    def test_not_modified_resets_ttl(self, catalog, session):
+        catalog.refresh("key")
+        state = json.loads(catalog.path.read_text())
+        state["fetched"] = 0
+        catalog.path.write_text(json.dumps(state))
+        assert catalog.is_stale()
+        session.get.return_value = _response(status=304)
+
+        catalog.refresh("key")
+
+        assert not catalog.is_stale()
+
+    def test_empty_listing_keeps_previous_cache(self, catalog, session):
+        catalog.refresh("key")
+        session.get.return_value = _response(body={"models": []})
+
+        with pytest.raises(ValueError):
+            catalog.refresh("key")
+
+        assert len(catalog.models()) == 3
+
+
+class TestBackgroundRefresh:
+    def test_fresh_or_missing_cache_starts_nothing(self, catalog, session):
+        assert catalog.refresh_in_background() is None
+        catalog.refresh("key")
+        assert catalog.refresh_in_background() is None
+
+    def _make_stale(self, catalog):
+        catalog.refresh("key")
+        catalog.path.write_text(json.dumps({**json.loads(catalog.path.read_text()), "fetched": 0}))
+
+    def test_registration_never_refreshes(self, catalog, session):
+        self._make_stale(catalog)
+        session.get.reset_mock()
+
+        llm_1min.register_models(lambda model, async_model=None: None)
+
+        session.get.assert_not_called()
+
+    def test_first_prompt_refreshes_stale_cache_without_blocking(
+        self, catalog, session, monkeypatch
+    ):
+        self._make_stale(catalog)
+        release = threading.Event()
+
+        def slow_get(url, **kwargs):
+            release.wait(5)
+            return _response(body=["gpt-4o"])
+
+        session.get.side_effect = slow_get
+
+        start = time.perf_counter()
+        llm_1min._refresh_stale_catalog("key")
+        llm_1min._refresh_stale_catalog("key")  # once per process
+        assert time.perf_counter() - start < 1
+
+        release.set()
+        deadline = time.time() + 5
+        while len(catalog.models()) != 1 and time.time() < deadline:
+            time.sleep(0.01)
+        assert [info.api_model_id for info in catalog.models()] == ["gpt-4o"]
+        assert session.get.call_count == 2  # the setup fetch and one revalidation
+
+    def test_execute_starts_the_refresh(self, session, mock_llm_prompt, monkeypatch):
+        started = []
+        monkeypatch.setattr(llm_1min, "_refresh_stale_catalog", started.append)
+        session.post.return_value = Mock(
+            status_code=200,
+            json=Mock(
+                return_value={
+                    "conversation": {"uuid": "u1"},
+                    "aiRecord": {"aiRecordDetail": {"resultObject": ["ok"]}},
+                }
+            ),
+        )
+        monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o")
+
+        assert list(model.execute(mock_llm_prompt, False, Mock(), None)) == ["ok"]
+        assert started == ["key"]
+
+
+def test_reading_the_catalog_creates_no_directories(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(llm_1min, "_conversation_file", None)
+
+    llm_1min.register_models(lambda model, async_model=None: None)
+
+    assert not (tmp_path / "home").exists()
+
+
+class TestModelsCommand:
+    def test_refresh_then_list(self, session, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "models", "--refresh"])
+
+        assert result.exit_code == 0, result.output
+        assert "Fetched 3 model(s)" in result.output
+        assert "(3 total)" in result.output
+        assert "NewCo:" in result.output
+
+    def test_builtin_flag_ignores_cache(self, session, cli_runner, onemin_cli):
+        llm_1min.ModelCatalog().refresh("key")
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "models", "--builtin"])
+
+        assert f"({len(llm_1min.MODEL_CATALOG)} total)" in result.output
+
+    def test_refresh_error_is_reported(self, session, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        session.get.return_value = _response(body={})
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "models", "--refresh"])
+
+        assert "could not refresh the model catalog" in result.output
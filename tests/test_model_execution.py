@@ -108,7 +108,7 @@ class TestOneMinModelExecution:
         mock_get_key.return_value = "test-api-key"
         mock_llm_prompt.options.conversation_type = "CODE_GENERATOR"
 
-        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model = llm_1min.OneMinModel("1min/gpt-5.1-codex", "gpt-5.1-codex", "GPT-5.1 Codex")
 
         # Capture the API call
         with patch("requests.post") as mock_post:
@@ -36,7 +36,7 @@ class TestOptionsConfigLoadSave:
         # Verify content
         with open(mock_config_path) as f:
             loaded = json.load(f)
-        assert loaded == sample_config
+        assert loaded == {"version": 1, **sample_config}
 
     def test_load_existing_file_returns_content(self, mock_config_path, sample_config):
         """Test loading existing config file."""
@@ -315,3 +315,164 @@ class TestNewOptionsRoundTrip:
         config = llm_1min.OptionsConfig()
         config.set_option("brand_voice_id", "voice-abc")
         assert config.get_defaults()["brand_voice_id"] == "voice-abc"
+
+
+class TestOptionsSnapshot:
+    """Test the memoized, stat-validated config snapshot."""
+
+    def _count_loads(self, monkeypatch):
+        calls = []
+        original = llm_1min.OptionsConfig.load
+
+        def counting_load(self):
+            calls.append(1)
+            return original(self)
+
+        monkeypatch.setattr(llm_1min.OptionsConfig, "load", counting_load)
+        return calls
+
+    def test_repeated_reads_parse_config_once(self, mock_config_path, monkeypatch):
+        config = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+        loads = self._count_loads(monkeypatch)
+
+        for _ in range(3):
+            config.get_defaults()
+            config.get_model_options("gpt-4o")
+            config.resolved_options("gpt-4o")
+
+        assert len(loads) == 1
+
+    def test_resolved_options_priority(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("num_of_site", 5)
+        config.set_option("web_search", False, model_id="sonar")
+
+        resolved = config.resolved_options("sonar")
+
+        assert resolved["web_search"] is False  # model beats builtin True
+        assert resolved["num_of_site"] == 5
+        assert config.resolved_options("sonar") is resolved
+
+    def test_external_write_invalidates_snapshot(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("max_word", 500)
+        assert config.resolved_options("gpt-4o")["max_word"] == 500
+
+        mock_config_path.write_text(json.dumps({"defaults": {"max_word": 2000}, "models": {}}))
+
+        assert config.resolved_options("gpt-4o")["max_word"] == 2000
+
+    def test_returned_options_do_not_alias_snapshot(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+
+        config.get_defaults()["web_search"] = False
+
+        assert config.get_defaults() == {"web_search": True}
+
+    def test_legacy_keys_still_rejected_on_every_read(self, mock_config_path):
+        mock_config_path.write_text(json.dumps({"defaults": {"is_mixed": True}}))
+        config = llm_1min.OptionsConfig()
+
+        for _ in range(2):
+            try:
+                config.resolved_options("gpt-4o")
+            except ValueError as e:
+                assert "is_mixed" in str(e)
+            else:
+                raise AssertionError("legacy key accepted")
+
+    def test_execute_resolves_without_reparsing(self, mock_config_path, monkeypatch):
+        llm_1min._options_config.set_option("web_search", True)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        prompt = type("Prompt", (), {})()
+        prompt.options = model.Options()
+        model._resolve_options(prompt)
+        loads = self._count_loads(monkeypatch)
+
+        merged, _debug = model._resolve_options(prompt)
+
+        assert merged["web_search"] is True
+        assert loads == []
+
+
+class TestAtomicVersionedWrites:
+    """Test atomic replacement and compare-and-swap versioning of config.json."""
+
+    def test_save_bumps_version_and_load_hides_it(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+        config.set_option("num_of_site", 5)
+
+        assert json.loads(mock_config_path.read_text())["version"] == 2
+        assert "version" not in config.load()
+        assert config.get_defaults() == {"web_search": True, "num_of_site": 5}
+
+    def test_save_replaces_file_instead_of_truncating(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+        before = mock_config_path.stat().st_ino
+
+        config.set_option("web_search", False)
+
+        assert mock_config_path.stat().st_ino != before
+        assert list(mock_config_path.parent.glob("*.tmp")) == []
+
+    def test_stale_expected_version_is_rejected(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+
+        try:
+            config.save({"defaults": {}}, expected_version=0)
+            raise AssertionError("expected ConfigConflictError")
+        except llm_1min.ConfigConflictError:
+            pass
+        assert config.get_defaults() == {"web_search": True}
+
+    def test_update_retries_after_concurrent_write(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+        other = llm_1min.OptionsConfig()
+        config.set_option("web_search", True)
+        attempts = []
+
+        def mutate(data):
+            attempts.append(1)
+            if len(attempts) == 1:
+                other.set_option("num_of_site", 7)  # lands between read and write
+            data["defaults"]["max_word"] = 500
+            return True
+
+        assert config.update(mutate) is True
+        assert len(attempts) == 2
+        assert config.get_defaults() == {"web_search": True, "num_of_site": 7, "max_word": 500}
+
+    def test_update_without_changes_does_not_write(self, mock_config_path):
+        config = llm_1min.OptionsConfig()
+
+        assert config.unset_option("web_search") is False
+        assert not mock_config_path.exists()
+
+    def test_concurrent_set_option_keeps_every_update(self, mock_config_path):
+        import threading
+
+        barrier = threading.Barrier(8, timeout=5)
+
+        def worker(i):
+            barrier.wait()
+            llm_1min.OptionsConfig().set_option(f"opt{i}", i)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        defaults = llm_1min.OptionsConfig().get_defaults()
+        assert defaults == {f"opt{i}": i for i in range(8)}
+
+    def test_unreadable_config_warns(self, mock_config_path, capsys):
+        mock_config_path.write_text("{half")
+
+        assert llm_1min.OptionsConfig().load() == {"defaults": {}, "models": {}}
+        assert "Ignoring unreadable config" in capsys.readouterr().err
@@ -0,0 +1,136 @@
+"""Tests for the cross-process token-bucket rate limiter."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / "ratelimit.json"
+
+
+class TestRateLimiter:
+    def test_disabled_unless_rate_is_set(self):
+        assert llm_1min.RateLimiter.from_options({}) is None
+        limiter = llm_1min.RateLimiter.from_options({"rate_limit_rps": 2, "rate_limit_burst": 4})
+        assert (limiter.rate, limiter.burst) == (2.0, 4)
+
+    def test_default_state_file_sits_next_to_mapping(self):
+        limiter = llm_1min.RateLimiter(1)
+        assert limiter.state_file.parent == llm_1min._get_conversation_file().parent
+
+    def test_burst_is_free_then_requests_queue(self, clock, state_file):
+        limiter = llm_1min.RateLimiter(rate=2, burst=3, state_file=state_file)
+
+        waits = [limiter.reserve("key") for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.5)
+        assert waits[4] == pytest.approx(1.0)
+
+    def test_bucket_refills_over_time(self, clock, state_file):
+        limiter = llm_1min.RateLimiter(rate=1, burst=1, state_file=state_file)
+        assert limiter.reserve("key") == 0.0
+        assert limiter.reserve("key") == pytest.approx(1.0)
+
+        clock[0] += 10
+
+        assert limiter.reserve("key") == 0.0
+
+    def test_instances_share_state_through_file(self, clock, state_file):
+        first = llm_1min.RateLimiter(rate=1, burst=1, state_file=state_file)
+        second = llm_1min.RateLimiter(rate=1, burst=1, state_file=state_file)
+
+        assert first.reserve("key") == 0.0
+        assert second.reserve("key") == pytest.approx(1.0)
+
+    def test_buckets_are_per_api_key_and_key_is_hashed(self, clock, state_file):
+        limiter = llm_1min.RateLimiter(rate=1, burst=1, state_file=state_file)
+
+        assert limiter.reserve("key-a") == 0.0
+        assert limiter.reserve("key-b") == 0.0
+        stored = state_file.read_text()
+        assert "key-a" not in stored
+        assert len(json.loads(stored)) == 2
+
+    def test_corrupt_state_file_is_reset(self, clock, state_file):
+        state_file.write_text("{not json")
+        limiter = llm_1min.RateLimiter(rate=1, burst=1, state_file=state_file)
+
+        assert limiter.reserve("key") == 0.0
+
+    def test_acquire_sleeps_for_reserved_slot(self, clock, state_file, monkeypatch):
+        slept = []
+        monkeypatch.setattr(llm_1min.time, "sleep", slept.append)
+        limiter = llm_1min.RateLimiter(rate=4, burst=1, state_file=state_file)
+
+        limiter.acquire("key")
+        limiter.acquire("key")
+
+        assert slept == [pytest.approx(0.25)]
+
+    def test_reservations_from_parallel_processes_are_not_lost(self, state_file):
+        script = (
+            "import sys, time; sys.path.insert(0, sys.argv[1]);"
+            "from pathlib import Path; import llm_1min;"
+            "time.time = lambda: 1_000_000.0;"
+            "limiter = llm_1min.RateLimiter(10, 1, state_file=Path(sys.argv[2]));"
+            "print(max(limiter.reserve('key') for _ in range(5)))"
+        )
+        root = str(Path(llm_1min.__file__).parent)
+        procs = [
+            subprocess.Popen(
+                [sys.executable, "-c", script, root, str(state_file)],
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(4)
+        ]
+        waits = [float(p.communicate(timeout=60)[0]) for p in procs]
+
+        # 20 reservations at 10/s with burst 1: the last one waits 1.9s.
+        assert max(waits) == pytest.approx(1.9)
+
+
+class TestRateLimitedRequests:
+    def test_execute_acquires_for_every_outbound_call(
+        self, monkeypatch, http_session, mock_llm_prompt
+    ):
+        acquired = []
+        monkeypatch.setattr(llm_1min.RateLimiter, "acquire", lambda self, key: acquired.append(key))
+        conv = Mock(status_code=200)
+        conv.json.return_value = {"conversation": {"uuid": "conv-1"}}
+        chat = Mock(status_code=200)
+        chat.json.return_value = {"aiRecord": {"aiRecordDetail": {"resultObject": ["ok"]}}}
+        http_session.post.side_effect = [conv, chat]
+        mock_llm_prompt.options.rate_limit_rps = 5
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "secret"
+
+        assert list(model.execute(mock_llm_prompt, False, Mock(), None)) == ["ok"]
+        assert acquired == ["secret", "secret"]
+
+    def test_deletes_use_saved_rate_limit(self, monkeypatch, http_session):
+        acquired = []
+        monkeypatch.setattr(llm_1min.RateLimiter, "acquire", lambda self, key: acquired.append(key))
+        http_session.delete.return_value = Mock(status_code=204)
+        llm_1min._options_config.set_option("rate_limit_rps", 2)
+        llm_1min._conversation_mapping["m1"] = "u1"
+        llm_1min._conversation_mapping["m2"] = "u2"
+
+        assert llm_1min.clear_all_conversations("secret") == 2
+        assert acquired == ["secret", "secret"]
+
+    @pytest.mark.parametrize(
+        "field,value", [("rate_limit_rps", 0), ("rate_limit_rps", -1), ("rate_limit_burst", 0)]
+    )
+    def test_option_validation(self, field, value):
+        with pytest.raises(ValueError):
+            llm_1min.OneMinModel.Options(**{field: value})
@@ -6,7 +6,7 @@ import llm_1min
 def test_register_models_populates_expected_catalog():
     """Model registration should expose the published 1min model IDs."""
     captured = []
-    llm_1min.register_models(lambda model: captured.append(model))
+    llm_1min.register_models(lambda model, async_model=None: captured.append(model))
 
     ids = [m.model_id for m in captured]
     assert len(ids) >= 75
@@ -18,7 +18,7 @@ def test_register_models_populates_expected_catalog():
 def test_register_models_model_objects_have_expected_attributes():
     """Registered models should carry both CLI model IDs and API model IDs."""
     captured = []
-    llm_1min.register_models(lambda model: captured.append(model))
+    llm_1min.register_models(lambda model, async_model=None: captured.append(model))
 
     for model in captured:
         assert model.model_id.startswith("1min/")
@@ -26,3 +26,57 @@ def test_register_models_model_objects_have_expected_attributes():
         assert len(model.api_model_id) > 0
         assert isinstance(model.display_name, str)
         assert len(model.display_name) > 0
+
+
+def test_register_models_pairs_each_model_with_async_variant():
+    """Every sync model should be registered alongside a matching async model."""
+    pairs = []
+    llm_1min.register_models(lambda model, async_model=None: pairs.append((model, async_model)))
+
+    for model, async_model in pairs:
+        assert isinstance(async_model, llm_1min.AsyncOneMinModel)
+        assert async_model.model_id == model.model_id
+        assert async_model.api_model_id == model.api_model_id
+
+
+def test_catalog_ids_are_unique():
+    """Every catalog row should have a distinct LLM model ID."""
+    ids = [info.model_id for info in llm_1min.model_catalog()]
+    assert len(ids) == len(set(ids))
+
+
+def test_register_models_follows_catalog_order():
+    """Registration is generated from the catalog table, row for row."""
+    captured = []
+    llm_1min.register_models(lambda model, async_model=None: captured.append(model))
+
+    assert [(m.model_id, m.api_model_id, m.display_name) for m in captured] == [
+        (info.model_id, info.api_model_id, info.display_name) for info in llm_1min.model_catalog()
+    ]
+
+
+def test_catalog_tags_come_from_model_defaults():
+    """Capability tags are derived from MODEL_DEFAULTS."""
+    by_id = {info.model_id: info for info in llm_1min.model_catalog()}
+
+    assert by_id["1min/qwen3-coder-plus"].tags == ["code"]
+    assert by_id["1min/sonar"].tags == ["web"]
+    assert by_id["1min/sonar"].defaults["num_of_site"] == 5
+    assert by_id["1min/gpt-4o"].tags == []
+    assert by_id["1min/claude-4-5-haiku"].provider == "Anthropic"
+
+
+def test_models_command_lists_without_constructing_models(cli_runner, onemin_cli, monkeypatch):
+    """`llm 1min models` reads descriptors only, grouped by provider."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("model constructed")
+
+    monkeypatch.setattr(llm_1min.OneMinModel, "__init__", fail)
+
+    result = cli_runner.invoke(onemin_cli, ["1min", "models"])
+
+    assert result.exit_code == 0, result.output
+    assert f"({len(llm_1min.MODEL_CATALOG)} total)" in result.output
+    assert "Perplexity:" in result.output
+    assert "1min/sonar  [web]" in result.output
@@ -0,0 +1,242 @@
+"""Tests for the local SQLite response cache."""
+
+import asyncio
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+CHAT_URL = "https://api.1min.ai/api/chat-with-ai"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return llm_1min.ResponseCache(path=tmp_path / "responses.sqlite")
+
+
+@pytest.fixture
+def api(http_session, monkeypatch):
+    """Fake session: conversation create + non-streaming chat replies."""
+
+    def post(url, **kwargs):
+        if url.endswith("/api/conversations"):
+            body = {"conversation": {"uuid": "conv-1"}}
+        else:
+            body = {"aiRecord": {"aiRecordDetail": {"resultObject": ["fresh reply"]}}}
+        return Mock(status_code=200, json=Mock(return_value=body))
+
+    http_session.post.side_effect = post
+    monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+    return http_session
+
+
+def _chat_payload(prompt="hi", conversation_uuid="conv-1", **extra):
+    prompt_object = {"prompt": prompt, "conversationId": conversation_uuid, **extra}
+    return {"type": "UNIFY_CHAT_WITH_AI", "model": "gpt-4o", "promptObject": prompt_object}
+
+
+class TestCacheKey:
+    def test_ignores_conversation_and_streaming(self):
+        key = llm_1min.ResponseCache.key_for
+        assert key("gpt-4o", CHAT_URL, _chat_payload(conversation_uuid="a")) == key(
+            "gpt-4o", CHAT_URL + "?isStreaming=true", _chat_payload(conversation_uuid="b")
+        )
+
+    def test_distinguishes_model_prompt_and_settings(self):
+        key = llm_1min.ResponseCache.key_for
+        base = key("gpt-4o", CHAT_URL, _chat_payload())
+        assert base != key("gpt-4o-mini", CHAT_URL, _chat_payload())
+        assert base != key("gpt-4o", CHAT_URL, _chat_payload(prompt="other"))
+        assert base != key(
+            "gpt-4o", CHAT_URL, _chat_payload(settings={"webSearchSettings": {"webSearch": True}})
+        )
+        assert base != key("gpt-4o", CHAT_URL, {**_chat_payload(), "brandVoiceId": "bv"})
+
+    def test_does_not_mutate_payload(self):
+        payload = _chat_payload()
+        llm_1min.ResponseCache.key_for("gpt-4o", CHAT_URL, payload)
+        assert payload["promptObject"]["conversationId"] == "conv-1"
+
+
+class TestResponseCache:
+    def test_disabled_unless_enabled(self):
+        assert llm_1min.ResponseCache.from_options({}) is None
+        assert llm_1min.ResponseCache.from_options({"cache": "off"}) is None
+        cache = llm_1min.ResponseCache.from_options(
+            {"cache": "refresh", "cache_ttl": 60, "cache_max_entries": 5}
+        )
+        assert (cache.mode, cache.ttl, cache.max_entries) == ("refresh", 60.0, 5)
+        assert cache.path.parent == llm_1min._get_conversation_file().parent
+
+    def test_put_then_get_roundtrip(self, cache, clock):
+        assert cache.get("k") is None
+        cache.put("k", "gpt-4o", ["Hello ", "world"])
+        assert cache.get("k") == ["Hello ", "world"]
+        assert cache.stats() == {"entries": 1, "size": 11, "hits": 1, "misses": 1}
+
+    def test_entries_expire_after_ttl(self, tmp_path, clock):
+        cache = llm_1min.ResponseCache(ttl=60, path=tmp_path / "c.sqlite")
+        cache.put("k", "gpt-4o", ["x"])
+        clock[0] += 61
+        assert cache.get("k") is None
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path, clock):
+        cache = llm_1min.ResponseCache(max_entries=2, path=tmp_path / "c.sqlite")
+        cache.put("a", "m", ["a"])
+        clock[0] += 1
+        cache.put("b", "m", ["b"])
+        clock[0] += 1
+        assert cache.get("a") == ["a"]  # touch "a" so "b" is now least recent
+        clock[0] += 1
+        cache.put("c", "m", ["c"])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == ["a"]
+        assert cache.get("c") == ["c"]
+
+    def test_refresh_mode_skips_lookup_but_stores(self, tmp_path):
+        path = tmp_path / "c.sqlite"
+        llm_1min.ResponseCache(path=path).put("k", "m", ["old"])
+        refresh = llm_1min.ResponseCache(mode="refresh", path=path)
+
+        assert refresh.get("k") is None
+        refresh.put("k", "m", ["new"])
+        assert llm_1min.ResponseCache(path=path).get("k") == ["new"]
+
+    def test_clear_removes_entries_and_counters(self, cache):
+        cache.put("k", "m", ["x"])
+        cache.get("k")
+        assert cache.clear() == 1
+        assert cache.stats() == {"entries": 0, "size": 0, "hits": 0, "misses": 0}
+
+    def test_sqlite_errors_degrade_to_miss(self, cache, monkeypatch, capsys):
+        def broken(*args, **kwargs):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(llm_1min.sqlite3, "connect", broken)
+
+        assert cache.get("k") is None
+        cache.put("k", "m", ["x"])
+        assert "disk I/O error" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "field,value", [("cache", "maybe"), ("cache_ttl", 0), ("cache_max_entries", 0)]
+    )
+    def test_option_validation(self, field, value):
+        with pytest.raises(ValueError):
+            llm_1min.OneMinModel.Options(**{field: value})
+
+
+class TestExecuteUsesCache:
+    def test_repeat_prompt_is_served_locally(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.cache = "on"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        first = list(model.execute(mock_llm_prompt, False, Mock(), None))
+        calls = api.post.call_count
+        second = list(model.execute(mock_llm_prompt, False, Mock(), None))
+
+        assert first == second == ["fresh reply"]
+        assert api.post.call_count == calls  # no conversation create, no chat call
+
+    def test_hit_replays_chunks_through_streaming_path(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.cache = "on"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        url, payload = model._build_chat_request(mock_llm_prompt, None, {}, False)
+        llm_1min.ResponseCache().put(
+            llm_1min.ResponseCache.key_for("gpt-4o", url, payload), "gpt-4o", ["Hel", "lo"]
+        )
+
+        assert list(model.execute(mock_llm_prompt, True, Mock(), None)) == ["Hel", "lo"]
+        assert list(model.execute(mock_llm_prompt, False, Mock(), None)) == ["Hello"]
+        api.post.assert_not_called()
+
+    def test_continuable_conversation_is_not_served_but_stores(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.cache = "on"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        url, payload = model._build_chat_request(mock_llm_prompt, None, {}, False)
+        key = llm_1min.ResponseCache.key_for("gpt-4o", url, payload)
+        llm_1min.ResponseCache().put(key, "gpt-4o", ["stale"])
+
+        # A fresh `llm` CLI conversation: a later `llm -c` needs the server side
+        conversation = Mock(id="c1", responses=[])
+        chunks = list(model.execute(mock_llm_prompt, False, Mock(), conversation))
+
+        assert chunks == ["fresh reply"]
+        assert llm_1min.get_active_conversations() == {"c1_1min/gpt-4o": "conv-1"}
+        assert llm_1min.ResponseCache().get(key) == ["fresh reply"]
+
+    def test_one_off_conversation_is_served(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.cache = "on"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+        api.post.reset_mock()
+
+        conversation = llm_1min._one_off_conversation(model)
+        try:
+            chunks = list(model.execute(mock_llm_prompt, False, Mock(), conversation))
+        finally:
+            llm_1min._one_off_conversations.discard(f"{conversation.id}")
+
+        assert chunks == ["fresh reply"]
+        api.post.assert_not_called()
+
+    def test_cache_off_by_default(self, api, mock_llm_prompt):
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+
+        assert not llm_1min.ResponseCache().path.exists()
+
+    def test_prompts_with_prior_turns_are_not_cached(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.cache = "on"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        conversation = Mock(id="c1", responses=[Mock()])
+
+        list(model.execute(mock_llm_prompt, False, Mock(), conversation))
+
+        assert llm_1min.ResponseCache().stats()["entries"] == 0
+
+    def test_saved_option_bypass_per_prompt(self, api, mock_llm_prompt):
+        llm_1min._options_config.set_option("cache", "on")
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+        calls = api.post.call_count
+
+        mock_llm_prompt.options.cache = "off"
+        list(model.execute(mock_llm_prompt, False, Mock(), None))
+
+        assert api.post.call_count > calls
+
+    def test_async_model_shares_cache(self, mock_llm_prompt, monkeypatch):
+        mock_llm_prompt.options.cache = "on"
+        monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "key")
+        sync_model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        url, payload = sync_model._build_chat_request(mock_llm_prompt, None, {}, False)
+        llm_1min.ResponseCache().put(
+            llm_1min.ResponseCache.key_for("gpt-4o", url, payload), "gpt-4o", ["cached"]
+        )
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        async def collect():
+            return [c async for c in model.execute(mock_llm_prompt, True, Mock(), None)]
+
+        assert asyncio.run(collect()) == ["cached"]
+
+
+class TestCacheCommands:
+    def test_stats_and_clear(self, cli_runner, onemin_cli):
+        cache = llm_1min.ResponseCache()
+        cache.put("k", "gpt-4o", ["hello"])
+        cache.get("k")
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "cache", "stats"])
+        assert result.exit_code == 0, result.output
+        assert "Entries: 1" in result.output
+        assert "Hit rate: 100.0%" in result.output
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "cache", "clear"])
+        assert "Removed 1 cached response(s)" in result.output
+        assert cache.stats()["entries"] == 0
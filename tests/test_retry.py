@@ -0,0 +1,369 @@
+"""Tests for the retry engine (backoff, jitter, Retry-After, idempotency)."""
+
+import asyncio
+import email.utils
+import http.client
+import time
+from unittest.mock import Mock
+
+import httpx
+import llm
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+import llm_1min
+
+
+def _refused():
+    """What requests raises when the connection could not be opened."""
+    reason = NewConnectionError(None, "Failed to establish a new connection: refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(None, "https://x", reason))
+
+
+def _reset_after_send():
+    """What requests raises when the server drops the connection after the request."""
+    cause = ProtocolError("Connection aborted.", http.client.RemoteDisconnected("closed"))
+    return requests.exceptions.ConnectionError(cause)
+
+
+def _response(status, retry_after=None, json_body=None):
+    response = Mock()
+    response.status_code = status
+    response.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    response.json.return_value = json_body or {}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            f"{status} error", response=response
+        )
+    return response
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Capture retry sleeps instead of waiting."""
+    recorded = []
+    monkeypatch.setattr(llm_1min.time, "sleep", recorded.append)
+    return recorded
+
+
+class TestRetryPolicy:
+    def test_defaults_come_from_retry_defaults(self):
+        policy = llm_1min.RetryPolicy()
+        assert policy.max_retries == llm_1min.RETRY_DEFAULTS["max_retries"]
+        assert policy.backoff_max == llm_1min.RETRY_DEFAULTS["retry_backoff_max"]
+
+    def test_from_options_reads_option_keys(self):
+        policy = llm_1min.RetryPolicy.from_options(
+            {"max_retries": 5, "retry_backoff_base": 0.5, "retry_backoff_max": 4}
+        )
+        assert (policy.max_retries, policy.backoff_base, policy.backoff_max) == (5, 0.5, 4.0)
+
+    def test_full_jitter_stays_within_capped_exponential_window(self):
+        policy = llm_1min.RetryPolicy(max_retries=5, backoff_base=1.0, backoff_max=5.0)
+        for attempt, ceiling in [(1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (5, 5.0)]:
+            for _ in range(50):
+                assert 0 <= policy.delay(attempt) <= ceiling
+
+    def test_retry_after_overrides_backoff_but_is_capped(self):
+        policy = llm_1min.RetryPolicy(backoff_base=1.0, backoff_max=10.0)
+        assert policy.delay(1, retry_after=3.0) == 3.0
+        assert policy.delay(1, retry_after=120.0) == 10.0
+
+    def test_parse_retry_after_seconds_and_http_date(self):
+        assert llm_1min.RetryPolicy.parse_retry_after(_response(429, "7")) == 7.0
+        future = email.utils.formatdate(time.time() + 30, usegmt=True)
+        parsed = llm_1min.RetryPolicy.parse_retry_after(_response(429, future))
+        assert 25 <= parsed <= 31
+
+    def test_parse_retry_after_ignores_missing_or_garbage(self):
+        assert llm_1min.RetryPolicy.parse_retry_after(_response(429)) is None
+        assert llm_1min.RetryPolicy.parse_retry_after(_response(429, "soon")) is None
+        assert llm_1min.RetryPolicy.parse_retry_after(Mock()) is None
+
+
+class TestSendWithRetry:
+    def test_retries_429_then_succeeds_using_retry_after(self, http_session, sleeps):
+        http_session.post.side_effect = [_response(429, "2"), _response(200)]
+        policy = llm_1min.RetryPolicy(max_retries=2)
+
+        response = llm_1min._send_with_retry("post", "https://x", policy)
+
+        assert response.status_code == 200
+        assert sleeps == [2.0]
+
+    def test_returns_last_response_when_retries_exhausted(self, http_session, sleeps):
+        http_session.post.return_value = _response(503)
+        policy = llm_1min.RetryPolicy(max_retries=3)
+
+        response = llm_1min._send_with_retry("post", "https://x", policy)
+
+        assert response.status_code == 503
+        assert http_session.post.call_count == 4
+        assert len(sleeps) == 3
+
+    def test_non_retryable_status_is_returned_immediately(self, http_session, sleeps):
+        http_session.post.return_value = _response(400)
+
+        llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+
+        assert http_session.post.call_count == 1
+        assert sleeps == []
+
+    @pytest.mark.parametrize("status", [500, 502, 504])
+    def test_server_error_not_replayed_for_post(self, http_session, sleeps, status):
+        http_session.post.return_value = _response(status)
+
+        response = llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+
+        assert response.status_code == status
+        assert http_session.post.call_count == 1
+
+    def test_server_error_with_retry_after_replayed_for_post(self, http_session, sleeps):
+        http_session.post.side_effect = [_response(502, "1"), _response(200)]
+
+        response = llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+
+        assert response.status_code == 200
+        assert sleeps == [1.0]
+
+    def test_server_error_replayed_for_idempotent_get(self, http_session, sleeps):
+        http_session.get.side_effect = [_response(500), _response(200)]
+
+        response = llm_1min._send_with_retry(
+            "get", "https://x", llm_1min.RetryPolicy(), idempotent=True
+        )
+
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(
+        "error", [_refused(), requests.exceptions.ConnectTimeout("connect timed out")]
+    )
+    def test_connect_failure_is_retried_for_post(self, http_session, sleeps, error):
+        http_session.post.side_effect = [error, _response(200)]
+
+        response = llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+
+        assert response.status_code == 200
+
+    def test_reset_after_send_not_replayed_for_post(self, http_session, sleeps):
+        http_session.post.side_effect = _reset_after_send()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+        assert http_session.post.call_count == 1
+
+    def test_reset_after_send_replayed_for_idempotent_delete(self, http_session, sleeps):
+        http_session.delete.side_effect = [_reset_after_send(), _response(204)]
+
+        response = llm_1min._send_with_retry(
+            "delete", "https://x", llm_1min.RetryPolicy(), idempotent=True
+        )
+
+        assert response.status_code == 204
+
+    def test_read_timeout_not_replayed_for_post(self, http_session, sleeps):
+        http_session.post.side_effect = requests.exceptions.ReadTimeout("slow")
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            llm_1min._send_with_retry("post", "https://x", llm_1min.RetryPolicy())
+        assert http_session.post.call_count == 1
+
+    def test_read_timeout_replayed_for_idempotent_delete(self, http_session, sleeps):
+        http_session.delete.side_effect = [requests.exceptions.ReadTimeout("slow"), _response(204)]
+
+        response = llm_1min._send_with_retry(
+            "delete", "https://x", llm_1min.RetryPolicy(), idempotent=True
+        )
+
+        assert response.status_code == 204
+
+
+class TestExecuteRetries:
+    def test_chat_recovers_from_transient_503(self, http_session, sleeps, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        ok = _response(200, json_body={"aiRecord": {"aiRecordDetail": {"resultObject": ["hi"]}}})
+        http_session.post.side_effect = [_response(503), ok]
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        chunks = list(model.execute(mock_llm_prompt, False, Mock(), None))
+
+        assert chunks == ["hi"]
+
+    def test_max_retries_zero_from_saved_options_disables_retry(
+        self, http_session, sleeps, mock_llm_prompt
+    ):
+        llm_1min._options_config.set_option("max_retries", 0)
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        http_session.post.return_value = _response(429)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        with pytest.raises(llm.ModelError, match="Rate limit exceeded"):
+            list(model.execute(mock_llm_prompt, False, Mock(), None))
+        assert http_session.post.call_count == 1
+
+    def test_cli_option_overrides_saved_max_retries(self, http_session, sleeps, mock_llm_prompt):
+        llm_1min._options_config.set_option("max_retries", 0)
+        mock_llm_prompt.options.max_retries = 1
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        http_session.post.return_value = _response(429)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        with pytest.raises(llm.ModelError):
+            list(model.execute(mock_llm_prompt, False, Mock(), None))
+        assert http_session.post.call_count == 2
+
+    def test_stream_dropped_before_content_is_not_replayed(
+        self, http_session, sleeps, mock_llm_prompt
+    ):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+
+        def stream_response(lines):
+            response = _response(200)
+            response.__enter__ = Mock(return_value=response)
+            response.__exit__ = Mock(return_value=False)
+            response.iter_content = Mock(return_value=lines)
+            return response
+
+        def broken():
+            raise requests.exceptions.ChunkedEncodingError("dropped")
+            yield  # pragma: no cover
+
+        http_session.post.side_effect = [
+            stream_response(broken()),
+            stream_response(iter([b'event: content\ndata: {"content": "ok"}\n\n'])),
+        ]
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        # The server already has the prompt; replaying it could answer twice
+        with pytest.raises(llm.ModelError, match="dropped"):
+            list(model.execute(mock_llm_prompt, True, Mock(), None))
+        assert http_session.post.call_count == 1
+
+    def test_stream_dropped_after_content_is_not_replayed(
+        self, http_session, sleeps, mock_llm_prompt
+    ):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+
+        def partial():
+            yield b'event: content\ndata: {"content": "partial"}\n\n'
+            raise requests.exceptions.ChunkedEncodingError("dropped")
+
+        response = _response(200)
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        response.iter_content = Mock(return_value=partial())
+        http_session.post.return_value = response
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        received = []
+        with pytest.raises(llm.ModelError):
+            for chunk in model.execute(mock_llm_prompt, True, Mock(), None):
+                received.append(chunk)
+        assert received == ["partial"]
+        assert http_session.post.call_count == 1
+
+    def test_delete_is_retried_on_502(self, http_session, sleeps):
+        llm_1min._conversation_mapping["model1"] = "uuid1"
+        http_session.delete.side_effect = [_response(502), _response(204)]
+
+        assert llm_1min.clear_all_conversations("key") == 1
+        assert llm_1min._conversation_mapping == {}
+
+
+class TestAsyncRetries:
+    def test_async_chat_retries_503(self, monkeypatch, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        statuses = iter([503, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            return httpx.Response(
+                200, json={"aiRecord": {"aiRecordDetail": {"resultObject": ["async ok"]}}}
+            )
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        async def run():
+            return [c async for c in model.execute(mock_llm_prompt, False, Mock(), None)]
+
+        assert asyncio.run(run()) == ["async ok"]
+
+    def test_async_post_not_replayed_on_500(self, monkeypatch, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500, json={})
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        async def run():
+            return [c async for c in model.execute(mock_llm_prompt, False, Mock(), None)]
+
+        with pytest.raises(llm.ModelError):
+            asyncio.run(run())
+        assert len(calls) == 1
+
+    def test_async_post_not_replayed_after_remote_disconnect(self, monkeypatch, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.RemoteProtocolError("Server disconnected", request=request)
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(llm_1min.asyncio, "sleep", Mock(side_effect=AssertionError("retry")))
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        async def run():
+            return [c async for c in model.execute(mock_llm_prompt, False, Mock(), None)]
+
+        with pytest.raises(llm.ModelError, match="Server disconnected"):
+            asyncio.run(run())
+        assert len(calls) == 1
+
+
+class TestRetryOptions:
+    @pytest.mark.parametrize("value", [-1, 11])
+    def test_max_retries_range(self, value):
+        with pytest.raises(ValueError):
+            llm_1min.OneMinModel.Options(max_retries=value)
+
+    def test_negative_backoff_rejected(self):
+        with pytest.raises(ValueError):
+            llm_1min.OneMinModel.Options(retry_backoff_base=-1)
+
+    def test_options_set_stores_float_backoff(self, cli_runner, onemin_cli):
+        result = cli_runner.invoke(
+            onemin_cli, ["1min", "options", "set", "retry_backoff_base", "0.5"]
+        )
+
+        assert result.exit_code == 0
+        assert llm_1min._options_config.get_defaults()["retry_backoff_base"] == 0.5
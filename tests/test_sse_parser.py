@@ -0,0 +1,123 @@
+"""Tests for the incremental byte-level SSE parser."""
+
+import asyncio
+from unittest.mock import Mock
+
+import llm
+import pytest
+
+import llm_1min
+from llm_1min import SSEParser
+
+
+def _parse(*chunks):
+    return list(SSEParser.iter_events(chunks))
+
+
+def _bytewise(body):
+    return _parse(*[body[i : i + 1] for i in range(len(body))])
+
+
+class TestSSEParser:
+    def test_basic_events(self):
+        body = b'event: content\ndata: {"content": "hi"}\n\nevent: done\ndata: {}\n\n'
+        assert _parse(body) == [
+            ("content", '{"content": "hi"}', ""),
+            ("done", "{}", ""),
+        ]
+
+    def test_multi_line_data_is_joined_with_newlines(self):
+        body = b'event: content\ndata: {"content":\ndata:  "hi"}\n\n'
+        events = _parse(body)
+        assert events == [("content", '{"content":\n "hi"}', "")]
+        assert llm_1min.OneMinModel._handle_sse_event(events[0]) == "hi"
+
+    @pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+    def test_all_line_endings(self, newline):
+        body = newline.join([b"event: content", b"data: a", b"", b"data: b", b"", b""])
+        assert _parse(body) == [("content", "a", ""), ("message", "b", "")]
+
+    @pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+    def test_any_chunking_gives_same_events(self, newline):
+        body = newline.join(
+            [b"id: 7", b"event: content", b"data: x\xc3\xa9", b"", b": ping", b"data: y", b"", b""]
+        )
+        assert _bytewise(body) == _parse(body)
+        assert _parse(body) == [("content", "xé", "7"), ("message", "y", "7")]
+
+    def test_crlf_split_across_chunks_is_one_line_break(self):
+        assert _parse(b"data: a\r", b"\n\r", b"\n") == [("message", "a", "")]
+
+    def test_comments_and_unknown_fields_are_ignored(self):
+        body = b": keep-alive\nfoo: bar\ndata\ndata:no-space\n\n"
+        assert _parse(body) == [("message", "\nno-space", "")]
+
+    def test_id_and_retry_fields(self):
+        parser = SSEParser()
+        parser.feed(b"id: abc\nretry: 1500\nretry: soon\nid: bad\x00id\ndata: x\n\n")
+        assert parser.last_event_id == "abc"
+        assert parser.retry == 1500
+
+    def test_event_without_data_is_not_dispatched(self):
+        assert _parse(b"event: done\n\n") == []
+
+    def test_leading_bom_is_stripped_even_when_split(self):
+        assert _parse(b"\xef\xbb", b"\xbfdata: a\n\n") == [("message", "a", "")]
+
+    def test_close_dispatches_unterminated_final_event(self):
+        assert _parse(b"event: content\ndata: tail") == [("content", "tail", "")]
+
+    def test_buffer_only_keeps_the_incomplete_line(self):
+        parser = SSEParser()
+        parser.feed(b"data: a\n\ndata: partial")
+        assert bytes(parser._buffer) == b"data: partial"
+
+    def test_async_iteration(self):
+        async def chunks():
+            yield b"data: a\n"
+            yield b"\ndata: b"
+
+        async def collect():
+            return [e async for e in SSEParser.aiter_events(chunks())]
+
+        assert asyncio.run(collect()) == [
+            ("message", "a", ""),
+            ("message", "b", ""),
+        ]
+
+
+class TestHandleSSEEvent:
+    handle = staticmethod(llm_1min.OneMinModel._handle_sse_event)
+
+    def test_done_and_result_events(self):
+        assert self.handle(("done", "", "")) is llm_1min._SSE_DONE
+        assert self.handle(("result", '{"aiRecord": {}}', "")) is None
+
+    def test_invalid_json_is_skipped(self):
+        assert self.handle(("content", "{not json", "")) is None
+
+    def test_error_event_raises(self):
+        with pytest.raises(llm.ModelError, match="boom"):
+            self.handle(("error", '{"error": "boom"}', ""))
+
+
+class TestStreamChatUsesParser:
+    def test_events_split_across_reads_and_lines(self, http_session, mock_llm_prompt):
+        body = (
+            b'event: content\r\ndata: {"content":\r\ndata: "Hel"}\r\n\r\n'
+            b": keep-alive\r\n\r\n"
+            b'event: content\r\ndata: {"content": "lo"}\r\n\r\n'
+            b"event: done\r\ndata: {}\r\n\r\n"
+        )
+        response = Mock(status_code=200)
+        response.__enter__ = Mock(return_value=response)
+        response.__exit__ = Mock(return_value=False)
+        response.iter_content = Mock(
+            return_value=iter([body[i : i + 3] for i in range(0, len(body), 3)])
+        )
+        http_session.post.return_value = response
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "conv-1"
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        model.get_key = lambda: "key"
+
+        assert list(model.execute(mock_llm_prompt, True, Mock(), None)) == ["Hel", "lo"]
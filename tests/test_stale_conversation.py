@@ -0,0 +1,205 @@
+"""Tests for automatic recovery from conversation UUIDs the server no longer knows."""
+
+import asyncio
+import io
+import json
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+import llm_1min
+
+OK_BODY = {"aiRecord": {"aiRecordDetail": {"resultObject": ["fresh reply"]}}}
+
+
+def _http_error_response(status, text=""):
+    response = Mock(status_code=status, text=text)
+    response.raise_for_status.side_effect = llm_1min.requests.exceptions.HTTPError(
+        f"{status} Client Error", response=response
+    )
+    response.__enter__ = Mock(return_value=response)
+    response.__exit__ = Mock(return_value=False)
+    return response
+
+
+class FakeAPI:
+    """Conversation create plus chat/feature endpoints that reject `dead` UUIDs."""
+
+    def __init__(self, dead=("dead",), status=404, text=""):
+        self.dead = set(dead)
+        self.status = status
+        self.text = text
+        self.created = 0
+        self.sent = []
+
+    def post(self, url, json=None, **kwargs):
+        if url.endswith("/api/conversations"):
+            self.created += 1
+            uuid = f"new{self.created}"
+            return Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": uuid}}))
+        uuid = json.get("conversationId") or json["promptObject"].get("conversationId")
+        self.sent.append(uuid)
+        if uuid in self.dead:
+            return _http_error_response(self.status, self.text)
+        if url.endswith("isStreaming=true"):
+            response = Mock(status_code=200)
+            response.iter_content = Mock(
+                return_value=iter([b'event: content\ndata: {"content": "fresh reply"}\n\n'])
+            )
+            response.__enter__ = Mock(return_value=response)
+            response.__exit__ = Mock(return_value=False)
+            return response
+        return Mock(status_code=200, json=Mock(return_value=OK_BODY), content=b"{}")
+
+
+@pytest.fixture
+def api(http_session, monkeypatch):
+    fake = FakeAPI()
+    http_session.post.side_effect = fake.post
+    monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+    return fake
+
+
+def _run(prompt, stream=True, model_id="gpt-4o"):
+    model = llm_1min.OneMinModel(f"1min/{model_id}", model_id)
+    return list(model.execute(prompt, stream, Mock(response_json=None), None))
+
+
+class TestRecovery:
+    @pytest.mark.parametrize("stream", [True, False])
+    def test_404_recreates_conversation_and_replays(self, api, mock_llm_prompt, stream):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        assert _run(mock_llm_prompt, stream) == ["fresh reply"]
+
+        assert api.sent == ["dead", "new1"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "new1"}
+
+    def test_every_key_of_the_dead_conversation_is_rewritten(self, api, mock_llm_prompt):
+        llm_1min._conversation_mapping.update(
+            {"1min/gpt-4o": "dead", "c1_1min/claude": "dead", "1min/other": "alive"}
+        )
+        llm_1min._persist_mapping(dict(llm_1min._conversation_mapping))
+        llm_1min.flush_conversations()
+
+        _run(mock_llm_prompt)
+
+        assert api.created == 1
+        assert llm_1min.JSONConversationStore(llm_1min._get_conversation_file()).load() == {
+            "1min/gpt-4o": "new1",
+            "c1_1min/claude": "new1",
+            "1min/other": "alive",
+        }
+
+    def test_validation_error_about_conversation_is_stale(self, api, mock_llm_prompt):
+        api.status, api.text = 400, '{"message": "conversationId must be a valid conversation"}'
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        assert _run(mock_llm_prompt, stream=False) == ["fresh reply"]
+
+    @pytest.mark.parametrize(
+        "status, text",
+        [
+            (422, '{"message": "Conversation not found"}'),
+            (400, '{"code": "CONVERSATION_NOT_FOUND"}'),
+            (400, '{"message": "Invalid conversation: dead"}'),
+        ],
+    )
+    def test_missing_conversation_messages_are_stale(self, api, mock_llm_prompt, status, text):
+        api.status, api.text = status, text
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        assert _run(mock_llm_prompt, stream=False) == ["fresh reply"]
+
+    def test_error_merely_mentioning_conversation_is_not_stale(self, api, mock_llm_prompt):
+        api.status = 400
+        api.text = '{"message": "Too many messages in this conversation for the model context"}'
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        with pytest.raises(llm_1min.llm.ModelError) as excinfo:
+            _run(mock_llm_prompt, stream=False)
+
+        assert not isinstance(excinfo.value, llm_1min.StaleConversationError)
+        assert api.sent == ["dead"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "dead"}
+
+    def test_other_validation_errors_are_not_retried(self, api, mock_llm_prompt):
+        api.status, api.text = 400, '{"message": "prompt is too long"}'
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        with pytest.raises(llm_1min.llm.ModelError) as excinfo:
+            _run(mock_llm_prompt)
+
+        assert not isinstance(excinfo.value, llm_1min.StaleConversationError)
+        assert api.sent == ["dead"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "dead"}
+
+    def test_streaming_error_body_is_read_before_close(self, api, http_session, mock_llm_prompt):
+        def post(url, json=None, **kwargs):
+            if (
+                url.endswith("isStreaming=true")
+                and json["promptObject"]["conversationId"] == "dead"
+            ):
+                api.sent.append("dead")
+                # A real streamed response: its body is gone once it is closed
+                response = llm_1min.requests.Response()
+                response.status_code = 400
+                response.raw = io.BytesIO(b'{"message": "Conversation not found"}')
+                return response
+            return api.post(url, json=json, **kwargs)
+
+        http_session.post.side_effect = post
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        assert _run(mock_llm_prompt) == ["fresh reply"]
+        assert api.sent == ["dead", "new1"]
+
+    def test_replays_only_once(self, api, mock_llm_prompt):
+        api.dead = {"dead", "new1"}
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+
+        with pytest.raises(llm_1min.StaleConversationError):
+            _run(mock_llm_prompt)
+
+        assert api.sent == ["dead", "new1"]
+
+    def test_code_generator_feature_recovers(self, api, mock_llm_prompt):
+        mock_llm_prompt.options.conversation_type = "CODE_GENERATOR"
+        llm_1min._conversation_mapping["1min/gpt-5.1-codex"] = "dead"
+
+        assert _run(mock_llm_prompt, model_id="gpt-5.1-codex") == ["fresh reply"]
+        assert api.sent == ["dead", "new1"]
+
+
+class TestAsyncRecovery:
+    def test_streaming_404_recreates_and_replays(self, monkeypatch, mock_llm_prompt):
+        sent = []
+
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "new1"}})
+            uuid = json.loads(request.content)["promptObject"]["conversationId"]
+            sent.append(uuid)
+            if uuid == "dead":
+                return httpx.Response(404, json={"message": "Conversation not found"})
+            return httpx.Response(200, content=b'event: content\ndata: {"content": "hi"}\n\n')
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "key")
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "dead"
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        async def collect():
+            return [
+                c
+                async for c in model.execute(mock_llm_prompt, True, Mock(response_json=None), None)
+            ]
+
+        assert asyncio.run(collect()) == ["hi"]
+        assert sent == ["dead", "new1"]
+        assert llm_1min.get_active_conversations() == {"1min/gpt-4o": "new1"}
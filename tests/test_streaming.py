@@ -13,17 +13,14 @@ def _sse_response(events):
 
     `events` is a list of (event_name, data_str) tuples. Each emits two lines
     (event:, data:) plus a blank delimiter line, matching the SSE wire format.
+    The body is delivered as one raw byte chunk per event.
     """
-    lines = []
-    for name, data in events:
-        lines.append(f"event: {name}")
-        lines.append(f"data: {data}")
-        lines.append("")  # delimiter
+    chunks = [f"event: {name}\ndata: {data}\n\n".encode() for name, data in events]
 
     response = Mock()
     response.status_code = 200
     response.raise_for_status = Mock()
-    response.iter_lines = Mock(return_value=iter(lines))
+    response.iter_content = Mock(return_value=iter(chunks))
     response.__enter__ = Mock(return_value=response)
     response.__exit__ = Mock(return_value=False)
     return response
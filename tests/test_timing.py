@@ -0,0 +1,226 @@
+"""Tests for per-prompt phase timing (TTFB / TTFT / stream) instrumentation."""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+import llm_1min
+
+
+def _sse_chunks(events):
+    return [f"event: {name}\ndata: {data}\n\n".encode() for name, data in events]
+
+
+STREAM_EVENTS = [
+    ("content", '{"content": "Hello "}'),
+    ("content", '{"content": "world"}'),
+    ("done", '{"message": "Stream completed"}'),
+]
+
+
+@pytest.fixture
+def session(http_session, monkeypatch):
+    """Fake session: conversation create, then an SSE stream or a JSON reply."""
+
+    def post(url, **kwargs):
+        if url.endswith("/api/conversations"):
+            return Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": "c1"}}))
+        if url.endswith("isStreaming=true"):
+            response = Mock(status_code=200)
+            response.iter_content = Mock(return_value=iter(_sse_chunks(STREAM_EVENTS)))
+            response.__enter__ = Mock(return_value=response)
+            response.__exit__ = Mock(return_value=False)
+            return response
+        body = {"aiRecord": {"aiRecordDetail": {"resultObject": ["full reply"]}}}
+        return Mock(status_code=200, json=Mock(return_value=body), content=b'{"ok": 1}')
+
+    http_session.post.side_effect = post
+    monkeypatch.setattr(llm_1min.OneMinModel, "get_key", lambda self: "key")
+    return http_session
+
+
+class TestPhaseTimer:
+    def test_phases_accumulate_and_first_chunk_sets_ttft(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(llm_1min.time, "perf_counter", lambda: now[0])
+        timer = llm_1min.PhaseTimer()
+
+        for _ in range(2):
+            with timer.phase("request"):
+                now[0] += 0.25
+        now[0] += 0.5
+        timer.chunk()
+        now[0] += 1.0
+        timer.chunk()
+
+        timings = timer.as_dict()
+        assert timings["phases_ms"] == {"request": 500.0}
+        assert timings["ttfb_ms"] == 500.0
+        assert timings["ttft_ms"] == 1000.0
+        assert timings["total_ms"] == 2000.0
+        assert timings["chunks"] == 2
+        assert timings["stream_ms"] is None
+
+    def test_phase_recorded_when_body_raises(self):
+        timer = llm_1min.PhaseTimer()
+        with pytest.raises(RuntimeError):
+            with timer.phase("request"):
+                raise RuntimeError("boom")
+        assert "request" in timer.phases
+
+    def test_count_bytes_passes_chunks_through(self):
+        timer = llm_1min.PhaseTimer()
+        assert list(timer.count_bytes([b"abc", b"de"])) == [b"abc", b"de"]
+        assert timer.bytes == 5
+
+
+class TestExecuteTimings:
+    def test_streaming_prompt_records_phases(self, session, mock_llm_prompt):
+        response = Mock(response_json=None)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        chunks = list(model.execute(mock_llm_prompt, True, response, None))
+
+        assert chunks == ["Hello ", "world"]
+        timings = response.response_json["timings"]
+        assert timings["chunks"] == 2
+        assert timings["bytes"] == sum(len(c) for c in _sse_chunks(STREAM_EVENTS))
+        assert timings["ttfb_ms"] is not None
+        assert timings["ttft_ms"] is not None
+        assert timings["stream_ms"] is not None
+        assert {"options", "lookup", "create_conversation", "request", "stream"} <= set(
+            timings["phases_ms"]
+        )
+
+    def test_non_streaming_merges_into_existing_response_json(self, session, mock_llm_prompt):
+        response = Mock(response_json={"model": "gpt-4o"})
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        assert list(model.execute(mock_llm_prompt, False, response, None)) == ["full reply"]
+
+        assert response.response_json["model"] == "gpt-4o"
+        timings = response.response_json["timings"]
+        assert timings["chunks"] == 1
+        assert timings["bytes"] == len(b'{"ok": 1}')
+        assert timings["stream_ms"] is None
+        assert {"request", "body"} <= set(timings["phases_ms"])
+
+    def test_non_streaming_body_download_is_not_ttfb(self, session, mock_llm_prompt):
+        class SlowBody:
+            status_code = 200
+
+            @property
+            def content(self):
+                time.sleep(0.05)
+                return b'{"ok": 1}'
+
+            def close(self):
+                pass
+
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"aiRecord": {"aiRecordDetail": {"resultObject": ["slow reply"]}}}
+
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "existing"
+        session.post.side_effect = lambda url, **kwargs: SlowBody()
+        response = Mock(response_json=None)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        assert list(model.execute(mock_llm_prompt, False, response, None)) == ["slow reply"]
+
+        timings = response.response_json["timings"]
+        assert timings["phases_ms"]["body"] >= 50
+        assert timings["ttfb_ms"] < 50
+
+    def test_reused_conversation_skips_creation_phase(self, session, mock_llm_prompt):
+        llm_1min._conversation_mapping["1min/gpt-4o"] = "existing"
+        response = Mock(response_json=None)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        list(model.execute(mock_llm_prompt, True, response, None))
+
+        assert "create_conversation" not in response.response_json["timings"]["phases_ms"]
+
+    def test_timings_recorded_when_request_fails(self, session, mock_llm_prompt):
+        created = Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": "c1"}}))
+        failing = Mock(status_code=400)
+        failing.raise_for_status.side_effect = llm_1min.requests.exceptions.HTTPError(
+            response=failing
+        )
+        failing.__enter__ = Mock(return_value=failing)
+        failing.__exit__ = Mock(return_value=False)
+        session.post.side_effect = [created, failing]
+        response = Mock(response_json=None)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        with pytest.raises(llm_1min.llm.ModelError):
+            list(model.execute(mock_llm_prompt, True, response, None))
+
+        assert response.response_json["timings"]["chunks"] == 0
+
+    def test_debug_mode_prints_timings(self, session, mock_llm_prompt, capsys):
+        mock_llm_prompt.options.debug = True
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        list(model.execute(mock_llm_prompt, True, Mock(response_json=None), None))
+
+        err = capsys.readouterr().err
+        assert "[DEBUG] Timings (ms):" in err
+        assert "ttft_ms:" in err
+        assert "phase stream:" in err
+
+
+class TestAsyncExecuteTimings:
+    def test_streaming_prompt_records_phases(self, monkeypatch, mock_llm_prompt):
+        body = b"".join(_sse_chunks(STREAM_EVENTS))
+
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "c1"}})
+            return httpx.Response(200, content=body)
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "key")
+        response = Mock(response_json=None)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        async def collect():
+            return [c async for c in model.execute(mock_llm_prompt, True, response, None)]
+
+        assert asyncio.run(collect()) == ["Hello ", "world"]
+        timings = response.response_json["timings"]
+        assert timings["chunks"] == 2
+        assert timings["bytes"] == len(body)
+        assert {"lookup", "create_conversation", "request", "stream"} <= set(timings["phases_ms"])
+
+    def test_non_streaming_body_is_its_own_phase(self, monkeypatch, mock_llm_prompt):
+        def handler(request):
+            if request.url.path == "/api/conversations":
+                return httpx.Response(200, json={"conversation": {"uuid": "c1"}})
+            return httpx.Response(
+                200, json={"aiRecord": {"aiRecordDetail": {"resultObject": ["full reply"]}}}
+            )
+
+        monkeypatch.setattr(
+            llm_1min,
+            "get_async_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(llm_1min.AsyncOneMinModel, "get_key", lambda self: "key")
+        response = Mock(response_json=None)
+        model = llm_1min.AsyncOneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+
+        async def collect():
+            return [c async for c in model.execute(mock_llm_prompt, False, response, None)]
+
+        assert asyncio.run(collect()) == ["full reply"]
+        assert {"request", "body"} <= set(response.response_json["timings"]["phases_ms"])
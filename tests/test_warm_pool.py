@@ -0,0 +1,217 @@
+"""Tests for the warm pool of pre-created conversations."""
+
+import itertools
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import llm_1min
+
+PAYLOAD = {"title": "LLM Chat - GPT-4o", "type": "UNIFY_CHAT_WITH_AI", "model": "gpt-4o"}
+
+
+@pytest.fixture
+def api(http_session):
+    """Fake pooled session that hands out sequential conversation UUIDs."""
+    counter = itertools.count(1)
+
+    def post(url, **kwargs):
+        uuid = f"pooled-{next(counter)}"
+        return Mock(status_code=200, json=Mock(return_value={"conversation": {"uuid": uuid}}))
+
+    http_session.post.side_effect = post
+    http_session.delete.return_value = Mock(status_code=204)
+    return http_session
+
+
+def _deleted(session):
+    return [c.args[0].rsplit("/", 1)[-1] for c in session.delete.call_args_list]
+
+
+class TestConversationPool:
+    def test_disabled_unless_size_is_set(self):
+        assert llm_1min.ConversationPool.from_options({}) is None
+        assert llm_1min.ConversationPool.from_options({"warm_pool_size": 0}) is None
+        pool = llm_1min.ConversationPool.from_options({"warm_pool_size": 2, "warm_pool_ttl": 60})
+        assert (pool.size, pool.ttl) == (2, 60.0)
+        assert pool.state_file.parent == llm_1min._get_conversation_file().parent
+
+    def test_refill_then_claim_oldest_first(self, api, clock):
+        pool = llm_1min.ConversationPool(2)
+
+        assert pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD) == 2
+        assert pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD) == 0
+
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-1"
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-2"
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") is None
+        assert api.post.call_count == 2
+
+    def test_pools_are_separate_per_key_model_and_type(self, api, clock):
+        pool = llm_1min.ConversationPool(1)
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+
+        assert pool.claim("other-key", "gpt-4o", "UNIFY_CHAT_WITH_AI") is None
+        assert pool.claim("key", "gpt-4o-mini", "UNIFY_CHAT_WITH_AI") is None
+        assert pool.claim("key", "gpt-4o", "CODE_GENERATOR") is None
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-1"
+
+    def test_api_key_is_not_stored(self, api, clock):
+        pool = llm_1min.ConversationPool(1)
+        pool.refill("super-secret", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+
+        assert "super-secret" not in pool.state_file.read_text()
+
+    def test_expired_entries_are_skipped_and_deleted_on_refill(self, api, clock):
+        pool = llm_1min.ConversationPool(1, ttl=60)
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+
+        clock[0] += 61
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") is None
+
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+        assert _deleted(api) == ["pooled-1"]
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-2"
+
+    def test_overfill_from_concurrent_refill_is_deleted(self, api, clock, monkeypatch):
+        pool = llm_1min.ConversationPool(1)
+        other_process = llm_1min.ConversationPool(1)
+        original = llm_1min._create_remote_conversation
+
+        def create_while_other_process_refills(*args):
+            monkeypatch.setattr(llm_1min, "_create_remote_conversation", original)
+            other_process.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+            return original(*args)
+
+        monkeypatch.setattr(
+            llm_1min, "_create_remote_conversation", create_while_other_process_refills
+        )
+
+        assert pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD) == 0
+        assert _deleted(api) == ["pooled-2"]
+        assert pool.stats() == {"gpt-4o:UNIFY_CHAT_WITH_AI": {"ready": 1, "expired": 0}}
+
+    def test_refill_failure_warns_and_keeps_pool_usable(self, api, clock, capsys):
+        api.post.side_effect = llm_1min.requests.exceptions.ConnectionError("down")
+        pool = llm_1min.ConversationPool(2)
+
+        assert pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD) == 0
+        assert "Could not pre-create" in capsys.readouterr().err
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") is None
+
+    def test_corrupt_state_file_is_ignored(self, api, clock):
+        pool = llm_1min.ConversationPool(1)
+        pool.state_file.write_text("not json")
+
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") is None
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+        assert json.loads(pool.state_file.read_text())
+
+    def test_background_refill_is_deduplicated_per_process(self, api, clock):
+        pool = llm_1min.ConversationPool(1)
+        llm_1min.ConversationPool._refilling.add(
+            pool.pool_key("key", "gpt-4o", "UNIFY_CHAT_WITH_AI")
+        )
+        try:
+            assert pool.refill_in_background("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD) is None
+        finally:
+            llm_1min.ConversationPool._refilling.clear()
+
+        thread = pool.refill_in_background("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+        thread.join(5)
+        assert thread.daemon
+        assert not llm_1min.ConversationPool._refilling
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-1"
+
+    def test_exit_waits_for_refills_but_not_forever(self, monkeypatch):
+        monkeypatch.setattr(llm_1min, "WARM_POOL_EXIT_WAIT", 0.2)
+        release = threading.Event()
+        hung = threading.Thread(target=release.wait, name="llm-1min-warm-pool", daemon=True)
+        hung.start()
+        try:
+            start = time.monotonic()
+            llm_1min._join_warm_pool_refills()
+            assert 0.15 < time.monotonic() - start < 2
+        finally:
+            release.set()
+
+    def test_drain_only_touches_current_key(self, api, clock):
+        pool = llm_1min.ConversationPool(1)
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+        pool.refill("other", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+
+        assert pool.drain("key") == ["pooled-1"]
+        assert pool.claim("other", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-2"
+
+    @pytest.mark.parametrize(
+        "field,value", [("warm_pool_size", -1), ("warm_pool_size", 21), ("warm_pool_ttl", 0)]
+    )
+    def test_option_validation(self, field, value):
+        with pytest.raises(ValueError):
+            llm_1min.OneMinModel.Options(**{field: value})
+
+
+class TestModelUsesWarmPool:
+    def test_fresh_prompt_claims_pooled_conversation(self, api, clock, mock_llm_prompt):
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        pool = llm_1min.ConversationPool(1)
+        pool.refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+        api.post.reset_mock()
+
+        uuid = model.get_or_create_conversation(
+            "key", Mock(id="c1"), mock_llm_prompt, warm_pool=pool
+        )
+        while llm_1min.ConversationPool._refilling:
+            llm_1min.time.sleep(0.01)
+
+        assert uuid == "pooled-1"
+        assert llm_1min._conversation_mapping["c1_1min/gpt-4o"] == "pooled-1"
+        # The only create call is the background refill
+        assert api.post.call_count == 1
+        assert pool.claim("key", "gpt-4o", "UNIFY_CHAT_WITH_AI") == "pooled-2"
+
+    def test_empty_pool_creates_inline_and_refills(self, api, clock, mock_llm_prompt):
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        pool = llm_1min.ConversationPool(1)
+
+        uuid = model.get_or_create_conversation("key", None, mock_llm_prompt, warm_pool=pool)
+        while llm_1min.ConversationPool._refilling:
+            llm_1min.time.sleep(0.01)
+
+        assert uuid in {"pooled-1", "pooled-2"}
+        assert pool.stats()["gpt-4o:UNIFY_CHAT_WITH_AI"]["ready"] == 1
+
+    def test_execute_enables_pool_from_options(self, api, clock, mock_llm_prompt, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        llm_1min._options_config.set_option("warm_pool_size", 1)
+        model = llm_1min.OneMinModel("1min/gpt-4o", "gpt-4o", "GPT-4o")
+        captured = {}
+        monkeypatch.setattr(
+            model,
+            "get_or_create_conversation",
+            lambda *a, **kw: captured.update(kw) or "conv",
+        )
+        monkeypatch.setattr(model, "_execute_chat", lambda *a, **kw: iter(["ok"]))
+
+        assert list(model.execute(mock_llm_prompt, False, Mock(), None)) == ["ok"]
+        assert isinstance(captured["warm_pool"], llm_1min.ConversationPool)
+
+
+class TestPoolCommands:
+    def test_status_and_drain(self, api, clock, cli_runner, onemin_cli, monkeypatch):
+        monkeypatch.setenv("ONEMIN_API_KEY", "key")
+        llm_1min.ConversationPool(2).refill("key", "gpt-4o", "UNIFY_CHAT_WITH_AI", PAYLOAD)
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "pool", "status"])
+        assert "gpt-4o:UNIFY_CHAT_WITH_AI: 2 ready, 0 expired" in result.output
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "pool", "drain"])
+        assert result.exit_code == 0, result.output
+        assert "Drained 2 pooled conversation(s)" in result.output
+        assert sorted(_deleted(api)) == ["pooled-1", "pooled-2"]
+
+        result = cli_runner.invoke(onemin_cli, ["1min", "pool", "status"])
+        assert "Warm pool is empty" in result.output